@@ -3,6 +3,7 @@ VIEW_HOME = "/"             # Vista de Inicio
 VIEW_UPLOAD = "/upload"     # Vista para cargar archivos
 VIEW_DISPLAY = "/display"   # Vista para mostrar datos cargados
 VIEW_QUERY = "/query"       # Vista para ejecutar consultas SQL
+VIEW_GROUPBY = "/groupby"   # Vista para agrupar y resumir sin SQL
 VIEW_EXPORT = "/export"     # Vista para exportar PDF (si la implementas)
 VIEW_LIBRARY = "/library"   # Vista para la biblioteca/librerías usadas
 VIEW_ABOUT = "/about"       # Vista de Acerca De
@@ -1,6 +1,8 @@
 import flet as ft
 import pandas as pd
 from typing import Optional
+from core.query_cursor import QueryCursor
+from core.query_engine import QueryEngine
 
 
 class DataTableCustom(ft.Container):
@@ -8,9 +10,19 @@ class DataTableCustom(ft.Container):
     Control personalizado de Flet para mostrar un DataFrame de Pandas
     en un ft.DataTable, con soporte para scroll horizontal si es necesario.
     Ahora hereda directamente de ft.Container.
+    También puede mostrar un QueryCursor: solo se pide al cursor la página
+    visible y las siguientes se leen cuando el usuario avanza. Con un
+    ``query_engine``, esas lecturas corren en el pool del motor, con su tiempo
+    límite y su cancelación, sin bloquear la interfaz.
     """
 
-    def __init__(self, df: Optional[pd.DataFrame] = None, title: str = "Datos"):
+    def __init__(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        title: str = "Datos",
+        query_engine: Optional[QueryEngine] = None,
+        on_page_change=None,
+    ):
         super().__init__(
             padding=ft.padding.all(10),
             border=ft.border.all(1, ft.Colors.BLACK26),
@@ -19,6 +31,18 @@ class DataTableCustom(ft.Container):
         )
         self.df = df
         self.title = title
+        # Cursor paginado opcional (ver update_cursor) y página visible
+        self.cursor: Optional[QueryCursor] = None
+        self.page_number = 0
+        self.query_engine = query_engine
+        # Función que recibe el cursor cada vez que se muestra una página
+        self.on_page_change = on_page_change
+        # Etiqueta de las lecturas de páginas de este control, para cancelarlas
+        self._page_tag = f"data-table-page-{id(self)}"
+        # Cursor cuya página se está leyendo, si existe la siguiente y último error
+        self._loading_cursor: Optional[QueryCursor] = None
+        self._has_next_page = False
+        self._page_error: Optional[str] = None
         # ft.Ref para el DataTable si necesitas manipularlo directamente después de la construcción
         self.data_table_ref = ft.Ref[ft.DataTable]()
         # Inicializa el contenido del contenedor en el constructor
@@ -83,18 +107,152 @@ class DataTableCustom(ft.Container):
                     expand=True,
                     scroll=ft.ScrollMode.ADAPTIVE,
                 ),
+                self._build_pagination_controls(),
             ],
             expand=True,
             spacing=10,
         )
 
+    def _build_pagination_controls(self):
+        """
+        Construye los controles de paginación cuando se muestra un cursor.
+        """
+        if self.cursor is None:
+            return ft.Container()
+
+        if self._page_error:
+            status_text = ft.Text(self._page_error, color=ft.Colors.RED_ACCENT_700)
+        elif self._loading_cursor is not None:
+            status_text = ft.Text("Leyendo página...", color=ft.Colors.BLUE_GREY_400)
+        else:
+            status_text = ft.Container()
+        loading = self._loading_cursor is not None or bool(self._page_error)
+        page_count = self.cursor.get_page_count()
+        first_row = self.page_number * self.cursor.page_size + 1
+        last_row = first_row + len(self.df) - 1
+        total_text = (
+            str(self.cursor.total_rows) if self.cursor.total_rows is not None else "?"
+        )
+        page_text = str(page_count) if page_count is not None else "?"
+
+        return ft.Row(
+            [
+                ft.IconButton(
+                    ft.Icons.CHEVRON_LEFT,
+                    on_click=self._go_to_previous_page,
+                    disabled=self.page_number == 0 or loading,
+                    tooltip="Página anterior",
+                ),
+                ft.Text(
+                    f"Página {self.page_number + 1} de {page_text} "
+                    f"(filas {first_row}-{last_row} de {total_text})"
+                ),
+                ft.IconButton(
+                    ft.Icons.CHEVRON_RIGHT,
+                    on_click=self._go_to_next_page,
+                    disabled=not self._has_next_page or loading,
+                    tooltip="Página siguiente",
+                ),
+                status_text,
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+
+    def _close_cursor(self):
+        """Cierra el cursor actual, si lo hay."""
+        if self.cursor is not None:
+            if self._loading_cursor is self.cursor:
+                # Se interrumpe la lectura en curso; ``go_to_page`` cierra el
+                # cursor cuando termine, para no cerrarlo mientras se lee
+                self.query_engine.cancel_running_queries(self._page_tag)
+            else:
+                self.cursor.close()
+            self.cursor = None
+        self.page_number = 0
+        self._has_next_page = False
+        self._page_error = None
+
     def update_dataframe(self, new_df: pd.DataFrame, new_title: Optional[str] = None):
         """
         Actualiza el DataFrame y el título mostrado por el control.
         Reconstruye el contenido del contenedor.
         """
+        self._close_cursor()
         self.df = new_df
         if new_title:
             self.title = new_title
         self.content = self._build_content()
-        self.update()
\ No newline at end of file
+        self.update()
+
+    def update_cursor(self, cursor: QueryCursor, new_title: Optional[str] = None):
+        """
+        Muestra el resultado de un QueryCursor a partir de su primera página.
+        El control se adueña del cursor y lo cierra al recibir otros datos.
+        """
+        self._close_cursor()
+        self.cursor = cursor
+        if new_title:
+            self.title = new_title
+        # La primera página ya está leída; si no se conoce el total, se asume
+        # que hay una siguiente hasta intentar leerla
+        page_count = cursor.get_page_count()
+        self._show_page(0, cursor.fetch_page(0), page_count is None or page_count > 1)
+
+    def _show_page(self, page_number: int, page_df: pd.DataFrame, has_next_page: bool):
+        """Muestra una página ya leída del cursor."""
+        self.page_number = page_number
+        self.df = page_df
+        self._has_next_page = has_next_page
+        self.content = self._build_content()
+        self.update()
+        if self.on_page_change is not None and self.cursor is not None:
+            self.on_page_change(self.cursor)
+
+    async def _go_to_previous_page(self, e):
+        await self.go_to_page(self.page_number - 1)
+
+    async def _go_to_next_page(self, e):
+        await self.go_to_page(self.page_number + 1)
+
+    async def go_to_page(self, page_number: int):
+        """
+        Muestra la página indicada del cursor, leyéndola solo si es necesario.
+        Con un ``query_engine`` la lectura corre en su pool de hilos.
+        """
+        cursor = self.cursor
+        if cursor is None or page_number < 0 or self._loading_cursor is not None:
+            return
+        if self.query_engine is None:
+            page_df = cursor.fetch_page(page_number)
+            has_next_page = cursor.has_page(page_number + 1)
+        else:
+            self._loading_cursor = cursor
+            self.content = self._build_content()
+            self.update()
+            try:
+                page_df, has_next_page = await self.query_engine.fetch_query_page(
+                    cursor, page_number, tag=self._page_tag
+                )
+            except Exception as e:
+                # El motor ya cerró el cursor; la página visible se conserva
+                if cursor is self.cursor:
+                    self._page_error = f"No se pudo leer la página: {e}"
+                    self._has_next_page = False
+                page_df = None
+            finally:
+                self._loading_cursor = None
+            if cursor is not self.cursor:
+                # Llegaron otros datos mientras se leía: el cursor ya no se muestra
+                cursor.close()
+                return
+            if page_df is None:
+                self.content = self._build_content()
+                self.update()
+                return
+        if page_df.empty and page_number > 0:
+            # No hay más páginas: se queda en la actual
+            self._has_next_page = False
+            self.content = self._build_content()
+            self.update()
+            return
+        self._show_page(page_number, page_df, has_next_page)
\ No newline at end of file
@@ -0,0 +1,112 @@
+import flet as ft
+from typing import Optional
+
+
+class QueryPlanView(ft.Container):
+    """
+    Control personalizado de Flet para mostrar el perfil de una consulta SQL
+    (EXPLAIN ANALYZE de DuckDB) como un árbol de operadores plegable.
+    Hereda directamente de ft.Container.
+    """
+
+    def __init__(self, profile: Optional[dict] = None, title: str = "Plan de Ejecución"):
+        super().__init__(
+            padding=ft.padding.all(10),
+            border=ft.border.all(1, ft.Colors.BLACK26),
+            border_radius=ft.border_radius.all(5),
+            expand=True,
+        )
+        self.profile = profile
+        self.title = title
+        # Texto a mostrar mientras no hay perfil (ver show_message)
+        self.message = "Active el perfilado para ver el plan."
+        self.content = self._build_content()
+
+    @staticmethod
+    def _format_bytes(num_bytes: int) -> str:
+        """Convierte un número de bytes a una cadena legible (KB, MB, GB)."""
+        size = float(num_bytes)
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
+
+    def _build_node(self, node: dict, operator_time: float):
+        """
+        Construye recursivamente un ft.ExpansionTile por operador del plan.
+        """
+        share = (node["timing"] / operator_time * 100) if operator_time > 0 else 0
+        details = [
+            ft.Text(f"{key}: {value}", size=12, selectable=True)
+            for key, value in node["extra_info"].items()
+        ]
+        children = [self._build_node(child, operator_time) for child in node["children"]]
+
+        return ft.ExpansionTile(
+            title=ft.Text(
+                f"{node['name']} — {node['timing'] * 1000:.2f} ms ({share:.1f}%)",
+                weight=ft.FontWeight.BOLD if share >= 50 else None,
+                color=ft.Colors.RED_ACCENT_700 if share >= 50 else None,
+            ),
+            subtitle=ft.Text(
+                f"Filas: {node['rows']:,} · Datos producidos: "
+                f"{self._format_bytes(node['result_bytes'])}",
+                size=12,
+            ),
+            initially_expanded=True,
+            controls_padding=ft.padding.only(left=15),
+            controls=details + children,
+        )
+
+    def _build_content(self):
+        """
+        Método interno para construir el contenido del contenedor (el árbol y el título).
+        """
+        if not self.profile:
+            return ft.Column(
+                [
+                    ft.Text(
+                        f"{self.title}: {self.message}",
+                        color=ft.Colors.GREY_600,
+                    ),
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                alignment=ft.MainAxisAlignment.CENTER,
+                expand=True,
+            )
+
+        return ft.Column(
+            [
+                ft.Text(self.title, size=16, weight=ft.FontWeight.BOLD),
+                ft.Text(
+                    f"Tiempo total: {self.profile['total_time'] * 1000:.1f} ms · "
+                    f"Operadores: {self.profile['operator_time'] * 1000:.1f} ms · "
+                    f"Filas devueltas: {self.profile['rows_returned']:,}",
+                    size=12,
+                    color=ft.Colors.GREY_600,
+                ),
+                self._build_node(self.profile["plan"], self.profile["operator_time"]),
+            ],
+            expand=True,
+            spacing=10,
+            scroll=ft.ScrollMode.ADAPTIVE,
+        )
+
+    def update_profile(self, new_profile: Optional[dict], new_title: Optional[str] = None):
+        """
+        Actualiza el perfil mostrado por el control.
+        Reconstruye el contenido del contenedor.
+        """
+        self.profile = new_profile
+        if new_title:
+            self.title = new_title
+        self.content = self._build_content()
+        self.update()
+
+    def show_message(self, message: str):
+        """Muestra un mensaje en lugar del plan (p. ej. mientras el perfil no está listo)."""
+        self.profile = None
+        self.message = message
+        self.content = self._build_content()
+        self.update()
@@ -18,6 +18,7 @@ from views.home_view import HomePage
 from views.file_upload_view import FileUploadPage
 from views.data_display_view import DataDisplayPage
 from views.query_view import QueryPage
+from views.group_by_view import GroupByPage
 from views.library_view import LibraryPage
 from views.about_view import AboutPage
 from views.export_pdf_view import ExportPDFPage
@@ -27,7 +28,10 @@ from views.search_view import SearchPage
 from core.data_loader import DataLoader
 from core.data_analyzer import DataAnalyzer
 from core.query_engine import QueryEngine
+from core.query_history import QueryHistory
 from core.plot_generator import PlotGenerator
+from core.plot_cache import PlotCache
+from core.plot_render_service import PlotRenderService
 from core.app_state import AppState
 
 # Importar constantes
@@ -36,6 +40,7 @@ from constants import (
     VIEW_UPLOAD,
     VIEW_DISPLAY,
     VIEW_QUERY,
+    VIEW_GROUPBY,
     VIEW_EXPORT,
     VIEW_LIBRARY,
     VIEW_ABOUT,
@@ -53,13 +58,57 @@ def main(page: ft.Page):
     page.window_height = 800  # type: ignore
 
     # Estado de la aplicación
-    app_state = AppState()
+    # MUGENC_MAX_LOADED_DATASETS: archivos de la sesión conservados para las consultas SQL
+    app_state = AppState(
+        max_loaded_datasets=int(os.environ.get("MUGENC_MAX_LOADED_DATASETS", "8"))
+    )
 
     # Instancias de las clases de la capa core
     data_loader = DataLoader()
-    data_analyzer = DataAnalyzer()
-    query_engine = QueryEngine()
-    plot_generator = PlotGenerator()
+    # Backends opcionales: MUGENC_ANALYZER_BACKEND y MUGENC_QUERY_BACKEND admiten 'polars'
+    # MUGENC_APPROXIMATE_ROWS: a partir de ese número de filas el perfil usa sketches
+    data_analyzer = DataAnalyzer(
+        backend=os.environ.get("MUGENC_ANALYZER_BACKEND", "pandas"),
+        app_state=app_state,
+        # MUGENC_ANALYZER_WORKERS: hilos para perfilar columnas en paralelo
+        workers=int(os.environ.get("MUGENC_ANALYZER_WORKERS", min(8, os.cpu_count() or 1))),
+        approximate_rows=int(os.environ["MUGENC_APPROXIMATE_ROWS"]) if os.environ.get("MUGENC_APPROXIMATE_ROWS") else None,
+        # MUGENC_DUPLICATE_DUCKDB_ROWS: a partir de ese número de filas los duplicados se cuentan con DuckDB
+        duplicate_duckdb_rows=int(os.environ["MUGENC_DUPLICATE_DUCKDB_ROWS"]) if os.environ.get("MUGENC_DUPLICATE_DUCKDB_ROWS") else None,
+    )
+    # Historial de consultas SQL (persistido en ~/.mugenc salvo que se indique otra ruta)
+    query_history = QueryHistory(
+        history_path=os.environ.get(
+            "MUGENC_QUERY_HISTORY_PATH",
+            os.path.join(os.path.expanduser("~"), ".mugenc", "query_history.jsonl"),
+        ),
+        slow_query_threshold=float(os.environ.get("MUGENC_SLOW_QUERY_SECONDS", "2.0")),
+    )
+    # DuckDB en disco opcional: MUGENC_DUCKDB_PATH activa el modo persistente
+    query_engine = QueryEngine(
+        database=os.environ.get("MUGENC_DUCKDB_PATH", ":memory:"),
+        memory_limit=os.environ.get("MUGENC_DUCKDB_MEMORY_LIMIT"),
+        threads=int(os.environ["MUGENC_DUCKDB_THREADS"]) if os.environ.get("MUGENC_DUCKDB_THREADS") else None,
+        temp_directory=os.environ.get("MUGENC_DUCKDB_TEMP_DIR"),
+        history=query_history,
+        backend=os.environ.get("MUGENC_QUERY_BACKEND", "duckdb"),
+    )
+    # Las vistas agregadas del motor SQL y las estadísticas incrementales se
+    # actualizan con cada cambio del DataFrame activo
+    app_state.add_change_listener(query_engine.handle_dataset_change)
+    app_state.add_change_listener(data_analyzer.handle_dataset_change)
+    # Caché de gráficos renderizados; MUGENC_PLOT_CACHE_DIR la guarda también en disco
+    plot_cache = PlotCache(
+        cache_dir=os.environ.get("MUGENC_PLOT_CACHE_DIR"),
+        version_provider=app_state.get_dataset_version,
+    )
+    app_state.add_change_listener(plot_cache.handle_dataset_change)
+    plot_generator = PlotGenerator(cache=plot_cache)
+    # Los gráficos se dibujan en procesos aparte; MUGENC_PLOT_WORKERS fija cuántos
+    plot_render_service = PlotRenderService(
+        max_workers=int(os.environ["MUGENC_PLOT_WORKERS"]) if os.environ.get("MUGENC_PLOT_WORKERS") else None,
+        cache=plot_cache,
+    )
 
     # Referencia al NavigationRail
     navigation_rail_ref = ft.Ref[ft.NavigationRail]()
@@ -79,18 +128,26 @@ def main(page: ft.Page):
         VIEW_UPLOAD,   # Corresponde a rail_index 3
         VIEW_DISPLAY,  # Corresponde a rail_index 4
         VIEW_QUERY,    # Corresponde a rail_index 5
-        VIEW_EXPORT,   # Corresponde a rail_index 6
-        VIEW_LIBRARY,  # Corresponde a rail_index 7
-        VIEW_ABOUT,    # Corresponde a rail_index 8
+        VIEW_GROUPBY,  # Corresponde a rail_index 6
+        VIEW_EXPORT,   # Corresponde a rail_index 7
+        VIEW_LIBRARY,  # Corresponde a rail_index 8
+        VIEW_ABOUT,    # Corresponde a rail_index 9
     ]
 
     # Instancias de las vistas
     home_page = HomePage(page, app_state)
-    file_upload_page = FileUploadPage(page, app_state, data_loader=data_loader)
+    file_upload_page = FileUploadPage(
+        page, app_state, data_loader=data_loader, data_analyzer=data_analyzer
+    )
     data_display_page = DataDisplayPage(
-        page, app_state, data_analyzer=data_analyzer, plot_generator=plot_generator
+        page,
+        app_state,
+        data_analyzer=data_analyzer,
+        plot_generator=plot_generator,
+        plot_render_service=plot_render_service,
     )
     query_page = QueryPage(page, app_state, query_engine=query_engine)
+    group_by_page = GroupByPage(page, app_state, data_analyzer=data_analyzer)
     library_page = LibraryPage(page, app_state)
     about_page = AboutPage(page, app_state)
     export_pdf_page = ExportPDFPage(page, app_state) # Aquí podrías pasar file_processor si lo necesitas
@@ -109,6 +166,8 @@ def main(page: ft.Page):
             main_content_area.content = data_display_page
         elif selected_route == VIEW_QUERY:
             main_content_area.content = query_page
+        elif selected_route == VIEW_GROUPBY:
+            main_content_area.content = group_by_page
         elif selected_route == VIEW_LIBRARY:
             main_content_area.content = library_page
         elif selected_route == VIEW_ABOUT:
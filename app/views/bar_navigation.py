@@ -46,17 +46,22 @@ def create_navigation_rail(
             selected_icon=ft.Icons.QUERY_STATS,
             label="Consultas SQL",
         ),
-        ft.NavigationRailDestination(  # Índice 6: Exportar PDF
+        ft.NavigationRailDestination(  # Índice 6: Agrupar y Resumir
+            icon=ft.Icons.TABLE_CHART_OUTLINED,
+            selected_icon=ft.Icons.TABLE_CHART,
+            label="Agrupar y Resumir",
+        ),
+        ft.NavigationRailDestination(  # Índice 7: Exportar PDF
             icon=ft.Icons.PICTURE_AS_PDF_OUTLINED,
             selected_icon=ft.Icons.PICTURE_AS_PDF,
             label="Exportar PDF",
         ),
-        ft.NavigationRailDestination(  # Índice 7: Librería
+        ft.NavigationRailDestination(  # Índice 8: Librería
             icon=ft.Icons.BOOK_OUTLINED,
             selected_icon=ft.Icons.BOOK,
             label="Librería",
         ),
-        ft.NavigationRailDestination(  # Índice 8: Acerca De
+        ft.NavigationRailDestination(  # Índice 9: Acerca De
             icon=ft.Icons.INFO_OUTLINE,
             selected_icon=ft.Icons.INFO,
             label="Acerca De",
@@ -1,6 +1,12 @@
+import asyncio
 import flet as ft
+from typing import Optional
 from core.data_analyzer import DataAnalyzer
 from core.plot_generator import PlotGenerator
+from core.plot_render_service import PlotRenderService
+
+# Columnas numéricas del gráfico de ejemplo (un histograma por columna, en paralelo)
+SAMPLE_PLOT_COLUMNS = 4
 
 
 class DataDisplayPage(ft.Container):
@@ -8,7 +14,8 @@ class DataDisplayPage(ft.Container):
     Vista para visualizar y analizar los datos cargados.
     """
 
-    def __init__(self, page: ft.Page, app_state, data_analyzer: DataAnalyzer, plot_generator: PlotGenerator):
+    def __init__(self, page: ft.Page, app_state, data_analyzer: DataAnalyzer, plot_generator: PlotGenerator,
+                 plot_render_service: Optional[PlotRenderService] = None):
         super().__init__(
             padding=20,
             expand=True,
@@ -18,6 +25,7 @@ class DataDisplayPage(ft.Container):
         self.app_state = app_state
         self.data_analyzer = data_analyzer
         self.plot_generator = plot_generator
+        self.plot_render_service = plot_render_service
 
         # Elementos UI
         self.data_table_container = ft.Container(
@@ -37,6 +45,16 @@ class DataDisplayPage(ft.Container):
             padding=10,
         )
 
+        self.correlation_method_dropdown = ft.Dropdown(
+            label="Método de correlación",
+            value="pearson",
+            options=[
+                ft.dropdown.Option("pearson", "Pearson"),
+                ft.dropdown.Option("spearman", "Spearman"),
+            ],
+            col={"sm": 12, "md": 6, "lg": 3}
+        )
+
         # Botones de visualización/análisis
         self.analysis_buttons = ft.ResponsiveRow([
             ft.ElevatedButton(
@@ -53,6 +71,14 @@ class DataDisplayPage(ft.Container):
                 tooltip="Genera un gráfico de ejemplo (requiere datos numéricos).",
                 col={"sm": 12, "md": 6, "lg": 3}
             ),
+            ft.ElevatedButton(
+                "Matriz de Correlación",
+                on_click=self._generate_correlation_heatmap,
+                icon=ft.Icons.GRID_4X4,
+                tooltip="Mapa de calor de las correlaciones entre columnas numéricas.",
+                col={"sm": 12, "md": 6, "lg": 3}
+            ),
+            self.correlation_method_dropdown,
         ], spacing=10)
 
         # Construir interfaz
@@ -148,8 +174,20 @@ class DataDisplayPage(ft.Container):
         if self.page:
             self.page.update()
 
-    def _generate_sample_plot(self, e=None):
-        """Genera un gráfico de ejemplo utilizando plot_generator."""
+    async def _render_plot(self, method: str, df, columns, *args, **kwargs):
+        """
+        Dibuja un gráfico en el servicio de renderizado sin bloquear la interfaz
+        o, si no hay servicio o falla, con ``plot_generator`` en este proceso.
+        """
+        if self.plot_render_service is not None:
+            try:
+                return await self.plot_render_service.render(method, df, columns, *args, **kwargs)
+            except Exception as ex:
+                print(f"Error en el servicio de renderizado, se dibuja en la aplicación: {ex}")
+        return getattr(self.plot_generator, method)(df, *args, **kwargs)
+
+    async def _generate_sample_plot(self, e=None):
+        """Genera en paralelo los histogramas de las primeras columnas numéricas."""
         df = self.app_state.get_active_dataframe()
 
         if df is None:
@@ -159,28 +197,34 @@ class DataDisplayPage(ft.Container):
                 self.page.update()
             return
 
-        # Intenta generar un histograma de la primera columna numérica
         numeric_cols = df.select_dtypes(include=['number']).columns
         if not numeric_cols.empty:
-            column_to_plot = numeric_cols[0]
+            columns_to_plot = list(numeric_cols[:SAMPLE_PLOT_COLUMNS])
+            self.plot_container.content = ft.Text("Generando gráficos...")
+            if self.page:
+                self.page.update()
             try:
-                # plot_generator.generate_histogram debería devolver un control de Flet (ej. ft.Image)
-                plot_control = self.plot_generator.generate_histogram(df, column_to_plot)
-                if plot_control:
-                    # Ensure plot_control is a Control, not a string
-                    controls = [
-                        ft.Text(f"Histograma de '{column_to_plot}':", size=16, weight=ft.FontWeight.BOLD)
-                    ]
-                    if isinstance(plot_control, str):
-                        controls.append(ft.Text(plot_control))
-                    else:
-                        controls.append(plot_control)
-                    self.plot_container.content = ft.Column(
-                        controls,
-                        expand=True,
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER
+                # Todos los histogramas se dibujan a la vez (cada uno en su proceso)
+                images = await asyncio.gather(
+                    *(self._render_plot("generate_histogram", df, [col], col) for col in columns_to_plot)
+                )
+                plots = [
+                    ft.Column(
+                        [
+                            ft.Text(f"Histograma de '{col}':", size=16, weight=ft.FontWeight.BOLD),
+                            ft.Image(src_base64=image, fit=ft.ImageFit.CONTAIN),
+                        ],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        col={"sm": 12, "md": 6},
+                    )
+                    for col, image in zip(columns_to_plot, images)
+                    if image
+                ]
+                if plots:
+                    self.plot_container.content = ft.ResponsiveRow(plots, expand=True)
+                    self.show_notification(
+                        f"Gráficos generados para {len(plots)} columnas numéricas.", ft.Colors.GREEN
                     )
-                    self.show_notification(f"Gráfico generado para '{column_to_plot}'.", ft.Colors.GREEN)
                 else:
                     self.plot_container.content = ft.Text("No se pudo generar el gráfico. Verifique la consola.")
                     self.show_notification("Error al generar el gráfico.", ft.Colors.RED)
@@ -194,4 +238,51 @@ class DataDisplayPage(ft.Container):
             self.show_notification("No hay columnas numéricas para gráficos.", ft.Colors.ORANGE)
 
         if self.page:
-            self.page.update()
\ No newline at end of file
+            self.page.update()
+
+    async def _generate_correlation_heatmap(self, e=None):
+        """
+        Muestra el mapa de calor de correlaciones del DataFrame activo.
+        La matriz se guarda en la caché de ``DataAnalyzer`` por versión de los
+        datos, por lo que redibujar no la vuelve a calcular.
+        """
+        df = self.app_state.get_active_dataframe()
+
+        if df is None:
+            self.plot_container.content = ft.Text("Cargue un archivo para generar gráficos.")
+            self.show_notification("No hay datos para generar gráficos.", ft.Colors.ORANGE)
+            if self.page:
+                self.page.update()
+            return
+
+        method = self.correlation_method_dropdown.value or "pearson"
+        try:
+            matrix = self.data_analyzer.get_correlation_matrix(df, method=method)
+            if matrix.empty:
+                self.plot_container.content = ft.Text("No hay columnas numéricas para calcular correlaciones.")
+                self.show_notification("No hay columnas numéricas para correlaciones.", ft.Colors.ORANGE)
+            else:
+                plot_base64 = await self._render_plot(
+                    "generate_heatmap", matrix, None, title=f"Matriz de correlación ({method.capitalize()})"
+                )
+                if plot_base64:
+                    self.plot_container.content = ft.Column(
+                        [
+                            ft.Text(f"Correlaciones de {len(matrix.columns)} columnas numéricas:", size=16, weight=ft.FontWeight.BOLD),
+                            ft.Image(src_base64=plot_base64, fit=ft.ImageFit.CONTAIN, expand=True),
+                        ],
+                        expand=True,
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER
+                    )
+                    self.show_notification("Matriz de correlación generada.", ft.Colors.GREEN)
+                else:
+                    self.plot_container.content = ft.Text("No se pudo generar el gráfico. Verifique la consola.")
+                    self.show_notification("Error al generar el gráfico.", ft.Colors.RED)
+
+        except Exception as ex:
+            self.plot_container.content = ft.Text(f"Error al calcular correlaciones: {str(ex)}", color=ft.Colors.RED)
+            self.show_notification(f"Error al calcular correlaciones: {str(ex)}", ft.Colors.RED)
+            print(f"Error al calcular correlaciones: {ex}")
+
+        if self.page:
+            self.page.update()
@@ -1,8 +1,9 @@
-import io
 import flet as ft
 import pandas as pd
 import numpy as np
 from core.data_loader import DataLoader
+from core.data_analyzer import DataAnalyzer
+from core.memory_optimizer import MemoryOptimizer
 
 
 class FileUploadConfig():
@@ -19,13 +20,18 @@ class FileUploadConfig():
                  null_handling_strategy_dropdown: ft.Dropdown,
                  rename_column_controls: ft.Column,
                  rename_column_dropdown: ft.Dropdown,
-                 new_column_name_textfield: ft.TextField): # Added new UI elements
+                 new_column_name_textfield: ft.TextField, # Added new UI elements
+                 outlier_controls: ft.Column,
+                 outlier_method_dropdown: ft.Dropdown,
+                 outlier_action_dropdown: ft.Dropdown,
+                 data_analyzer: DataAnalyzer = None):
         self.page = page
         self.app_state = app_state
         self.file_picker = file_picker # Now passed from the view
         self.file_types = ['csv', 'xlsx', 'json']
         self.max_file_size = 10 * 1024 * 1024  # 10 MB
         self.data_loader = DataLoader()
+        self.data_analyzer = data_analyzer or DataAnalyzer()
 
         # References to UI elements from the view
         self.upload_status_text = upload_status_text
@@ -42,6 +48,9 @@ class FileUploadConfig():
         self.rename_column_controls = rename_column_controls
         self.rename_column_dropdown = rename_column_dropdown
         self.new_column_name_textfield = new_column_name_textfield
+        self.outlier_controls = outlier_controls
+        self.outlier_method_dropdown = outlier_method_dropdown
+        self.outlier_action_dropdown = outlier_action_dropdown
 
     def show_notification(self, message: str, color=ft.Colors.BLUE):
         """Muestra una notificación temporal en la página."""
@@ -64,6 +73,7 @@ class FileUploadConfig():
         self.object_type_conversion_controls.controls.clear()
         self.null_handling_controls.visible = False
         self.rename_column_controls.visible = False
+        self.outlier_controls.visible = False
         if self.page:
             self.page.update()
 
@@ -100,6 +110,7 @@ class FileUploadConfig():
         self.object_type_conversion_controls.visible = False
         self.null_handling_controls.visible = False
         self.rename_column_controls.visible = False
+        self.outlier_controls.visible = False
         self.rename_column_dropdown.value = None
         self.new_column_name_textfield.value = ""
         if self.page:
@@ -158,63 +169,7 @@ class FileUploadConfig():
             self.show_notification("No hay datos cargados para validar el dataset original.", ft.Colors.ORANGE)
             return
 
-        try:
-            result_content = []
-            if info_type == "shape":
-                rows, cols = df.shape
-                result_content.append(ft.Text(f"📐 Forma del DataFrame:\nFilas: {rows}\nColumnas: {cols}", selectable=True))
-
-            elif info_type == "dtypes":
-                result_content.append(ft.Text("📊 Tipos de datos:", selectable=True))
-                for col, dtype in df.dtypes.items():
-                    result_content.append(ft.Text(f"- {col}: {dtype}", selectable=True))
-
-            elif info_type == "nulls":
-                nulls_count = df.isnull().sum()
-                columns_with_nulls = {col: count for col, count in nulls_count.items() if count > 0}
-
-                if not columns_with_nulls:
-                    result_content.append(ft.Text("🎉 No hay valores nulos en el DataFrame."))
-                else:
-                    result_content.append(ft.Text("⚠️ Valores nulos por columna (conteo):", selectable=True))
-                    for col, count in columns_with_nulls.items():
-                        result_content.append(ft.Text(f"- {col}: {count}", selectable=True))
-
-            elif info_type == "nulls_percent":
-                total_rows = len(df)
-                if total_rows == 0:
-                    result_content.append(ft.Text("El DataFrame está vacío, no se puede calcular el porcentaje de nulos."))
-                else:
-                    nulls_pct = (df.isnull().sum() / total_rows * 100).round(2)
-                    columns_with_nulls_pct = {col: pct for col, pct in nulls_pct.items() if pct > 0}
-
-                    if not columns_with_nulls_pct:
-                        result_content.append(ft.Text("🎉 No hay valores nulos en el DataFrame."))
-                    else:
-                        result_content.append(ft.Text("📉 Porcentaje de valores nulos por columna:", selectable=True))
-                        for col, pct in columns_with_nulls_pct.items():
-                            result_content.append(ft.Text(f"- {col}: {pct}%", selectable=True))
-
-            elif info_type == "info":
-                buffer = io.StringIO()
-                df.info(buf=buffer)
-                result_content.append(ft.Text("📋 Información completa del DataFrame:", selectable=True))
-                result_content.append(ft.Text(buffer.getvalue(), selectable=True))
-
-            elif info_type == "column_names": # Nuevo tipo para nombres de columnas
-                result_content.append(ft.Text("📝 Nombres de las columnas:", selectable=True))
-                for col_name in df.columns.tolist():
-                    result_content.append(ft.Text(f"- {col_name}", selectable=True))
-
-            else:
-                result_content.append(ft.Text("Tipo de validación no reconocido"))
-
-            self.validation_results.controls.extend(result_content)
-            if self.page:
-                self.page.update()
-
-        except Exception as e:
-            self.show_notification(f"Error en validación: {str(e)}", ft.Colors.RED)
+        self._render_data_info(df, info_type, self.validation_results)
 
     def show_manipulated_data_info(self, info_type):
         """Muestra diferentes tipos de información sobre el DataFrame MANIPULADO la copia."""
@@ -229,20 +184,38 @@ class FileUploadConfig():
             self.show_notification("No hay datos manipulados para validar.", ft.Colors.ORANGE)
             return
 
+        self._render_data_info(df, info_type, self.manipulated_validation_results)
+
+    def _render_data_info(self, df: pd.DataFrame, info_type: str, results_column: ft.Column):
+        """
+        Añade a ``results_column`` la información solicitada del DataFrame.
+        El resumen completo lee del perfil calculado en una sola pasada por
+        ``DataAnalyzer.profile``; el resto de opciones, de las estadísticas
+        incrementales, que para el DataFrame activo no recorren los datos.
+        """
         try:
+            if info_type == "memory":
+                results_column.controls.extend(self._build_memory_report(df))
+                if self.page:
+                    self.page.update()
+                return
+            if info_type == "info":
+                profile = self.data_analyzer.profile(df)
+            else:
+                profile = self.data_analyzer.get_running_statistics(df)
+            columns = profile["columns"]
             result_content = []
             if info_type == "shape":
-                rows, cols = df.shape
+                rows, cols = profile["num_rows"], profile["num_cols"]
                 result_content.append(ft.Text(f"📐 Forma del DataFrame:\nFilas: {rows}\nColumnas: {cols}", selectable=True))
 
             elif info_type == "dtypes":
                 result_content.append(ft.Text("📊 Tipos de datos:", selectable=True))
-                for col, dtype in df.dtypes.items():
-                    result_content.append(ft.Text(f"- {col}: {dtype}", selectable=True))
+                for col, column_profile in columns.items():
+                    result_content.append(ft.Text(f"- {col}: {column_profile['dtype']}", selectable=True))
 
             elif info_type == "nulls":
-                nulls_count = df.isnull().sum()
-                columns_with_nulls = {col: count for col, count in nulls_count.items() if count > 0}
+                columns_with_nulls = {col: c["nulls"] for col, c in columns.items() if c["nulls"] > 0}
 
                 if not columns_with_nulls:
                     result_content.append(ft.Text("🎉 No hay valores nulos en el DataFrame."))
@@ -252,12 +225,12 @@ class FileUploadConfig():
                         result_content.append(ft.Text(f"- {col}: {count}", selectable=True))
 
             elif info_type == "nulls_percent":
-                total_rows = len(df)
-                if total_rows == 0:
+                if profile["num_rows"] == 0:
                     result_content.append(ft.Text("El DataFrame está vacío, no se puede calcular el porcentaje de nulos."))
                 else:
-                    nulls_pct = (df.isnull().sum() / total_rows * 100).round(2)
-                    columns_with_nulls_pct = {col: pct for col, pct in nulls_pct.items() if pct > 0}
+                    columns_with_nulls_pct = {
+                        col: c["null_percent"] for col, c in columns.items() if c["nulls"] > 0
+                    }
 
                     if not columns_with_nulls_pct:
                         result_content.append(ft.Text("🎉 No hay valores nulos en el DataFrame."))
@@ -267,26 +240,139 @@ class FileUploadConfig():
                             result_content.append(ft.Text(f"- {col}: {pct}%", selectable=True))
 
             elif info_type == "info":
-                buffer = io.StringIO()
-                df.info(buf=buffer)
                 result_content.append(ft.Text("📋 Información completa del DataFrame:", selectable=True))
-                result_content.append(ft.Text(buffer.getvalue(), selectable=True))
+                result_content.append(ft.Text(self._format_profile_info(profile), selectable=True, font_family="monospace"))
 
             elif info_type == "column_names": # Nuevo tipo para nombres de columnas
                 result_content.append(ft.Text("📝 Nombres de las columnas:", selectable=True))
-                for col_name in df.columns.tolist():
+                for col_name in columns:
                     result_content.append(ft.Text(f"- {col_name}", selectable=True))
 
             else:
                 result_content.append(ft.Text("Tipo de validación no reconocido"))
 
-            self.manipulated_validation_results.controls.extend(result_content)
+            results_column.controls.extend(result_content)
             if self.page:
                 self.page.update()
 
         except Exception as e:
             self.show_notification(f"Error en validación: {str(e)}", ft.Colors.RED)
 
+    @staticmethod
+    def _format_bytes(num_bytes: float) -> str:
+        """Formatea un tamaño en bytes (KB, MB, GB)."""
+        for unit in ("B", "KB", "MB"):
+            if abs(num_bytes) < 1024:
+                return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{int(num_bytes)} B"
+            num_bytes /= 1024
+        return f"{num_bytes:.2f} GB"
+
+    def _build_memory_report(self, df: pd.DataFrame) -> list:
+        """Construye el informe de memoria por columna con las recomendaciones."""
+        report = self.data_analyzer.get_memory_report(df)
+        total, optimized = report["total_bytes"], report["optimized_bytes"]
+        name_width = max([len(str(col)) for col in report["columns"]] + [7])
+        lines = [f" {'Columna':<{name_width}}  {'Tipo':<16}{'Memoria':>12}  Recomendación"]
+        # Primero las columnas que más memoria ocupan
+        for col, column_report in sorted(
+            report["columns"].items(), key=lambda item: item[1]["bytes"], reverse=True
+        ):
+            recommendation = "-"
+            if column_report["recommended"]:
+                recommendation = (
+                    f"{column_report['recommended']} → {self._format_bytes(column_report['optimized_bytes'])} "
+                    f"({column_report['reason']})"
+                )
+            lines.append(
+                f" {str(col):<{name_width}}  {column_report['dtype']:<16}"
+                f"{self._format_bytes(column_report['bytes']):>12}  {recommendation}"
+            )
+        content = [
+            ft.Text("💾 Uso de memoria por columna:", selectable=True),
+            ft.Text("\n".join(lines), selectable=True, font_family="monospace"),
+            ft.Text(
+                f"Total: {self._format_bytes(total)} · Con las recomendaciones: "
+                f"{self._format_bytes(optimized)} (ahorro de {self._format_bytes(total - optimized)})",
+                selectable=True,
+                weight=ft.FontWeight.BOLD,
+            ),
+        ]
+        return content
+
+    def _optimize_memory(self, e=None):
+        """Aplica las recomendaciones de memoria al DataFrame activo."""
+
+        # Limpia solo los resultados de manipulación
+        self.manipulation_results.controls = [
+            ft.Text("Resultados de Manipulación de Datos Básicos:", weight=ft.FontWeight.BOLD)
+        ]
+        df = self.app_state.get_active_dataframe()
+        if df is None:
+            self.show_notification("No hay datos para optimizar.", ft.Colors.ORANGE)
+            return
+
+        try:
+            optimized, changed_columns, bytes_before, bytes_after = self.data_analyzer.optimize_memory(df)
+            if not changed_columns:
+                self.manipulation_results.controls.append(
+                    ft.Text("🎉 Las columnas ya usan la representación más compacta.")
+                )
+            else:
+                self.app_state.load_dataframe_copy(optimized, changed_columns=changed_columns)
+                self.manipulation_results.controls.append(
+                    ft.Text(
+                        f"✔️ Memoria optimizada: {self._format_bytes(bytes_before)} → "
+                        f"{self._format_bytes(bytes_after)} "
+                        f"(ahorro de {self._format_bytes(bytes_before - bytes_after)}).",
+                        selectable=True,
+                    )
+                )
+                for col in changed_columns:
+                    self.manipulation_results.controls.append(
+                        ft.Text(
+                            f"- {col}: {df[col].dtype} → "
+                            f"{MemoryOptimizer.get_dtype_label(optimized[col].dtype)}",
+                            selectable=True,
+                        )
+                    )
+                self.show_notification("Memoria del DataFrame optimizada.", ft.Colors.GREEN)
+        except Exception as ex:
+            self.show_notification(f"Error al optimizar la memoria: {str(ex)}", ft.Colors.RED)
+            print(f"Error al optimizar la memoria: {ex}")
+
+        if self.page:
+            self.page.update()
+
+    @staticmethod
+    def _format_profile_info(profile: dict) -> str:
+        """Construye un resumen al estilo de ``DataFrame.info()`` a partir del perfil."""
+        columns = profile["columns"]
+        # En el modo aproximado los distintos son estimaciones de HyperLogLog
+        distinct_prefix = "≈" if profile.get("approximate") else ""
+        name_width = max([len(str(col)) for col in columns] + [7])
+        lines = [
+            f"Filas: {profile['num_rows']}  ·  Columnas: {profile['num_cols']}",
+            f" #   {'Columna':<{name_width}}  {'No nulos':>10}  {'Distintos':>10}  Tipo",
+        ]
+        for position, (col, column_profile) in enumerate(columns.items()):
+            lines.append(
+                f"{position:>2}   {str(col):<{name_width}}  {column_profile['non_null']:>10}  "
+                f"{distinct_prefix + str(column_profile['distinct']):>10}  {column_profile['dtype']}"
+            )
+        dtype_counts = {}
+        for column_profile in columns.values():
+            dtype_counts[column_profile["dtype"]] = dtype_counts.get(column_profile["dtype"], 0) + 1
+        lines.append("Tipos: " + ", ".join(f"{dtype}({count})" for dtype, count in dtype_counts.items()))
+        lines.append(f"Uso de memoria: {profile['memory_bytes'] / 1024:.1f} KB")
+        if profile.get("approximate"):
+            error_bounds = profile["error_bounds"]
+            lines.append(
+                "Perfil aproximado: distintos ±"
+                f"{error_bounds['distinct_relative_error'] * 100:.1f}%, cuartiles ±"
+                f"{error_bounds['quantile_rank_error'] * 100:.1f}% de rango"
+            )
+        return "\n".join(lines)
+
     def _create_dataframe_copy(self, e=None):
         """Crea una copia del DataFrame original para manipulación."""
         
@@ -334,17 +420,20 @@ class FileUploadConfig():
             self.show_notification(f"No hay datos {notification_prefix.lower()} cargados o copiados para verificar duplicados.", ft.Colors.ORANGE)
             return
 
-        duplicates = df[df.duplicated()]
-        if not duplicates.empty:
-            result = f"🔍 Se encontraron {len(duplicates)} filas duplicadas en el DataFrame {notification_prefix}:\n"
-            # Para evitar imprimir un DataFrame masivo, solo muestra las primeras filas
-            result += duplicates.head().to_string()
-            if len(duplicates) > 5:
-                result += "\n... (mostrando solo las primeras 5)"
+        # Conteo y grupos salen de los hashes por fila, sin copiar las filas duplicadas
+        num_duplicates = self.data_analyzer.count_duplicates(df)
+        if num_duplicates:
+            groups = self.data_analyzer.get_duplicate_groups(df, top_n=5)
+            result = f"🔍 Se encontraron {num_duplicates} filas duplicadas en el DataFrame {notification_prefix}.\n"
+            # Para evitar imprimir un DataFrame masivo, solo muestra los grupos más repetidos
+            result += "Filas más repetidas ('count' = apariciones):\n"
+            result += groups.to_string(index=False)
+            if len(groups) == 5:
+                result += "\n... (mostrando solo los 5 grupos más repetidos)"
             result_container.controls.append(
                 ft.Text(result, selectable=True)
             )
-            self.show_notification(f"Se encontraron {len(duplicates)} filas duplicadas en el dataset {notification_prefix.lower()}.", ft.Colors.BLUE)
+            self.show_notification(f"Se encontraron {num_duplicates} filas duplicadas en el dataset {notification_prefix.lower()}.", ft.Colors.BLUE)
         else:
             result_container.controls.append(
                 ft.Text(f"✅ No se encontraron filas duplicadas en el DataFrame {notification_prefix}.")
@@ -367,12 +456,16 @@ class FileUploadConfig():
             return
 
         initial_rows = len(df)
-        df.drop_duplicates(inplace=True)
+        # Una sola máscara (de los hashes por fila) para las filas eliminadas y las que quedan;
+        # las eliminadas se guardan para actualizar las vistas agregadas
+        duplicate_mask = self.data_analyzer.get_duplicate_mask(df)
+        removed_rows = df[duplicate_mask]
+        df = df[~duplicate_mask]
         rows_after_dedup = len(df)
 
         if initial_rows > rows_after_dedup:
             # Actualiza el DataFrame copiado en AppState
-            self.app_state.load_dataframe_copy(df) 
+            self.app_state.load_dataframe_copy(df, removed_rows=removed_rows)
             self.show_notification(f"Se eliminaron {initial_rows - rows_after_dedup} filas duplicadas.", ft.Colors.GREEN)
             self.manipulation_results.controls.append(
                 ft.Text(f"🗑️ Se eliminaron {initial_rows - rows_after_dedup} filas duplicadas.\n"
@@ -404,6 +497,7 @@ class FileUploadConfig():
         self.object_type_conversion_controls.visible = False
         self.null_handling_controls.visible = False
         self.rename_column_controls.visible = False
+        self.outlier_controls.visible = False
 
         df = self.app_state.get_active_dataframe()
         if df is None:
@@ -496,7 +590,7 @@ class FileUploadConfig():
                 df[column_name] = df[column_name].astype(str)
             
             # Actualiza el DataFrame copiado en AppState
-            self.app_state.load_dataframe_copy(df)
+            self.app_state.load_dataframe_copy(df, changed_columns=[column_name])
             self.show_notification(
                 f"Columna '{column_name}' convertida de '{original_dtype}' a '{selected_type}' exitosamente.",
                 ft.Colors.GREEN
@@ -532,6 +626,7 @@ class FileUploadConfig():
         self.null_handling_controls.visible = True
         self.object_type_conversion_controls.visible = False
         self.rename_column_controls.visible = False
+        self.outlier_controls.visible = False
 
         df = self.app_state.get_active_dataframe()
         if df is None:
@@ -583,9 +678,13 @@ class FileUploadConfig():
             # Total de nulos antes de la operación
             initial_nulls = df.isnull().sum().sum()
             initial_rows = len(df)
+            # Filas eliminadas o columnas modificadas, para actualizar las vistas agregadas
+            removed_rows = None
+            changed_columns = None
 
             if selected_strategy == "Reemplazar '?' con NaN":
                 # Aunque DataLoader ya lo hace, esto permite aplicarlo post-carga si es necesario
+                changed_columns = [col for col in df.columns if (df[col] == '?').any()]
                 df.replace('?', np.nan, inplace=True)
                 message = "Se reemplazaron '?' con NaN en el DataFrame."
 
@@ -593,6 +692,7 @@ class FileUploadConfig():
                 target_columns = [selected_column] if selected_column != "Todas las columnas" else df.columns
                 for col in target_columns:
                     if pd.api.types.is_numeric_dtype(df[col]):
+                        changed_columns = (changed_columns or []) + [col]
                         mean_val = df[col].mean()
                         df[col].fillna(mean_val, inplace=True)
                 message = f"Nulos rellenados con la media en columna(s): {selected_column}."
@@ -601,6 +701,7 @@ class FileUploadConfig():
                 target_columns = [selected_column] if selected_column != "Todas las columnas" else df.columns
                 for col in target_columns:
                     if pd.api.types.is_numeric_dtype(df[col]):
+                        changed_columns = (changed_columns or []) + [col]
                         median_val = df[col].median()
                         df[col].fillna(median_val, inplace=True)
                 message = f"Nulos rellenados con la mediana en columna(s): {selected_column}."
@@ -611,14 +712,17 @@ class FileUploadConfig():
                     # Moda puede devolver múltiples valores, tomamos el primero
                     mode_val = df[col].mode()[0] if not df[col].mode().empty else None
                     if mode_val is not None:
+                        changed_columns = (changed_columns or []) + [col]
                         df[col].fillna(mode_val, inplace=True)
                 message = f"Nulos rellenados con la moda en columna(s): {selected_column}."
 
             elif selected_strategy == "Eliminar Filas (Cualquier nulo)":
+                removed_rows = df[df.isnull().any(axis=1)]
                 df.dropna(how='any', inplace=True)
                 message = "Filas con al menos un valor nulo eliminadas."
 
             elif selected_strategy == "Eliminar Filas (Todos los nulos)":
+                removed_rows = df[df.isnull().all(axis=1)]
                 df.dropna(how='all', inplace=True)
                 message = "Filas con todos los valores nulos eliminadas."
 
@@ -627,7 +731,9 @@ class FileUploadConfig():
                 return
 
             # Actualiza el DataFrame copiado
-            self.app_state.load_dataframe_copy(df)
+            self.app_state.load_dataframe_copy(
+                df, removed_rows=removed_rows, changed_columns=changed_columns or []
+            )
             final_nulls = df.isnull().sum().sum()
             final_rows = len(df)
 
@@ -650,6 +756,128 @@ class FileUploadConfig():
         if self.page:
             self.page.update()
 
+    def _show_outlier_options(self, e=None):
+        """Muestra los controles para detectar y limpiar valores atípicos."""
+
+        # Limpia solo los resultados de manipulación
+        self.manipulation_results.controls = [
+            ft.Text("Resultados de Manipulación de Datos Básicos:", weight=ft.FontWeight.BOLD)
+        ]
+        # Oculta otros controles de manipulación
+        self.object_type_conversion_controls.visible = False
+        self.null_handling_controls.visible = False
+        self.rename_column_controls.visible = False
+        self.outlier_controls.visible = True
+
+        if self.app_state.get_active_dataframe() is None:
+            self.show_notification("No hay datos cargados o copiados para buscar valores atípicos.", ft.Colors.ORANGE)
+            self.outlier_controls.visible = False
+        else:
+            self.show_notification("Seleccione un método para detectar valores atípicos.", ft.Colors.BLUE)
+        if self.page:
+            self.page.update()
+
+    def _hide_outlier_options(self, e=None):
+        """Oculta los controles de valores atípicos."""
+        self.outlier_controls.visible = False
+        if self.page:
+            self.page.update()
+
+    def _detect_outliers(self, e=None):
+        """Muestra, por columna numérica, los umbrales y los valores atípicos encontrados."""
+
+        # Limpia solo los resultados de manipulación
+        self.manipulation_results.controls = [
+            ft.Text("Resultados de Manipulación de Datos Básicos:", weight=ft.FontWeight.BOLD)
+        ]
+        df = self.app_state.get_active_dataframe()
+        if df is None:
+            self.show_notification("No hay datos para buscar valores atípicos.", ft.Colors.ORANGE)
+            return
+
+        try:
+            report = self.data_analyzer.detect_outliers(df, self.outlier_method_dropdown.value or "iqr")
+            if not report["columns"]:
+                self.manipulation_results.controls.append(
+                    ft.Text("ℹ️ No hay columnas numéricas para buscar valores atípicos.")
+                )
+            else:
+                name_width = max([len(str(col)) for col in report["columns"]] + [7])
+                lines = [
+                    f" {'Columna':<{name_width}}{'Inferior':>14}{'Superior':>14}{'Atípicos':>11}{'%':>8}  Filas"
+                ]
+                for col, column_report in report["columns"].items():
+                    rows = ", ".join(map(str, column_report["rows"][:5]))
+                    if column_report["count"] > 5:
+                        rows += ", ..."
+                    lines.append(
+                        f" {str(col):<{name_width}}{column_report['lower']:>14.4g}{column_report['upper']:>14.4g}"
+                        f"{column_report['count']:>11}{column_report['percent']:>7.2f}%  {rows or '-'}"
+                    )
+                self.manipulation_results.controls.extend([
+                    ft.Text(
+                        f"📐 Valores atípicos ({report['method']}, factor {report['factor']:g}):",
+                        selectable=True,
+                    ),
+                    ft.Text("\n".join(lines), selectable=True, font_family="monospace"),
+                    ft.Text(
+                        f"Filas con algún valor atípico: {report['flagged_rows']} de {report['num_rows']}.",
+                        selectable=True,
+                        weight=ft.FontWeight.BOLD,
+                    ),
+                ])
+        except Exception as ex:
+            self.show_notification(f"Error al buscar valores atípicos: {str(ex)}", ft.Colors.RED)
+            print(f"Error al buscar valores atípicos: {ex}")
+
+        if self.page:
+            self.page.update()
+
+    def _apply_outlier_cleaning(self, e=None):
+        """Recorta o elimina los valores atípicos del DataFrame activo."""
+
+        # Limpia solo los resultados de manipulación
+        self.manipulation_results.controls = [
+            ft.Text("Resultados de Manipulación de Datos Básicos:", weight=ft.FontWeight.BOLD)
+        ]
+        df = self.app_state.get_active_dataframe()
+        if df is None:
+            self.show_notification("No hay datos para limpiar valores atípicos.", ft.Colors.ORANGE)
+            return
+
+        action = self.outlier_action_dropdown.value
+        if not action:
+            self.show_notification("Seleccione una acción para los valores atípicos.", ft.Colors.ORANGE)
+            return
+
+        try:
+            cleaned, changed_columns, removed_rows = self.data_analyzer.clean_outliers(
+                df, action, self.outlier_method_dropdown.value or "iqr"
+            )
+            if removed_rows is not None and not removed_rows.empty:
+                self.app_state.load_dataframe_copy(cleaned, removed_rows=removed_rows)
+                message = f"Se eliminaron {len(removed_rows)} filas con valores atípicos."
+            elif changed_columns:
+                self.app_state.load_dataframe_copy(cleaned, changed_columns=changed_columns)
+                message = f"Valores atípicos recortados en: {', '.join(map(str, changed_columns))}."
+            else:
+                message = None
+
+            if message is None:
+                self.show_notification("No se encontraron valores atípicos.", ft.Colors.BLUE_GREY_400)
+                self.manipulation_results.controls.append(ft.Text("✅ No se encontraron valores atípicos."))
+            else:
+                self.show_notification(message, ft.Colors.GREEN)
+                self.manipulation_results.controls.append(ft.Text(f"✔️ {message}", selectable=True))
+                # Después de limpiar, muestra la forma actualizada en la sección de manipulados
+                self.show_manipulated_data_info("shape")
+        except Exception as ex:
+            self.show_notification(f"Error al limpiar valores atípicos: {str(ex)}", ft.Colors.RED)
+            print(f"Error al limpiar valores atípicos: {ex}")
+
+        if self.page:
+            self.page.update()
+
     def _show_rename_column_options(self, e=None):
         """
         Muestra los controles para renombrar una columna y carga las columnas del DataFrame.
@@ -663,6 +891,7 @@ class FileUploadConfig():
         self.object_type_conversion_controls.visible = False
         self.null_handling_controls.visible = False
         self.rename_column_controls.visible = True
+        self.outlier_controls.visible = False
 
         df = self.app_state.get_active_dataframe()
         if df is None:
@@ -722,7 +951,9 @@ class FileUploadConfig():
             df.rename(columns={old_column_name: new_column_name}, inplace=True)
             
             # Actualiza el DataFrame copiado
-            self.app_state.load_dataframe_copy(df) 
+            self.app_state.load_dataframe_copy(
+                df, changed_columns=[old_column_name, new_column_name]
+            )
 
             self.show_notification(f"Columna '{old_column_name}' renombrada a '{new_column_name}' exitosamente.", ft.Colors.GREEN)
             self.manipulation_results.controls.append(
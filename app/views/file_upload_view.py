@@ -1,5 +1,6 @@
 import flet as ft
 from core.data_loader import DataLoader
+from core.data_analyzer import DataAnalyzer
 from .file_upload_confg import FileUploadConfig
 
 
@@ -7,7 +8,8 @@ class FileUploadPage(ft.Container):
     """
     Vista mejorada para cargar y validar archivos de datos.
     """
-    def __init__(self, page: ft.Page, app_state, data_loader: DataLoader):
+    def __init__(self, page: ft.Page, app_state, data_loader: DataLoader,
+                 data_analyzer: DataAnalyzer = None):
         super().__init__(
             padding=20,
             expand=True,
@@ -16,6 +18,7 @@ class FileUploadPage(ft.Container):
         self.page = page
         self.app_state = app_state
         self.data_loader = data_loader
+        self.data_analyzer = data_analyzer
 
         # Elementos de la UI
         self.file_path_text = ft.Text("Ningún archivo seleccionado.", size=14)
@@ -93,6 +96,27 @@ class FileUploadPage(ft.Container):
             expand=True
         )
 
+        # Controles para valores atípicos (inicialmente ocultos)
+        self.outlier_controls = ft.Column(visible=False)
+        self.outlier_method_dropdown = ft.Dropdown(
+            label="Método de Detección",
+            value="iqr",
+            options=[
+                ft.dropdown.Option("iqr", "IQR (1.5 × rango intercuartílico)"),
+                ft.dropdown.Option("zscore", "Z-score (3 desviaciones)"),
+                ft.dropdown.Option("mad", "MAD (puntuación z modificada > 3.5)"),
+            ],
+            expand=True
+        )
+        self.outlier_action_dropdown = ft.Dropdown(
+            label="Acción de Limpieza",
+            options=[
+                ft.dropdown.Option("cap", "Recortar a los umbrales"),
+                ft.dropdown.Option("drop", "Eliminar filas con atípicos"),
+            ],
+            expand=True
+        )
+
         # Instantiate the FileUploadConfig and pass UI elements
         self.config = FileUploadConfig(
             page=self.page,
@@ -111,7 +135,11 @@ class FileUploadPage(ft.Container):
             null_handling_strategy_dropdown=self.null_handling_strategy_dropdown,
             rename_column_controls=self.rename_column_controls,
             rename_column_dropdown=self.rename_column_dropdown,
-            new_column_name_textfield=self.new_column_name_textfield
+            new_column_name_textfield=self.new_column_name_textfield,
+            outlier_controls=self.outlier_controls,
+            outlier_method_dropdown=self.outlier_method_dropdown,
+            outlier_action_dropdown=self.outlier_action_dropdown,
+            data_analyzer=self.data_analyzer
         )
         # Set the file_picker's on_result handler to the one in config
         self.file_picker.on_result = self.config.handle_file_picker_result
@@ -184,6 +212,13 @@ class FileUploadPage(ft.Container):
                 tooltip="Información completa del DataFrame",
                 col={"sm": 12, "md": 6, "lg": 2}
             ),            
+            ft.ElevatedButton(
+                "Memoria",
+                on_click=lambda _: self.config.show_data_info("memory"),
+                icon=ft.Icons.MEMORY,
+                tooltip="Memoria por columna y tipos recomendados",
+                col={"sm": 12, "md": 6, "lg": 2}
+            ),
             ft.ElevatedButton(
                 "limpiar",
                 on_click=lambda _: self.config._clear_results(),
@@ -223,6 +258,20 @@ class FileUploadPage(ft.Container):
                 tooltip="Opciones para rellenar o eliminar valores nulos",
                 col={"sm": 12, "md": 6, "lg": 2}
             ),
+            ft.ElevatedButton(
+                "Optimizar Memoria",
+                on_click=self.config._optimize_memory,
+                icon=ft.Icons.COMPRESS,
+                tooltip="Convierte las columnas a tipos más compactos y muestra el ahorro",
+                col={"sm": 12, "md": 6, "lg": 2}
+            ),
+            ft.ElevatedButton(
+                "Valores Atípicos",
+                on_click=self.config._show_outlier_options,
+                icon=ft.Icons.SCATTER_PLOT,
+                tooltip="Detecta valores atípicos (IQR, z-score, MAD) y los recorta o elimina",
+                col={"sm": 12, "md": 6, "lg": 2}
+            ),
             # Nuevo botón para modificar nombres de columnas
             ft.ElevatedButton(
                 "Modificar Nombres Columnas",
@@ -284,6 +333,13 @@ class FileUploadPage(ft.Container):
                 tooltip="Información completa de la copia del DataFrame",
                 col={"sm": 12, "md": 6, "lg": 2}
             ),            
+            ft.ElevatedButton(
+                "Memoria",
+                on_click=lambda _: self.config.show_manipulated_data_info("memory"),
+                icon=ft.Icons.MEMORY,
+                tooltip="Memoria por columna de la copia y tipos recomendados",
+                col={"sm": 12, "md": 6, "lg": 2}
+            ),
         ], spacing=10)
 
         # Build `null_handling_controls` using self.config methods
@@ -303,6 +359,15 @@ class FileUploadPage(ft.Container):
             ft.ElevatedButton("Cerrar Opciones de Renombre", on_click=self.config._hide_rename_column_options)
         ])
 
+        # Build `outlier_controls` using self.config methods
+        self.outlier_controls.controls.extend([
+            ft.Text("Valores Atípicos:", weight=ft.FontWeight.BOLD),
+            ft.Row([self.outlier_method_dropdown, self.outlier_action_dropdown]),
+            ft.ElevatedButton("Detectar Atípicos", on_click=self.config._detect_outliers),
+            ft.ElevatedButton("Aplicar Limpieza", on_click=self.config._apply_outlier_cleaning),
+            ft.ElevatedButton("Cerrar Opciones de Atípicos", on_click=self.config._hide_outlier_options)
+        ])
+
         # Construir interfaz
         self.content = self._build_content()
 
@@ -343,6 +408,7 @@ class FileUploadPage(ft.Container):
                 self.object_type_conversion_controls,
                 self.null_handling_controls,
                 self.rename_column_controls,
+                self.outlier_controls,
 
                 ft.Container(
                     self.manipulation_results,
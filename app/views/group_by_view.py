@@ -0,0 +1,214 @@
+import asyncio
+import time
+import flet as ft
+import pandas as pd
+from functools import partial
+from core.data_analyzer import DataAnalyzer
+from core.group_aggregator import GROUP_AGGREGATE_FUNCTIONS, COUNT_ALL_COLUMN
+from app.controls.data_table_custom import DataTableCustom
+
+# Grupos que se muestran como máximo en la tabla de resultados
+MAX_DISPLAYED_GROUPS = 500
+
+
+class GroupByPage(ft.Container):
+    """
+    Vista para agrupar el DataFrame activo por una o varias columnas y
+    calcular varias agregaciones a la vez, sin escribir SQL.
+    """
+
+    def __init__(self, page: ft.Page, app_state, data_analyzer: DataAnalyzer):
+        super().__init__(padding=20, expand=True, alignment=ft.alignment.top_left)
+        self.page = page
+        self.app_state = app_state
+        self.data_analyzer = data_analyzer
+        # Agregaciones elegidas: pares (función, columna)
+        self.aggregations: list = []
+
+        self.keys_selector = ft.Row(wrap=True, spacing=10)
+        self.function_dropdown = ft.Dropdown(
+            label="Función",
+            value="sum",
+            options=[ft.dropdown.Option(function) for function in GROUP_AGGREGATE_FUNCTIONS],
+            width=160,
+        )
+        self.column_dropdown = ft.Dropdown(label="Columna", width=240)
+        self.engine_dropdown = ft.Dropdown(
+            label="Motor",
+            value="duckdb",
+            options=[
+                ft.dropdown.Option("duckdb", "DuckDB"),
+                ft.dropdown.Option("pandas", "Pandas"),
+            ],
+            width=140,
+        )
+        self.aggregations_display = ft.Row(wrap=True, spacing=5)
+        self.run_button = ft.ElevatedButton(
+            "Calcular", icon=ft.Icons.PLAY_ARROW, on_click=self.handle_run_group_by
+        )
+        self.status_text = ft.Text("")
+        self.results_table_display = DataTableCustom(title="Resumen por grupos")
+
+        self.content = self._build_content()
+
+    def _build_content(self):
+        """Construye la interfaz de la vista."""
+        return ft.Column(
+            [
+                ft.Text("Agrupar y Resumir", size=24, weight=ft.FontWeight.BOLD),
+                ft.Text(
+                    "Elige las columnas de agrupación y las agregaciones; se calculan "
+                    "todas en una sola pasada sobre el DataFrame activo."
+                ),
+                ft.Text("Agrupar por:", weight=ft.FontWeight.BOLD),
+                self.keys_selector,
+                ft.Text("Agregaciones:", weight=ft.FontWeight.BOLD),
+                ft.Row(
+                    [
+                        self.function_dropdown,
+                        self.column_dropdown,
+                        ft.ElevatedButton(
+                            "Añadir", icon=ft.Icons.ADD, on_click=self.handle_add_aggregation
+                        ),
+                    ],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+                self.aggregations_display,
+                ft.Row(
+                    [self.engine_dropdown, self.run_button],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+                self.status_text,
+                ft.Divider(),
+                self.results_table_display,
+            ],
+            spacing=15,
+            expand=True,
+            scroll=ft.ScrollMode.ADAPTIVE,
+        )
+
+    def did_mount(self):
+        """Refresca las columnas disponibles cada vez que se muestra la vista."""
+        self._refresh_columns()
+        self.update()
+
+    def _refresh_columns(self):
+        """Actualiza los selectores con las columnas del DataFrame activo."""
+        df = self.app_state.get_active_dataframe()
+        columns = [str(column) for column in df.columns] if df is not None else []
+        selected_keys = {
+            checkbox.label for checkbox in self.keys_selector.controls if checkbox.value
+        }
+        self.keys_selector.controls = [
+            ft.Checkbox(label=column, value=column in selected_keys) for column in columns
+        ] or [ft.Text("Carga un archivo para elegir columnas.", color=ft.Colors.GREY_600)]
+        self.column_dropdown.options = [
+            ft.dropdown.Option(COUNT_ALL_COLUMN, "* (filas)")
+        ] + [ft.dropdown.Option(column) for column in columns]
+        # Descarta las agregaciones sobre columnas que ya no existen
+        self.aggregations = [
+            (function, column)
+            for function, column in self.aggregations
+            if column == COUNT_ALL_COLUMN or column in columns
+        ]
+        self._refresh_aggregations()
+
+    def _refresh_aggregations(self):
+        """Muestra las agregaciones elegidas; cada una se puede quitar."""
+        self.aggregations_display.controls = [
+            ft.Chip(
+                label=ft.Text(f"{function}({column})"),
+                on_delete=partial(self.handle_remove_aggregation, aggregation=(function, column)),
+            )
+            for function, column in self.aggregations
+        ]
+
+    def handle_add_aggregation(self, e):
+        """Añade la agregación seleccionada."""
+        function = self.function_dropdown.value
+        column = self.column_dropdown.value
+        if not function or not column:
+            self._set_status("Elige una función y una columna.", ft.Colors.ORANGE_700)
+        elif column == COUNT_ALL_COLUMN and function != "count":
+            self._set_status("'*' (filas) solo se admite con count.", ft.Colors.ORANGE_700)
+        elif (function, column) not in self.aggregations:
+            self.aggregations.append((function, column))
+            self._refresh_aggregations()
+        if self.page is not None:
+            self.page.update()
+
+    def handle_remove_aggregation(self, e, aggregation: tuple):
+        """Quita una agregación de la lista."""
+        if aggregation in self.aggregations:
+            self.aggregations.remove(aggregation)
+        self._refresh_aggregations()
+        if self.page is not None:
+            self.page.update()
+
+    def _set_status(self, message: str, color):
+        """Actualiza el mensaje de estado."""
+        self.status_text.value = message
+        self.status_text.color = color
+
+    async def handle_run_group_by(self, e):
+        """Calcula el resumen por grupos sin bloquear la interfaz."""
+        df = self.app_state.get_active_dataframe()
+        # Las columnas se muestran como texto: se recupera su nombre original
+        columns_by_label = {str(column): column for column in df.columns} if df is not None else {}
+        keys = [
+            columns_by_label[checkbox.label]
+            for checkbox in self.keys_selector.controls
+            if isinstance(checkbox, ft.Checkbox) and checkbox.value
+        ]
+        aggregations = [
+            (function, columns_by_label.get(column, column))
+            for function, column in self.aggregations
+        ]
+        if df is None:
+            self._set_status("Error: No hay un DataFrame cargado.", ft.Colors.ORANGE_700)
+        elif not keys or not aggregations:
+            self._set_status(
+                "Error: Elige al menos una columna de agrupación y una agregación.",
+                ft.Colors.RED_ACCENT_700,
+            )
+        else:
+            self._set_status("Calculando...", ft.Colors.BLUE_GREY_400)
+            self.run_button.disabled = True
+            if self.page is not None:
+                self.page.update()
+
+            start_time = time.perf_counter()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    partial(
+                        self.data_analyzer.group_aggregate,
+                        df,
+                        keys,
+                        aggregations,
+                        engine=self.engine_dropdown.value or "duckdb",
+                    ),
+                )
+                elapsed = time.perf_counter() - start_time
+                shown = result.head(MAX_DISPLAYED_GROUPS)
+                self.results_table_display.update_dataframe(
+                    shown,
+                    f"Resumen por {', '.join(map(str, keys))}"
+                    + (f" (primeros {len(shown)} de {len(result)} grupos)" if len(result) > len(shown) else ""),
+                )
+                self._set_status(
+                    f"{len(result)} grupos calculados en {elapsed:.2f} s.",
+                    ft.Colors.GREEN_ACCENT_700,
+                )
+            except ValueError as ex:
+                self._set_status(f"Error: {ex}", ft.Colors.RED_ACCENT_700)
+                self.results_table_display.update_dataframe(pd.DataFrame())
+            except Exception as ex:
+                self._set_status(f"Error al agrupar: {ex}", ft.Colors.RED_ACCENT_700)
+                print(f"Error al agrupar: {ex}")
+            self.run_button.disabled = False
+
+        if self.page is not None:
+            self.page.update()
@@ -26,6 +26,8 @@ class LibraryPage(ft.Container):  # Hereda de ft.Container
             ("Flet-core", "Core de flet."),
             ("Pandas", "Para manipulación y análisis de datos."),
             ("DuckDB", "Para consultas SQL sobre DataFrames."),
+            ("PyArrow", "Para leer por lotes los resultados de las consultas SQL."),
+            ("Polars", "Backend opcional y multihilo para consultas SQL y estadísticas."),
             ("ReportLab", "Para generación de PDFs."),
             ("NumPy", "Para cálculos numéricos avanzados."),
             ("Matplotlib", "Para visualización de datos."),
@@ -1,17 +1,24 @@
+import asyncio
+import time
 import flet as ft
 import pandas as pd
-from core.query_engine import QueryEngine
+from functools import partial
+from core.query_engine import QueryEngine, QueryCancelledError
+from core.aggregate_view import AggregateView
 from app.controls.data_table_custom import DataTableCustom
+from app.controls.query_plan_view import QueryPlanView
 
 
 class QueryPage(ft.Container):
     """Vista para realizar consultas SQL sobre el DataFrame cargado."""
-    
+
     def __init__(self, page: ft.Page, app_state, query_engine: QueryEngine):
         super().__init__(padding=20, expand=True, alignment=ft.alignment.top_left)
         self.page = page
         self.app_state = app_state
         self.query_engine = query_engine
+        # Etiqueta de las consultas de esta vista: "Cancelar" no afecta a otras
+        self._query_tag = f"query-page-{id(self)}"
 
         self.query_input = ft.TextField(
             label="Escribe tu consulta SQL aquí...",
@@ -20,8 +27,98 @@ class QueryPage(ft.Container):
             max_lines=5,
             expand=True,
         )
-        self.results_table_display = DataTableCustom(title="Resultados de la Consulta")
+        self.timeout_input = ft.TextField(
+            label="Tiempo límite (s)",
+            value=(
+                str(self.query_engine.default_timeout)
+                if self.query_engine.default_timeout
+                else ""
+            ),
+            hint_text="Sin límite",
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=160,
+        )
+        self.execute_button = ft.ElevatedButton(
+            "Ejecutar Consulta",
+            icon=ft.Icons.PLAY_ARROW,
+            on_click=self.handle_execute_query,
+        )
+        self.cancel_button = ft.ElevatedButton(
+            "Cancelar",
+            icon=ft.Icons.STOP,
+            on_click=self.handle_cancel_query,
+            disabled=True,
+            tooltip="Interrumpe la consulta en ejecución",
+        )
+        self.profile_checkbox = ft.Checkbox(
+            label="Perfilar consulta",
+            value=False,
+            tooltip=(
+                "Perfila la propia ejecución con DuckDB; el plan aparece al leer la "
+                "última página. Con el backend Polars, la consulta se ejecuta de nuevo en DuckDB"
+            ),
+        )
+        self.results_table_display = DataTableCustom(
+            title="Resultados de la Consulta",
+            query_engine=query_engine,
+            on_page_change=self._handle_results_page_change,
+        )
+        # Cursor perfilado cuyo plan se espera (DuckDB lo escribe al terminar el resultado)
+        self._profiled_cursor = None
+        self.query_plan_display = QueryPlanView()
+        self.query_plan_display.visible = False
         self.query_status = ft.Text("", ref=ft.Ref())
+        self.tables_info = ft.Text("", size=12, color=ft.Colors.GREY_600, selectable=True)
+        self.file_source_path_input = ft.TextField(
+            label="Archivo o patrón (Parquet, CSV, JSON)",
+            hint_text="p. ej. /datos/ventas_*.parquet",
+            expand=True,
+        )
+        self.file_source_name_input = ft.TextField(
+            label="Nombre de la tabla",
+            hint_text="p. ej. ventas",
+            width=220,
+        )
+        self.materialize_name_input = ft.TextField(
+            label="Nombre de la tabla",
+            hint_text="p. ej. ventas_por_mes",
+            width=220,
+        )
+        self.materialize_button = ft.ElevatedButton(
+            "Materializar resultado",
+            icon=ft.Icons.SAVE_ALT,
+            on_click=self.handle_materialize_query,
+            tooltip=(
+                "Guarda el resultado de la consulta como tabla reutilizable"
+                if not self.query_engine.is_persistent()
+                else "Guarda el resultado de la consulta como tabla persistente en disco"
+            ),
+        )
+
+        self.aggregate_name_input = ft.TextField(
+            label="Nombre de la vista",
+            hint_text="p. ej. ventas_por_region",
+            width=200,
+        )
+        self.aggregate_keys_input = ft.TextField(
+            label="Agrupar por (columnas)",
+            hint_text="p. ej. region, mes",
+            width=220,
+        )
+        self.aggregate_functions_input = ft.TextField(
+            label="Agregaciones",
+            hint_text="p. ej. sum(ventas), mean(precio), count(id)",
+            expand=True,
+        )
+        self.slow_only_checkbox = ft.Checkbox(
+            label="Solo consultas lentas",
+            value=False,
+            on_change=lambda e: self._refresh_history(),
+        )
+        self.history_list = ft.Column(spacing=2)
+        # Consultas agrupadas por texto SQL: las recurrentes y costosas son
+        # candidatas a materializarse
+        self.statistics_list = ft.Column(spacing=2)
 
         self.content = self._build_content()
 
@@ -31,27 +128,290 @@ class QueryPage(ft.Container):
             [
                 ft.Text("Realizar Consultas SQL", size=24, weight=ft.FontWeight.BOLD),
                 ft.Text("Escribe y ejecuta consultas SQL sobre el DataFrame cargado."),
+                self.tables_info,
+                ft.Row(
+                    [
+                        self.file_source_path_input,
+                        self.file_source_name_input,
+                        ft.ElevatedButton(
+                            "Registrar archivo",
+                            icon=ft.Icons.LINK,
+                            on_click=self.handle_register_file_source,
+                            tooltip="Consulta el archivo directamente con DuckDB, sin cargarlo en memoria",
+                        ),
+                    ],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
                 self.query_input,
-                ft.ElevatedButton(
-                    "Ejecutar Consulta",
-                    icon=ft.Icons.PLAY_ARROW,
-                    on_click=self.handle_execute_query,
+                ft.Row(
+                    [
+                        self.execute_button,
+                        self.cancel_button,
+                        self.timeout_input,
+                        self.profile_checkbox,
+                    ],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+                ft.Row(
+                    [self.materialize_name_input, self.materialize_button],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+                ft.Row(
+                    [
+                        self.aggregate_name_input,
+                        self.aggregate_keys_input,
+                        self.aggregate_functions_input,
+                        ft.ElevatedButton(
+                            "Crear vista agregada",
+                            icon=ft.Icons.FUNCTIONS,
+                            on_click=self.handle_create_aggregate_view,
+                            tooltip=(
+                                "Agregado (sum, count, min, max, mean) que se actualiza de forma "
+                                "incremental al limpiar los datos"
+                            ),
+                        ),
+                    ],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
                 ),
                 self.query_status,
                 ft.Divider(),
-                self.results_table_display,
+                ft.Row(
+                    [self.results_table_display, self.query_plan_display],
+                    spacing=10,
+                    vertical_alignment=ft.CrossAxisAlignment.START,
+                ),
+                ft.ExpansionTile(
+                    title=ft.Text("Historial de consultas", weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(
+                        "Tiempo, filas y bytes de cada ejecución; pulsa ▶ para repetirla.",
+                        size=12,
+                    ),
+                    initially_expanded=False,
+                    controls=[
+                        self.slow_only_checkbox,
+                        self.history_list,
+                        ft.Text(
+                            "Consultas con más tiempo acumulado",
+                            weight=ft.FontWeight.BOLD,
+                            tooltip="Las que se repiten y tardan son candidatas a materializar",
+                        ),
+                        self.statistics_list,
+                    ],
+                    controls_padding=ft.padding.only(left=15, bottom=10),
+                ),
             ],
             spacing=15,
             expand=True,
             scroll=ft.ScrollMode.ADAPTIVE,
         )
 
-    def handle_execute_query(self, e):
+    def did_mount(self):
+        """Refresca la lista de tablas y el historial cada vez que se muestra la vista."""
+        self._refresh_tables_info()
+        self._refresh_history()
+        self.update()
+
+    def _refresh_tables_info(self):
+        """Muestra las tablas disponibles para la consulta."""
+        table_names = list(self.app_state.get_query_tables())
+        materialized_names = self.query_engine.list_materialized_tables()
+        if table_names:
+            self.tables_info.value = (
+                "Tablas disponibles (admiten JOIN y UNION): " + ", ".join(table_names)
+            )
+        else:
+            self.tables_info.value = "Carga un archivo para consultarlo como 'my_table'."
+        if materialized_names:
+            self.tables_info.value += "\nTablas materializadas: " + ", ".join(
+                materialized_names
+            )
+        aggregate_views = self.query_engine.list_aggregate_views()
+        if aggregate_views:
+            self.tables_info.value += "\nVistas agregadas: " + ", ".join(
+                f"{view['name']} ({view['groups']} grupos"
+                + (", desactualizada" if view["error"] else "")
+                + ")"
+                for view in aggregate_views
+            )
+        file_sources = self.query_engine.get_file_sources()
+        if file_sources:
+            self.tables_info.value += "\nArchivos consultados en disco: " + ", ".join(
+                f"{name} ({path})" for name, path in file_sources.items()
+            )
+
+    def _refresh_history(self, limit: int = 20):
+        """Muestra las últimas consultas del historial con sus estadísticas."""
+        history = self.query_engine.history
+        if history is None:
+            self.history_list.controls = [
+                ft.Text("El historial de consultas está desactivado.", color=ft.Colors.GREY_600)
+            ]
+            self.statistics_list.controls = []
+            return
+
+        entries = history.get_entries(limit=limit, slow_only=bool(self.slow_only_checkbox.value))
+        if not entries:
+            self.history_list.controls = [
+                ft.Text("Aún no hay consultas registradas.", color=ft.Colors.GREY_600)
+            ]
+        else:
+            self.history_list.controls = [self._build_history_row(entry) for entry in entries]
+        self.statistics_list.controls = [
+            self._build_statistics_row(stats) for stats in history.get_query_statistics()[:5]
+        ]
+        if self.page is not None and self.history_list.page is not None:
+            self.history_list.update()
+            self.statistics_list.update()
+
+    def _build_history_row(self, entry: dict):
+        """Construye la fila de una entrada del historial."""
+        rows = entry["rows_returned"] if entry["rows_returned"] is not None else "?"
+        details = (
+            f"{entry['timestamp']} · {entry['wall_time']:.2f} s · {rows} filas · "
+            f"{QueryPlanView._format_bytes(entry['bytes_materialized'])}"
+        )
+        if entry["cache_hits"]:
+            details += " · resultado reutilizado"
+        if entry["status"] != "ok":
+            details += f" · {entry['status']}"
+
+        return ft.Row(
+            [
+                ft.IconButton(
+                    ft.Icons.REPLAY,
+                    tooltip="Volver a ejecutar esta consulta",
+                    on_click=partial(self.handle_rerun_query, query_str=entry["query"]),
+                ),
+                ft.Column(
+                    [
+                        ft.Text(
+                            " ".join(entry["query"].split())[:150],
+                            size=13,
+                            selectable=True,
+                            weight=ft.FontWeight.BOLD if entry["slow"] else None,
+                        ),
+                        ft.Text(
+                            details,
+                            size=11,
+                            color=ft.Colors.RED_ACCENT_700 if entry["slow"] else ft.Colors.GREY_600,
+                        ),
+                    ],
+                    spacing=0,
+                    expand=True,
+                ),
+            ],
+            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+    def _build_statistics_row(self, stats: dict):
+        """Construye la fila de una consulta agrupada de ``get_query_statistics``."""
+        details = (
+            f"{stats['executions']} ejecuciones · total {stats['total_time']:.2f} s · "
+            f"media {stats['mean_time']:.2f} s · máx. {stats['max_time']:.2f} s · "
+            f"{stats['slow_executions']} lentas · {stats['cache_hits']} reutilizadas"
+        )
+        return ft.Column(
+            [
+                ft.Text(" ".join(stats["query"].split())[:150], size=13, selectable=True),
+                ft.Text(
+                    details,
+                    size=11,
+                    color=(
+                        ft.Colors.RED_ACCENT_700 if stats["slow_executions"] else ft.Colors.GREY_600
+                    ),
+                ),
+            ],
+            spacing=0,
+        )
+
+    async def handle_rerun_query(self, e, query_str: str):
+        """Carga una consulta del historial en el editor y la ejecuta."""
+        self.query_input.value = query_str
+        await self.handle_execute_query(e)
+
+    def _has_query_sources(self) -> bool:
+        """Indica si hay alguna tabla o archivo que consultar."""
+        return bool(
+            self.app_state.get_active_dataframe() is not None
+            or self.query_engine.get_file_sources()
+            or self.query_engine.list_materialized_tables()
+        )
+
+    def handle_register_file_source(self, e):
+        """Registra un archivo o patrón glob como tabla consultable."""
+        path = (self.file_source_path_input.value or "").strip()
+        table_name = (self.file_source_name_input.value or "").strip()
+        if not path or not table_name:
+            self.query_status.value = "Error: Indica la ruta del archivo y el nombre de la tabla."
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+        else:
+            try:
+                self.query_engine.register_file_source(table_name, path)
+                self.query_status.value = f"Archivo registrado como tabla '{table_name}'."
+                self.query_status.color = ft.Colors.GREEN_ACCENT_700
+                self._refresh_tables_info()
+            except ValueError as ex:
+                self.query_status.value = f"Error: {ex}"
+                self.query_status.color = ft.Colors.RED_ACCENT_700
+        if self.page is not None:
+            self.page.update()
+
+    def handle_create_aggregate_view(self, e):
+        """Crea una vista agregada materializada sobre el DataFrame activo."""
+        name = (self.aggregate_name_input.value or "").strip()
+        keys = [
+            key.strip() for key in (self.aggregate_keys_input.value or "").split(",") if key.strip()
+        ]
+        try:
+            aggregations = AggregateView.parse_aggregations(
+                self.aggregate_functions_input.value
+            )
+            result = self.query_engine.create_aggregate_view(
+                name,
+                self.app_state.get_active_dataframe(),
+                keys,
+                aggregations,
+                version=self.app_state.get_dataset_version(),
+            )
+            self.query_status.value = (
+                f"Vista agregada '{name}' creada con {len(result)} grupos. "
+                f"Consúltala con SELECT * FROM {name}."
+            )
+            self.query_status.color = ft.Colors.GREEN_ACCENT_700
+            self.query_input.value = f"SELECT * FROM {name}"
+            self._refresh_tables_info()
+        except ValueError as ex:
+            self.query_status.value = f"Error: {ex}"
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+        if self.page is not None:
+            self.page.update()
+
+    def _set_running(self, running: bool):
+        """Habilita o deshabilita los botones según haya una consulta en curso."""
+        self.execute_button.disabled = running
+        self.materialize_button.disabled = running
+        self.cancel_button.disabled = not running
+
+    def _get_timeout(self):
+        """Lee el tiempo límite introducido; vacío o 0 significa sin límite."""
+        value = (self.timeout_input.value or "").strip()
+        if not value:
+            return 0
+        timeout = float(value)
+        if timeout < 0:
+            raise ValueError("El tiempo límite no puede ser negativo.")
+        return timeout
+
+    async def handle_execute_query(self, e):
         """Maneja la ejecución de la consulta SQL."""
-        df_original = self.app_state.get_dataframe()
+        df_original = self.app_state.get_active_dataframe()
         query_str = self.query_input.value
 
-        if df_original is None:
+        if not self._has_query_sources():
             self.query_status.value = (
                 "Error: No hay un DataFrame cargado para consultar."
             )
@@ -73,30 +433,97 @@ class QueryPage(ft.Container):
                 self.page.update()
             return
 
+        try:
+            timeout = self._get_timeout()
+        except ValueError:
+            self.query_status.value = "Error: El tiempo límite debe ser un número de segundos."
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+            if self.page is not None:
+                self.page.update()
+            return
+
         self.query_status.value = "Ejecutando consulta..."
         self.query_status.color = ft.Colors.BLUE_GREY_400
+        self._refresh_tables_info()
+        self._set_running(True)
         if self.page is not None:
             self.page.update()
 
-        try:
-            # Ejecución de consulta con QueryEngine
-            result_df = self.query_engine.execute_query_on_dataframe(
-                df_original, query_str
+        await self._run_query(
+            df_original, query_str, timeout, bool(self.profile_checkbox.value)
+        )
+
+    async def _run_query(
+        self, df: pd.DataFrame, query_str: str, timeout: float, profile: bool = False
+    ):
+        """Espera el resultado de la consulta mostrando el tiempo transcurrido."""
+        start_time = time.perf_counter()
+        tables = self.app_state.get_query_tables()
+        # La consulta corre en el pool del motor; el bucle de eventos sigue libre
+        query_task = asyncio.ensure_future(
+            self.query_engine.query(
+                df,
+                query_str,
+                timeout=timeout,
+                tables=tables,
+                dataset_version=self.app_state.get_dataset_version(),
+                tag=self._query_tag,
+                profile=profile,
             )
+        )
+        self.query_plan_display.visible = False
+        self._profiled_cursor = None
 
-            if not result_df.empty:
-                self.results_table_display.update_dataframe(
-                    result_df, "Resultados de la Consulta"
+        while not query_task.done():
+            await asyncio.wait({query_task}, timeout=0.25)
+            elapsed = time.perf_counter() - start_time
+            if not query_task.done():
+                self.query_status.value = f"Ejecutando consulta... {elapsed:.1f} s"
+                if self.page is not None:
+                    self.page.update()
+
+        elapsed = time.perf_counter() - start_time
+        try:
+            # Ejecución de consulta con QueryEngine; solo se lee la primera página
+            result_cursor = query_task.result()
+
+            if not result_cursor.is_empty():
+                self.results_table_display.update_cursor(
+                    result_cursor, "Resultados de la Consulta"
                 )
-                self.query_status.value = f"Consulta ejecutada exitosamente. Se encontraron {len(result_df)} resultados."
+                if result_cursor.total_rows is not None:
+                    found_text = f"Se encontraron {result_cursor.total_rows} resultados."
+                else:
+                    # El total se conoce al leer la última página
+                    found_text = "El total de resultados se conocerá al llegar a la última página."
+                self.query_status.value = f"Consulta ejecutada exitosamente en {elapsed:.2f} s. {found_text}"
                 self.query_status.color = ft.Colors.GREEN_ACCENT_700
+                if profile:
+                    await self._show_query_plan(result_cursor, df, query_str, timeout, tables)
             else:
+                if profile:
+                    await self._show_query_plan(result_cursor, df, query_str, timeout, tables)
+                result_cursor.close()
                 self.results_table_display.update_dataframe(
                     pd.DataFrame(), "La consulta no devolvió resultados."
                 )
                 self.query_status.value = "Consulta ejecutada, pero no hay resultados."
                 self.query_status.color = ft.Colors.AMBER_700
 
+        except TimeoutError as ex:
+            self.results_table_display.update_dataframe(
+                pd.DataFrame(), "La consulta superó el tiempo límite."
+            )
+            self.query_status.value = f"Error: {ex}"
+            self.query_status.color = ft.Colors.ORANGE_700
+
+        except QueryCancelledError:
+            self.results_table_display.update_dataframe(
+                pd.DataFrame(), "Consulta cancelada."
+            )
+            self.query_status.value = f"Consulta cancelada tras {elapsed:.1f} s."
+            self.query_status.color = ft.Colors.AMBER_700
+
         except Exception as ex:
             self.results_table_display.update_dataframe(
                 pd.DataFrame(), "Error al ejecutar la consulta."
@@ -105,5 +532,125 @@ class QueryPage(ft.Container):
             self.query_status.color = ft.Colors.RED_ACCENT_700
             print(f"Error en consulta: {ex}")
 
+        self._refresh_history()
+        self._set_running(False)
+        if self.page is not None:
+            self.page.update()
+
+    async def _show_query_plan(
+        self, result_cursor, df: pd.DataFrame, query_str: str, timeout: float, tables=None
+    ):
+        """
+        Muestra el plan de la consulta junto a los resultados. Con DuckDB es el
+        perfil de la propia ejecución; con Polars, la consulta se perfila aparte.
+        """
+        if self.query_engine.backend != "polars":
+            self._profiled_cursor = result_cursor
+            self.query_plan_display.visible = True
+            self._handle_results_page_change(result_cursor)
+            return
+
+        self.query_status.value += " Perfilando consulta (se ejecuta de nuevo en DuckDB)..."
+        if self.page is not None:
+            self.page.update()
+        try:
+            query_profile = await self.query_engine.run_async(
+                self.query_engine.profile_query,
+                df,
+                query_str,
+                timeout=timeout,
+                tables=tables,
+                tag=self._query_tag,
+            )
+            self.query_plan_display.visible = True
+            self.query_plan_display.update_profile(query_profile)
+            self.query_status.value = self.query_status.value.replace(
+                " Perfilando consulta (se ejecuta de nuevo en DuckDB)...", ""
+            )
+        except Exception as ex:
+            self.query_plan_display.visible = False
+            self.query_status.value = self.query_status.value.replace(
+                " Perfilando consulta (se ejecuta de nuevo en DuckDB)...",
+                f" No se pudo perfilar la consulta: {ex}",
+            )
+            print(f"Error al perfilar consulta: {ex}")
+
+    def _handle_results_page_change(self, result_cursor):
+        """Muestra el plan del cursor perfilado en cuanto DuckDB lo escribe."""
+        if result_cursor is not self._profiled_cursor:
+            return
+        query_profile = self.query_engine.get_query_profile(result_cursor)
+        if query_profile is None:
+            self.query_plan_display.show_message(
+                "El plan estará disponible al llegar a la última página del resultado."
+            )
+            return
+        self._profiled_cursor = None
+        self.query_plan_display.update_profile(query_profile)
+
+    async def handle_materialize_query(self, e):
+        """Guarda el resultado de la consulta como tabla materializada."""
+        query_str = self.query_input.value
+        table_name = (self.materialize_name_input.value or "").strip()
+
+        if not query_str or not table_name:
+            self.query_status.value = (
+                "Error: Escribe una consulta y el nombre de la tabla a materializar."
+            )
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+            if self.page is not None:
+                self.page.update()
+            return
+
+        try:
+            timeout = self._get_timeout()
+        except ValueError:
+            self.query_status.value = "Error: El tiempo límite debe ser un número de segundos."
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+            if self.page is not None:
+                self.page.update()
+            return
+
+        self.query_status.value = f"Materializando la tabla '{table_name}'..."
+        self.query_status.color = ft.Colors.BLUE_GREY_400
+        self._set_running(True)
+        if self.page is not None:
+            self.page.update()
+
+        start_time = time.perf_counter()
+        try:
+            row_count = await self.query_engine.run_async(
+                self.query_engine.materialize_query,
+                self.app_state.get_active_dataframe(),
+                query_str,
+                table_name,
+                tables=self.app_state.get_query_tables(),
+                timeout=timeout,
+                tag=self._query_tag,
+            )
+            elapsed = time.perf_counter() - start_time
+            self.query_status.value = (
+                f"Tabla '{table_name}' materializada con {row_count} filas en {elapsed:.2f} s."
+            )
+            self.query_status.color = ft.Colors.GREEN_ACCENT_700
+            self._refresh_tables_info()
+        except QueryCancelledError:
+            self.query_status.value = "Materialización cancelada."
+            self.query_status.color = ft.Colors.AMBER_700
+        except Exception as ex:
+            self.query_status.value = f"Error: {ex}"
+            self.query_status.color = ft.Colors.RED_ACCENT_700
+            print(f"Error al materializar consulta: {ex}")
+
+        self._set_running(False)
+        if self.page is not None:
+            self.page.update()
+
+    def handle_cancel_query(self, e):
+        """Cancela la consulta en ejecución de esta vista."""
+        if self.query_engine.cancel_running_queries(self._query_tag):
+            self.query_status.value = "Cancelando consulta..."
+            self.query_status.color = ft.Colors.AMBER_700
+        self.cancel_button.disabled = True
         if self.page is not None:
             self.page.update()
@@ -0,0 +1,128 @@
+"""
+Benchmark de los backends de ejecución: pandas, DuckDB y Polars.
+
+Ejecuta las mismas operaciones (filtro, group-by y estadísticas descriptivas)
+sobre un DataFrame sintético y muestra el mejor tiempo de cada backend.
+
+Uso:
+    python benchmarks/backend_benchmark.py --rows 5000000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.data_analyzer import DataAnalyzer
+from core.polars_backend import PolarsBackend
+from core.query_engine import QueryEngine
+
+FILTER_SQL = "SELECT COUNT(*) AS n FROM my_table WHERE value > 0.5 AND category <> 'c3'"
+GROUP_BY_SQL = (
+    "SELECT category, SUM(value) AS total, AVG(amount) AS mean_amount, COUNT(*) AS n "
+    "FROM my_table GROUP BY category ORDER BY category"
+)
+
+
+def make_dataframe(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Crea un DataFrame sintético con columnas numéricas, categóricas y nulos."""
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100, 25, rows)
+    amount[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "category": rng.choice([f"c{i}" for i in range(50)], rows),
+            "value": rng.random(rows),
+            "amount": amount,
+            "quantity": rng.integers(0, 1000, rows),
+        }
+    )
+
+
+def best_time(function, repeat: int) -> float:
+    """Retorna el mejor tiempo (s) de ``repeat`` ejecuciones."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_dataframe(args.rows)
+    duckdb_engine = QueryEngine()
+    # Sin caché: cada repetición recalcula las estadísticas
+    pandas_analyzer = DataAnalyzer(cache_size=0)
+
+    operations = {
+        "filtro": {
+            "pandas": lambda: int(((df["value"] > 0.5) & (df["category"] != "c3")).sum()),
+            "duckdb": lambda: duckdb_engine.execute_query_on_dataframe(df, FILTER_SQL),
+        },
+        "group-by": {
+            "pandas": lambda: df.groupby("category")
+            .agg(total=("value", "sum"), mean_amount=("amount", "mean"), n=("value", "size"))
+            .reset_index(),
+            "duckdb": lambda: duckdb_engine.execute_query_on_dataframe(df, GROUP_BY_SQL),
+        },
+        "describe": {
+            "pandas": lambda: pandas_analyzer.get_descriptive_statistics(df),
+        },
+        "value_counts": {
+            "pandas": lambda: pandas_analyzer.get_unique_values(df, "category"),
+        },
+    }
+
+    if PolarsBackend.is_available():
+        polars_engine = QueryEngine(backend="polars")
+        polars_analyzer = DataAnalyzer(backend="polars", cache_size=0)
+        operations["filtro"]["polars"] = lambda: polars_engine.execute_query_on_dataframe(
+            df, FILTER_SQL
+        )
+        operations["group-by"]["polars"] = lambda: polars_engine.execute_query_on_dataframe(
+            df, GROUP_BY_SQL
+        )
+        operations["describe"]["polars"] = lambda: polars_analyzer.get_descriptive_statistics(df)
+        operations["value_counts"]["polars"] = lambda: polars_analyzer.get_unique_values(
+            df, "category"
+        )
+        # Coste de la conversión Pandas -> Polars (incluido en los tiempos de Polars)
+        operations["conversión"] = {"polars": lambda: PolarsBackend.to_polars(df)}
+    else:
+        print("Polars no está instalado: se omite su backend.")
+
+    # Silenciar los mensajes de QueryEngine durante las mediciones
+    stdout = sys.stdout
+    results = {}
+    for operation, backends in operations.items():
+        for backend, function in backends.items():
+            sys.stdout = open(os.devnull, "w")
+            try:
+                function()  # Calentamiento
+                results[(operation, backend)] = best_time(function, args.repeat)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+
+    print(f"\nFilas: {args.rows:,} · mejor de {args.repeat} ejecuciones\n")
+    print(f"{'Operación':<14}{'pandas':>12}{'duckdb':>12}{'polars':>12}")
+    for operation in operations:
+        row = f"{operation:<14}"
+        for backend in ("pandas", "duckdb", "polars"):
+            elapsed = results.get((operation, backend))
+            row += f"{elapsed * 1000:>10.1f}ms" if elapsed is not None else f"{'-':>12}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark del perfil de datos: cálculo en serie frente a columnas en paralelo.
+
+Perfila un DataFrame ancho (muchas columnas numéricas y categóricas) con
+``DataAnalyzer.profile`` usando 1, 2, 4, ... hilos, comprueba que todos los
+resultados coinciden con el cálculo en serie y muestra el mejor tiempo.
+
+Uso:
+    python benchmarks/profile_benchmark.py --rows 200000 --columns 400 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.data_analyzer import DataAnalyzer
+
+
+def make_wide_dataframe(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """Crea un DataFrame con un 75% de columnas numéricas y un 25% categóricas, con nulos."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for position in range(columns):
+        if position % 4 == 3:
+            data[f"cat_{position}"] = rng.choice([f"v{i}" for i in range(100)], rows)
+        else:
+            values = rng.normal(position, 10, rows)
+            values[rng.random(rows) < 0.02] = np.nan
+            data[f"num_{position}"] = values
+    return pd.DataFrame(data)
+
+
+def best_time(function, repeat: int) -> float:
+    """Retorna el mejor tiempo (s) de ``repeat`` ejecuciones."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    df = make_wide_dataframe(args.rows, args.columns)
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    # Sin caché: cada ejecución recalcula el perfil
+    serial_profile = DataAnalyzer(cache_size=0).profile(df)
+    print(f"\nFilas: {args.rows:,} · Columnas: {args.columns} · mejor de {args.repeat} ejecuciones\n")
+    print(f"{'Hilos':>6}{'Tiempo':>12}{'Aceleración':>14}")
+    serial_time = None
+    for workers in worker_counts:
+        analyzer = DataAnalyzer(cache_size=0, workers=workers)
+        if analyzer.profile(df) != serial_profile:
+            raise AssertionError(f"El perfil con {workers} hilos no coincide con el cálculo en serie.")
+        elapsed = best_time(lambda: analyzer.profile(df), args.repeat)
+        serial_time = serial_time or elapsed
+        print(f"{workers:>6}{elapsed * 1000:>10.1f}ms{serial_time / elapsed:>13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark del arranque: pila de gráficos cargada al iniciar frente a diferida.
+
+En procesos nuevos importa los módulos de ``app/main.py`` y crea los objetos
+de gráficos que construye ``main`` (``PlotCache``, ``PlotGenerator`` y
+``PlotRenderService``). El modo diferido es el actual: Matplotlib y Seaborn
+no se importan hasta el primer gráfico. El modo inmediato los carga al
+iniciar, como antes. Muestra la mediana de cada modo, lo que tarda después
+la carga de la pila de gráficos y comprueba que el arranque diferido no
+importa Matplotlib ni Polars (que solo se carga con ``MUGENC_QUERY_BACKEND``
+o ``MUGENC_ANALYZER_BACKEND`` igual a 'polars').
+
+Uso:
+    python benchmarks/startup_benchmark.py --repeat 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Se ejecuta en un proceso nuevo para medir el arranque sin módulos en memoria
+STARTUP_SCRIPT = """
+import json, os, sys, time
+sys.path[:0] = [{root!r}, os.path.join({root!r}, "app")]
+start = time.perf_counter()
+import main
+from core.plot_cache import PlotCache
+from core.plot_generator import PlotGenerator, load_plotting_libraries
+from core.plot_render_service import PlotRenderService
+
+if {eager!r}:
+    load_plotting_libraries()
+cache = PlotCache()
+generator = PlotGenerator(cache=cache)
+PlotRenderService(cache=cache)
+startup = time.perf_counter() - start
+loaded = any(name in sys.modules for name in ("matplotlib", "seaborn", "polars"))
+
+start = time.perf_counter()
+load_plotting_libraries()
+deferred = time.perf_counter() - start
+print(json.dumps({{"startup": startup, "loaded": loaded, "deferred": deferred}}))
+"""
+
+
+def run_startup(eager: bool) -> dict:
+    """Arranca un proceso nuevo y retorna sus tiempos."""
+    script = STARTUP_SCRIPT.format(root=PROJECT_ROOT, eager=eager)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    # Un arranque previo llena la caché de bytecode y la del sistema de archivos
+    run_startup(eager=True)
+    print(f"\nMediana de {args.repeat} arranques en procesos nuevos\n")
+    print(f"{'Modo':>10}{'Arranque':>12}{'Carga de gráficos':>20}")
+    medians = {}
+    for name, eager in (("inmediato", True), ("diferido", False)):
+        runs = [run_startup(eager) for _ in range(args.repeat)]
+        if not eager and any(run["loaded"] for run in runs):
+            raise AssertionError("El arranque diferido importó Matplotlib, Seaborn o Polars.")
+        medians[name] = statistics.median(run["startup"] for run in runs)
+        first_plot = statistics.median(run["deferred"] for run in runs)
+        print(f"{name:>10}{medians[name] * 1000:>10.1f}ms{first_plot * 1000:>18.1f}ms")
+    print(
+        f"\nArranque {medians['inmediato'] / medians['diferido']:.2f}x más rápido "
+        f"({(medians['inmediato'] - medians['diferido']) * 1000:.0f} ms menos)."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import re
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+# Funciones de agregación soportadas y los acumuladores parciales que necesita cada una
+AGGREGATE_FUNCTIONS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("sum", "count"),
+}
+
+# Columna interna con el número de filas de cada grupo
+ROWS_COLUMN = "__rows"
+
+
+class AggregateView:
+    """
+    Vista agregada materializada (sum, count, min, max, mean por clave) sobre
+    el DataFrame activo, mantenida de forma incremental.
+
+    Por cada grupo guarda acumuladores parciales (filas, suma, conteo de no
+    nulos, mínimo y máximo). Cuando se eliminan filas basta con restar los
+    parciales de las filas eliminadas; el mínimo o el máximo solo se recalculan
+    en los grupos donde la fila eliminada era el extremo. Las filas añadidas
+    suman sus parciales. Si cambian columnas,
+    solo se recalculan los acumuladores de esas columnas.
+    """
+
+    def __init__(self, name: str, keys: list, aggregations: list):
+        """
+        Args:
+            name (str): Nombre de la vista (también su nombre de tabla SQL).
+            keys (list): Columnas de agrupación.
+            aggregations (list): Pares (función, columna); la función es una de
+                                 'sum', 'count', 'min', 'max' o 'mean'.
+
+        Raises:
+            ValueError: Si no hay claves o agregaciones, o una función no es soportada.
+        """
+        if not keys:
+            raise ValueError("AggregateView Error: Indique al menos una columna de agrupación.")
+        if not aggregations:
+            raise ValueError("AggregateView Error: Indique al menos una agregación.")
+        for function, _ in aggregations:
+            if function not in AGGREGATE_FUNCTIONS:
+                raise ValueError(
+                    f"AggregateView Error: Función no soportada: '{function}'. "
+                    f"Opciones: {', '.join(AGGREGATE_FUNCTIONS)}."
+                )
+
+        self.name = name
+        self.keys = list(keys)
+        self.aggregations = [(function, column) for function, column in aggregations]
+        self.version: Optional[int] = None
+        self.error: Optional[str] = None
+        self.last_refresh = {"mode": None, "seconds": 0.0}
+        self._state: Optional[pd.DataFrame] = None
+        self._result: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def parse_aggregations(text: str) -> list:
+        """
+        Convierte un texto como ``"sum(ventas), mean(precio)"`` en pares
+        (función, columna).
+
+        Raises:
+            ValueError: Si alguna parte no tiene la forma ``función(columna)``.
+        """
+        aggregations = []
+        for part in filter(None, (piece.strip() for piece in (text or "").split(","))):
+            match = re.fullmatch(r"(\w+)\s*\(\s*(.+?)\s*\)", part)
+            if match is None:
+                raise ValueError(
+                    f"AggregateView Error: '{part}' no tiene la forma función(columna)."
+                )
+            aggregations.append((match.group(1).lower(), match.group(2)))
+        return aggregations
+
+    def get_value_columns(self) -> list:
+        """Retorna las columnas agregadas (sin repetir)."""
+        return list(dict.fromkeys(column for _, column in self.aggregations))
+
+    def _get_partials(self, column: str) -> list:
+        """Retorna los acumuladores parciales que necesita una columna."""
+        partials = []
+        for function, aggregated_column in self.aggregations:
+            if aggregated_column == column:
+                partials.extend(AGGREGATE_FUNCTIONS[function])
+        return list(dict.fromkeys(partials))
+
+    def _compute_state(self, df: pd.DataFrame, columns=None) -> pd.DataFrame:
+        """
+        Calcula los acumuladores parciales por grupo en un solo group-by.
+
+        Args:
+            df (pd.DataFrame): Filas a agregar.
+            columns (list, optional): Columnas a agregar. Por defecto, todas las de la vista.
+        """
+        named_aggregations = {ROWS_COLUMN: (self.keys[0], "size")}
+        for column in columns if columns is not None else self.get_value_columns():
+            for partial in self._get_partials(column):
+                named_aggregations[f"{column}__{partial}"] = (column, partial)
+        return df.groupby(self.keys, dropna=False, sort=False, observed=True).agg(
+            **named_aggregations
+        )
+
+    def _group_index(self, df: pd.DataFrame) -> pd.Index:
+        """
+        Retorna el índice de grupo de cada fila de ``df``. En las claves de
+        texto los nulos (None o NaN) se unifican en NaN, como en el group-by.
+        """
+        keys = df[self.keys]
+        for key, dtype in keys.dtypes.items():
+            if dtype == object:
+                keys = keys.assign(**{key: keys[key].where(keys[key].notna(), np.nan)})
+        if len(self.keys) == 1:
+            return pd.Index(keys[self.keys[0]])
+        return pd.MultiIndex.from_frame(keys)
+
+    def _build_result(self):
+        """Construye el resultado visible a partir de los acumuladores."""
+        state = self._state
+        result = pd.DataFrame(index=state.index)
+        for function, column in self.aggregations:
+            if function == "mean":
+                counts = state[f"{column}__count"]
+                values = state[f"{column}__sum"] / counts.where(counts > 0)
+            else:
+                values = state[f"{column}__{function}"]
+            result[f"{function}_{column}"] = values
+        self._result = result.reset_index()
+
+    def refresh(self, df: pd.DataFrame, version: Optional[int] = None):
+        """Recalcula la vista completa sobre ``df``."""
+        start_time = time.perf_counter()
+        try:
+            self._state = self._compute_state(df)
+            self._build_result()
+            self.error = None
+        except Exception as e:
+            self.error = str(e)
+            print(f"AggregateView Error: No se pudo recalcular la vista '{self.name}': {e}")
+            return
+        self.version = version
+        self.last_refresh = {"mode": "full", "seconds": time.perf_counter() - start_time}
+
+    def apply_removed_rows(
+        self, df: pd.DataFrame, removed_rows: pd.DataFrame, version: Optional[int] = None
+    ):
+        """
+        Actualiza la vista tras eliminar ``removed_rows`` de ``df``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame activo, ya sin las filas eliminadas.
+            removed_rows (pd.DataFrame): Las filas eliminadas.
+            version (int, optional): Versión de los datos tras el cambio.
+        """
+        if self._state is None or self.error:
+            self.refresh(df, version)
+            return
+        start_time = time.perf_counter()
+        try:
+            applied = self._subtract_rows(df, removed_rows)
+        except Exception as e:
+            print(f"AggregateView Error: Actualización incremental fallida, se recalcula: {e}")
+            applied = False
+        if not applied:
+            self.refresh(df, version)
+            return
+
+        self._build_result()
+        self.version = version
+        self.last_refresh = {
+            "mode": "incremental",
+            "seconds": time.perf_counter() - start_time,
+        }
+
+    def _subtract_rows(self, df: pd.DataFrame, removed_rows: pd.DataFrame) -> bool:
+        """
+        Resta de los acumuladores las filas eliminadas. Retorna False si el
+        estado no corresponde a los datos y hay que recalcular la vista.
+
+        Los grupos se alinean por posición (``get_indexer``), que también
+        encuentra los grupos con claves nulas.
+        """
+        delta = self._compute_state(removed_rows)
+        state = self._state.copy()
+        positions = state.index.get_indexer(delta.index)
+        if (positions < 0).any():
+            # Filas de grupos que la vista no conocía: el estado no corresponde a los datos
+            return False
+
+        # Filas, sumas y conteos son restables
+        additive = [ROWS_COLUMN] + [
+            name for name in delta.columns if name.endswith(("__sum", "__count"))
+        ]
+        for name in additive:
+            column = state.columns.get_loc(name)
+            state.iloc[positions, column] = state.iloc[positions, column].to_numpy() - delta[name].to_numpy()
+
+        # Mínimos y máximos: solo se recalculan los grupos que perdieron su extremo
+        lost_extreme = np.zeros(len(positions), dtype=bool)
+        for name in delta.columns:
+            current = state[name].to_numpy()[positions]
+            if name.endswith("__min"):
+                lost_extreme |= delta[name].to_numpy() <= current
+            elif name.endswith("__max"):
+                lost_extreme |= delta[name].to_numpy() >= current
+        affected = positions[lost_extreme]
+        affected = affected[state[ROWS_COLUMN].to_numpy()[affected] > 0]
+        if len(affected):
+            groups = state.index[affected]
+            subset = df[self._group_index(df).isin(groups)]
+            recomputed = self._compute_state(subset)
+            recomputed_positions = recomputed.index.get_indexer(groups)
+            for name in state.columns:
+                if name.endswith(("__min", "__max")):
+                    column = state.columns.get_loc(name)
+                    state.iloc[affected, column] = recomputed[name].to_numpy()[recomputed_positions]
+
+        self._state = state[state[ROWS_COLUMN] > 0]
+        return True
+
+    def apply_added_rows(
+        self, df: pd.DataFrame, added_rows: pd.DataFrame, version: Optional[int] = None
+    ):
+        """
+        Actualiza la vista tras añadir ``added_rows`` a ``df``: los acumuladores
+        de las filas nuevas se suman a los de cada grupo y los grupos nuevos se
+        añaden al final.
+
+        Args:
+            df (pd.DataFrame): El DataFrame activo, ya con las filas añadidas.
+            added_rows (pd.DataFrame): Las filas añadidas.
+            version (int, optional): Versión de los datos tras el cambio.
+        """
+        if self._state is None or self.error:
+            self.refresh(df, version)
+            return
+        start_time = time.perf_counter()
+        try:
+            self._add_rows(added_rows)
+        except Exception as e:
+            print(f"AggregateView Error: Actualización incremental fallida, se recalcula: {e}")
+            self.refresh(df, version)
+            return
+
+        self._build_result()
+        self.version = version
+        self.last_refresh = {
+            "mode": "incremental",
+            "seconds": time.perf_counter() - start_time,
+        }
+
+    def _add_rows(self, added_rows: pd.DataFrame):
+        """Suma a los acumuladores los de las filas añadidas."""
+        delta = self._compute_state(added_rows)
+        state = self._state.copy()
+        positions = state.index.get_indexer(delta.index)
+        known = positions >= 0
+        existing = positions[known]
+        for name in state.columns:
+            column = state.columns.get_loc(name)
+            current = state[name].to_numpy()[existing]
+            added = delta[name].to_numpy()[known]
+            if name.endswith("__min"):
+                # fmin y fmax ignoran el NaN de los grupos sin valores
+                combined = np.fmin(current, added)
+            elif name.endswith("__max"):
+                combined = np.fmax(current, added)
+            else:
+                combined = current + added
+            state.iloc[existing, column] = combined
+        self._state = pd.concat([state, delta[~known]])
+
+    def apply_changed_columns(
+        self, df: pd.DataFrame, changed_columns: list, version: Optional[int] = None
+    ):
+        """
+        Actualiza la vista tras modificar ``changed_columns`` en ``df``.
+        Si cambia una clave se recalcula todo; si cambia una columna agregada
+        solo se recalculan sus acumuladores; en otro caso no hay nada que hacer.
+        """
+        changed = set(changed_columns)
+        if self._state is None or self.error or changed & set(self.keys):
+            self.refresh(df, version)
+            return
+        value_columns = [column for column in self.get_value_columns() if column in changed]
+        if not value_columns:
+            self.version = version
+            self.last_refresh = {"mode": "unchanged", "seconds": 0.0}
+            return
+
+        start_time = time.perf_counter()
+        try:
+            recomputed = self._compute_state(df, value_columns)
+        except Exception as e:
+            self.error = str(e)
+            print(f"AggregateView Error: No se pudo actualizar la vista '{self.name}': {e}")
+            return
+        for name in recomputed.columns:
+            if name != ROWS_COLUMN:
+                self._state[name] = recomputed[name].reindex(self._state.index)
+        self._build_result()
+        self.version = version
+        self.last_refresh = {
+            "mode": "incremental",
+            "seconds": time.perf_counter() - start_time,
+        }
+
+    def get_result(self) -> pd.DataFrame:
+        """Retorna el resultado de la vista (claves + una columna por agregación)."""
+        if self._result is None:
+            return pd.DataFrame(
+                columns=self.keys
+                + [f"{function}_{column}" for function, column in self.aggregations]
+            )
+        return self._result
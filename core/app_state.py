@@ -1,7 +1,13 @@
+import re
 import pandas as pd
 import flet as ft # Importar flet para ThemeMode
 from typing import Optional
 
+# Nombres de tabla SQL reservados para los DataFrames del estado
+RESERVED_TABLE_NAMES = ("my_table", "active", "original")
+# Número de archivos de la sesión que se conservan para las consultas SQL
+MAX_LOADED_DATASETS = 8
+
 
 class AppState:
     """
@@ -9,11 +15,27 @@ class AppState:
     especialmente los DataFrames cargados y manipulados.
     """
     
-    def __init__(self):
+    def __init__(self, max_loaded_datasets: int = MAX_LOADED_DATASETS):
+        """
+        Args:
+            max_loaded_datasets (int): Número máximo de archivos conservados para
+                las consultas SQL; al superarlo se descarta el cargado hace más tiempo.
+        """
+        if max_loaded_datasets < 1:
+            raise ValueError("max_loaded_datasets debe ser al menos 1.")
+        self.max_loaded_datasets = max_loaded_datasets
         self._original_dataframe: Optional[pd.DataFrame] = None
         self._active_dataframe: Optional[pd.DataFrame] = None  # DataFrame que será manipulado
         self.loaded_file_name: Optional[str] = None
         self.current_theme = ft.ThemeMode.DARK
+        # Todos los archivos cargados en la sesión: nombre de tabla SQL -> DataFrame
+        self._loaded_datasets: dict[str, pd.DataFrame] = {}
+        # Nombre de archivo -> nombre de tabla SQL (estable durante la sesión)
+        self._dataset_table_names: dict[str, str] = {}
+        # Versión de los datos: aumenta con cada cambio del DataFrame original o activo
+        self._dataset_version = 0
+        # Funciones notificadas con cada cambio del DataFrame activo
+        self._change_listeners: list = []
 
     def load_dataframe(self, dataframe: pd.DataFrame, file_name: Optional[str] = None):
         """
@@ -22,6 +44,12 @@ class AppState:
         """
         self._original_dataframe = dataframe
         self.loaded_file_name = file_name
+        # Conserva el archivo para poder cruzarlo con otros en las consultas SQL
+        # Un archivo recargado reemplaza su versión anterior y pasa a ser el más reciente
+        table_name = self._get_table_name(file_name or "memoria")
+        self._loaded_datasets.pop(table_name, None)
+        self._loaded_datasets[table_name] = dataframe
+        self._evict_loaded_datasets()
         # Crea una copia al cargar el original
         self.create_dataframe_copy() 
         print(
@@ -33,22 +61,145 @@ class AppState:
         Crea una copia del DataFrame original y la establece como el DataFrame activo.
         Si no hay un DataFrame original, el activo se establece en None.
         """
+        self._dataset_version += 1
         if self._original_dataframe is not None:
             self._active_dataframe = self._original_dataframe.copy()
             print("AppState: Copia del DataFrame original creada y establecida como activa.")
         else:
             self._active_dataframe = None
             print("AppState: No hay DataFrame original para copiar.")
+        self._notify_change()
 
-    def load_dataframe_copy(self, df_copy: pd.DataFrame):
+    def load_dataframe_copy(
+        self,
+        df_copy: pd.DataFrame,
+        removed_rows: Optional[pd.DataFrame] = None,
+        changed_columns: Optional[list] = None,
+        added_rows: Optional[pd.DataFrame] = None,
+    ):
         """
         Actualiza el DataFrame activo (la copia) con un nuevo DataFrame.
         Esto se usa después de operaciones de limpieza o manipulación.
+
+        Args:
+            df_copy (pd.DataFrame): El DataFrame activo tras el cambio.
+            removed_rows (pd.DataFrame, optional): Filas eliminadas por la operación.
+            changed_columns (list, optional): Columnas modificadas o renombradas
+                                              (con su nombre anterior y el nuevo).
+            added_rows (pd.DataFrame, optional): Filas añadidas por la operación.
+
+        Si no se indica ``removed_rows``, ``changed_columns`` ni ``added_rows`` el
+        cambio se notifica como un reemplazo completo de los datos.
         """
         self._active_dataframe = df_copy
+        self._dataset_version += 1
         print("AppState: DataFrame activo actualizado con los cambios.")
+        self._notify_change(removed_rows, changed_columns, added_rows)
+
+    def add_change_listener(self, listener):
+        """
+        Registra una función que se llama con un diccionario cada vez que
+        cambia el DataFrame activo. El diccionario contiene:
+        ``version``, ``kind`` ('replaced' o 'updated'), ``dataframe``,
+        ``removed_rows`` y ``added_rows`` (DataFrame o None) y
+        ``changed_columns`` (lista o None).
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        """Elimina una función registrada con ``add_change_listener``."""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(
+        self,
+        removed_rows: Optional[pd.DataFrame] = None,
+        changed_columns: Optional[list] = None,
+        added_rows: Optional[pd.DataFrame] = None,
+    ):
+        """Notifica el cambio del DataFrame activo a las funciones registradas."""
+        change = {
+            "version": self._dataset_version,
+            "kind": (
+                "updated"
+                if removed_rows is not None
+                or changed_columns is not None
+                or added_rows is not None
+                else "replaced"
+            ),
+            "dataframe": self._active_dataframe,
+            "removed_rows": removed_rows,
+            "added_rows": added_rows,
+            "changed_columns": list(changed_columns) if changed_columns is not None else None,
+        }
+        for listener in list(self._change_listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"AppState Error: Error al notificar el cambio de datos: {e}")
+
+    def _get_table_name(self, file_name: str) -> str:
+        """
+        Retorna un nombre de tabla SQL estable para un archivo cargado.
+        El mismo archivo recibe siempre el mismo nombre; los nombres reservados
+        o repetidos se desambiguan con un sufijo.
+        """
+        if file_name in self._dataset_table_names:
+            return self._dataset_table_names[file_name]
+
+        base_name = file_name.rsplit(".", 1)[0] if "." in file_name else file_name
+        table_name = re.sub(r"\W+", "_", base_name).strip("_").lower() or "dataset"
+        if table_name[0].isdigit():
+            table_name = f"t_{table_name}"
+        if table_name in RESERVED_TABLE_NAMES:
+            table_name = f"{table_name}_file"
+
+        unique_name, suffix = table_name, 2
+        while unique_name in self._dataset_table_names.values():
+            unique_name = f"{table_name}_{suffix}"
+            suffix += 1
 
-    from typing import Optional
+        self._dataset_table_names[file_name] = unique_name
+        return unique_name
+
+    def _evict_loaded_datasets(self):
+        """Descarta los archivos más antiguos que exceden ``max_loaded_datasets``."""
+        while len(self._loaded_datasets) > self.max_loaded_datasets:
+            oldest_name = next(iter(self._loaded_datasets))
+            del self._loaded_datasets[oldest_name]
+            print(f"AppState: Dataset '{oldest_name}' descartado de la sesión.")
+
+    def unload_dataset(self, table_name: str) -> bool:
+        """
+        Descarta un archivo cargado en la sesión para liberar su memoria.
+        El DataFrame original y el activo no se ven afectados.
+
+        Args:
+            table_name (str): Nombre de tabla SQL del archivo.
+
+        Returns:
+            bool: True si el archivo estaba cargado.
+        """
+        return self._loaded_datasets.pop(table_name, None) is not None
+
+    def get_loaded_datasets(self) -> dict[str, pd.DataFrame]:
+        """Retorna los archivos cargados en la sesión por nombre de tabla SQL."""
+        return dict(self._loaded_datasets)
+
+    def get_query_tables(self) -> dict[str, pd.DataFrame]:
+        """
+        Retorna todas las tablas consultables por SQL:
+        'my_table' y 'active' (DataFrame activo), 'original' y un nombre
+        derivado del archivo por cada dataset cargado en la sesión.
+        """
+        tables = dict(self._loaded_datasets)
+        if self._original_dataframe is not None:
+            tables["original"] = self._original_dataframe
+        if self._active_dataframe is not None:
+            tables["active"] = self._active_dataframe
+            tables["my_table"] = self._active_dataframe
+        return tables
 
     def get_original_dataframe(self) -> Optional[pd.DataFrame]:
         """Retorna el DataFrame original cargado (solo lectura)."""
@@ -58,6 +209,14 @@ class AppState:
         """Retorna el DataFrame activo (la copia que se manipula)."""
         return self._active_dataframe
 
+    def get_dataset_version(self) -> int:
+        """
+        Retorna la versión actual de los datos. Cambia cada vez que se carga
+        un archivo o se modifica el DataFrame activo, por lo que sirve como
+        clave de caché e identificador en el historial de consultas.
+        """
+        return self._dataset_version
+
     def get_loaded_file_name(self) -> Optional[str]:
         """Retorna el nombre del archivo cargado."""
         return self.loaded_file_name
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+# Métodos de correlación soportados
+CORRELATION_METHODS = ("pearson", "spearman")
+
+
+class CorrelationEngine:
+    """
+    Matrices de correlación y covarianza con nulos por pares (pairwise-complete),
+    calculadas con productos matriciales de NumPy en lugar de bucles por pares.
+
+    Con la máscara de valores válidos M y los datos con nulos a cero X, todas
+    las sumas que necesita cada par de columnas salen de cuatro productos
+    matriciales (M'M, X'M, X'X y (X²)'M), que además se pueden acumular por
+    bloques de filas. Spearman es Pearson sobre los rangos de cada columna.
+    """
+
+    def __init__(self, chunk_size: int = 1_000_000):
+        """
+        Args:
+            chunk_size (int): Filas por bloque al acumular los productos.
+        """
+        if chunk_size <= 0:
+            raise ValueError("CorrelationEngine Error: chunk_size debe ser mayor que cero.")
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def get_numeric_columns(df: pd.DataFrame) -> list:
+        """Retorna las columnas numéricas (sin booleanas) de ``df``."""
+        return [
+            column
+            for column, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        ]
+
+    def _prepare(self, df: pd.DataFrame, method: str, columns: Optional[list]) -> tuple:
+        """
+        Valida los argumentos y retorna las columnas y el DataFrame (valores
+        o rangos) sobre el que se calcula.
+        """
+        if method not in CORRELATION_METHODS:
+            raise ValueError(
+                f"CorrelationEngine Error: Método no soportado: '{method}'. "
+                f"Opciones: {', '.join(CORRELATION_METHODS)}."
+            )
+        numeric_columns = self.get_numeric_columns(df)
+        if columns is None:
+            columns = numeric_columns
+        else:
+            invalid = [column for column in columns if column not in numeric_columns]
+            if invalid:
+                raise ValueError(
+                    f"CorrelationEngine Error: Columnas no numéricas o inexistentes: {invalid}"
+                )
+        data = df[columns]
+        if method == "spearman":
+            # Rango medio por columna; los nulos siguen siendo nulos
+            data = data.rank(method="average")
+        return list(columns), data
+
+    def _accumulate(self, data: pd.DataFrame) -> dict:
+        """
+        Acumula por bloques de filas las sumas por pares: conteos (N), sumas
+        de cada columna sobre las filas válidas del par (Sx), productos cruzados
+        (Sxy) y cuadrados (Sxx). Solo un bloque se convierte a float64 a la vez.
+        """
+        num_columns = data.shape[1]
+        # Desplazar por la media de cada columna no cambia covarianzas ni
+        # correlaciones y evita la cancelación numérica en Sxy - Sx*Sy/N
+        shift = np.nan_to_num(data.mean().to_numpy(dtype="float64", na_value=np.nan))
+
+        sums = {
+            name: np.zeros((num_columns, num_columns))
+            for name in ("count", "sum_x", "sum_xy", "sum_xx")
+        }
+        for start in range(0, len(data), self.chunk_size):
+            block = data.iloc[start : start + self.chunk_size].to_numpy(
+                dtype="float64", na_value=np.nan
+            ) - shift
+            valid = ~np.isnan(block)
+            mask = valid.astype("float64")
+            block = np.where(valid, block, 0.0)
+            sums["count"] += mask.T @ mask
+            sums["sum_x"] += block.T @ mask
+            sums["sum_xy"] += block.T @ block
+            sums["sum_xx"] += np.square(block).T @ mask
+        return sums
+
+    def covariance(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[list] = None,
+        min_periods: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Matriz de covarianza muestral (ddof=1) con nulos por pares, como
+        ``DataFrame.cov()``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            columns (list, optional): Columnas numéricas a incluir. Por defecto, todas.
+            min_periods (int): Mínimo de filas válidas por par; si no se alcanza, NaN.
+
+        Returns:
+            pd.DataFrame: Matriz cuadrada indexada por las columnas.
+
+        Raises:
+            ValueError: Si alguna columna no es numérica.
+        """
+        columns, data = self._prepare(df, "pearson", columns)
+        sums = self._accumulate(data)
+        count = sums["count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross = sums["sum_xy"] - sums["sum_x"] * sums["sum_x"].T / count
+            covariance = cross / (count - 1)
+        covariance[(count < max(min_periods, 2))] = np.nan
+        return pd.DataFrame(covariance, index=columns, columns=columns)
+
+    def correlation(
+        self,
+        df: pd.DataFrame,
+        method: str = "pearson",
+        columns: Optional[list] = None,
+        min_periods: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Matriz de correlación con nulos por pares, como ``DataFrame.corr()``.
+
+        En Spearman los rangos se calculan una vez por columna sobre sus valores
+        no nulos; si hay nulos en posiciones distintas, el resultado puede diferir
+        ligeramente de ``DataFrame.corr(method="spearman")``, que vuelve a
+        calcular los rangos por cada par.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            method (str): 'pearson' o 'spearman'.
+            columns (list, optional): Columnas numéricas a incluir. Por defecto, todas.
+            min_periods (int): Mínimo de filas válidas por par; si no se alcanza, NaN.
+
+        Returns:
+            pd.DataFrame: Matriz cuadrada indexada por las columnas.
+
+        Raises:
+            ValueError: Si el método no es válido o alguna columna no es numérica.
+        """
+        columns, data = self._prepare(df, method, columns)
+        sums = self._accumulate(data)
+        count = sums["count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sum_x, sum_y = sums["sum_x"], sums["sum_x"].T
+            cross = sums["sum_xy"] - sum_x * sum_y / count
+            # Varianzas de cada columna restringidas a las filas válidas del par
+            variance_x = sums["sum_xx"] - sum_x * sum_x / count
+            variance_y = sums["sum_xx"].T - sum_y * sum_y / count
+            correlation = cross / np.sqrt(np.maximum(variance_x * variance_y, 0.0))
+        correlation = np.clip(correlation, -1.0, 1.0)
+        # La diagonal es exactamente 1 cuando la columna no es constante
+        diagonal = np.diag_indices_from(correlation)
+        correlation[diagonal] = np.where(np.isnan(correlation[diagonal]), np.nan, 1.0)
+        correlation[count < max(min_periods, 1)] = np.nan
+        return pd.DataFrame(correlation, index=columns, columns=columns)
@@ -1,11 +1,124 @@
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from core.correlation_engine import CorrelationEngine
+from core.duplicate_detector import DuplicateDetector
+from core.group_aggregator import GroupAggregator
+from core.memory_optimizer import MemoryOptimizer
+from core.outlier_detector import OutlierDetector
+from core.polars_backend import PolarsBackend
+from core.result_cache import ResultCache, memoized
+from core.running_statistics import RunningStatistics
+from core.sketches import HyperLogLog, KLLSketch, SpaceSaving
+
+
+# Backends de cálculo disponibles para los análisis
+ANALYZER_BACKENDS = ("pandas", "polars")
+
+# Cuantiles calculados por profile(), con las etiquetas de describe()
+PROFILE_QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
 
 
 class DataAnalyzer:
     """
     Clase encargada de realizar análisis básicos sobre un DataFrame de Pandas.
+
+    Con ``backend="polars"`` los cálculos se ejecutan como consultas perezosas
+    de Polars (multihilo); los resultados mantienen el mismo formato de Pandas.
+
+    Para datos muy grandes ofrece un modo aproximado basado en sketches
+    (ver ``core/sketches.py``), que se activa solo a partir de
+    ``approximate_rows`` filas.
+
+    Registrado con ``AppState.add_change_listener``, mantiene además
+    estadísticas incrementales del DataFrame activo (ver ``get_running_statistics``).
+
+    Los resultados de los análisis se guardan en una caché LRU por DataFrame,
+    versión de los datos y argumentos, que se invalida con cada cambio.
     """
 
+    def __init__(
+        self,
+        backend: str = "pandas",
+        approximate_rows: Optional[int] = None,
+        chunk_size: int = 1_000_000,
+        app_state=None,
+        cache_size: int = 64,
+        workers: int = 1,
+        duplicate_duckdb_rows: Optional[int] = None,
+    ):
+        """
+        Args:
+            backend (str): 'pandas' (por defecto) o 'polars'.
+            approximate_rows (int, optional): A partir de este número de filas,
+                                              ``profile`` y ``get_unique_values``
+                                              usan el modo aproximado. None lo desactiva.
+            chunk_size (int): Filas por bloque en la pasada del modo aproximado y
+                              en el cálculo de correlaciones.
+            app_state (AppState, optional): Estado de la aplicación; su versión de
+                                            los datos forma parte de la clave de caché.
+            cache_size (int): Número máximo de resultados en caché (0 la desactiva).
+            workers (int): Hilos para perfilar columnas en paralelo; 1 (por defecto)
+                           usa el cálculo en serie.
+            duplicate_duckdb_rows (int, optional): A partir de este número de filas
+                                                   el conteo y los grupos de duplicados
+                                                   se calculan con DuckDB. None lo desactiva.
+
+        Raises:
+            ValueError: Si el backend no es válido.
+            ImportError: Si se pide el backend 'polars' y Polars no está instalado.
+        """
+        if backend not in ANALYZER_BACKENDS:
+            raise ValueError(
+                f"DataAnalyzer Error: Backend no soportado: '{backend}'. "
+                f"Opciones: {', '.join(ANALYZER_BACKENDS)}."
+            )
+        self.backend = backend
+        self._polars = PolarsBackend() if backend == "polars" else None
+        self.approximate_rows = approximate_rows
+        self.chunk_size = chunk_size
+        self._correlation_engine = CorrelationEngine(chunk_size)
+        self._group_aggregator = GroupAggregator()
+        self._memory_optimizer = MemoryOptimizer()
+        self._outlier_detector = OutlierDetector()
+        self._duplicate_detector = DuplicateDetector(
+            version_provider=app_state.get_dataset_version if app_state is not None else None,
+            max_hash_rows=duplicate_duckdb_rows,
+        )
+        self.workers = max(1, int(workers))
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="data-analyzer")
+            if self.workers > 1
+            else None
+        )
+        # Estadísticas incrementales del DataFrame activo y el DataFrame al que corresponden
+        self._running_statistics = RunningStatistics()
+        self._tracked_dataframe: Optional[pd.DataFrame] = None
+        self._result_cache = (
+            ResultCache(
+                cache_size,
+                version_provider=app_state.get_dataset_version if app_state is not None else None,
+            )
+            if cache_size > 0
+            else None
+        )
+
+    def _use_approximate(self, df: pd.DataFrame, approximate: Optional[bool]) -> bool:
+        """Decide si usar el modo aproximado (explícito o por tamaño)."""
+        if approximate is not None:
+            return approximate
+        return self.approximate_rows is not None and len(df) >= self.approximate_rows
+
+    def _iter_chunks(self, data):
+        """Recorre un DataFrame por bloques, o un iterable de DataFrames tal cual."""
+        if isinstance(data, pd.DataFrame):
+            for start in range(0, len(data), self.chunk_size):
+                yield data.iloc[start : start + self.chunk_size]
+        else:
+            yield from data
+
+    @memoized
     def get_dataframe_info(self, df: pd.DataFrame):
         """
         Retorna información básica sobre el DataFrame.
@@ -26,6 +139,9 @@ class DataAnalyzer:
                 "missing_values": {},
             }
 
+        if self._polars is not None:
+            return self._polars.get_dataframe_info(df)
+
         info = {
             "num_rows": len(df),
             "num_cols": len(df.columns),
@@ -39,6 +155,7 @@ class DataAnalyzer:
         }
         return info
 
+    @memoized
     def get_descriptive_statistics(self, df: pd.DataFrame):
         """
         Retorna estadísticas descriptivas para las columnas numéricas del DataFrame.
@@ -61,9 +178,18 @@ class DataAnalyzer:
             )
             return pd.DataFrame()
 
+        if self._polars is not None:
+            return self._polars.get_descriptive_statistics(df, numeric_df.columns.tolist())
         return numeric_df.describe()
 
-    def get_unique_values(self, df: pd.DataFrame, column_name: str, top_n: int = 10):
+    @memoized
+    def get_unique_values(
+        self,
+        df: pd.DataFrame,
+        column_name: str,
+        top_n: int = 10,
+        approximate: Optional[bool] = None,
+    ):
         """
         Retorna los valores únicos y su frecuencia para una columna específica.
 
@@ -71,6 +197,8 @@ class DataAnalyzer:
             df (pd.DataFrame): El DataFrame a analizar.
             column_name (str): El nombre de la columna.
             top_n (int): El número de valores únicos más frecuentes a retornar.
+            approximate (bool, optional): Usar Space-Saving en una pasada por bloques.
+                                          Por defecto, según ``approximate_rows``.
 
         Returns:
             pd.Series: Una Serie de Pandas con los valores únicos y sus conteos.
@@ -82,6 +210,598 @@ class DataAnalyzer:
             )
             return pd.Series()
 
+        if self._use_approximate(df, approximate):
+            top_values = SpaceSaving(capacity=max(100, 10 * top_n))
+            for chunk in self._iter_chunks(df[[column_name]]):
+                top_values.update(chunk[column_name])
+            return top_values.top(top_n).rename("count").rename_axis(column_name)
+
+        if self._polars is not None:
+            return self._polars.get_unique_values(df, column_name, top_n)
+
         # Contar la frecuencia de cada valor único
         value_counts = df[column_name].value_counts()
         return value_counts.head(top_n)
+
+    @memoized
+    def get_memory_report(self, df: pd.DataFrame):
+        """
+        Retorna la memoria real de cada columna y una representación más
+        barata recomendada (ver ``MemoryOptimizer.memory_report``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+
+        Returns:
+            dict: ``total_bytes``, ``optimized_bytes``, ``index_bytes`` y ``columns``.
+        """
+        if df is None:
+            return {"total_bytes": 0, "optimized_bytes": 0, "index_bytes": 0, "columns": {}}
+        return self._memory_optimizer.memory_report(df)
+
+    def optimize_memory(self, df: pd.DataFrame):
+        """
+        Aplica a una copia de ``df`` las representaciones recomendadas por
+        ``get_memory_report``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a optimizar.
+
+        Returns:
+            tuple: (DataFrame optimizado, columnas convertidas, bytes antes, bytes después).
+        """
+        return self._memory_optimizer.optimize(df, self.get_memory_report(df))
+
+    @memoized
+    def count_duplicates(self, df: pd.DataFrame, subset: Optional[list] = None) -> int:
+        """
+        Cuenta las filas duplicadas a partir de los hashes por fila
+        (ver ``DuplicateDetector.count_duplicates``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+
+        Returns:
+            int: Número de filas que repiten una fila anterior.
+
+        Raises:
+            ValueError: Si alguna columna no existe.
+        """
+        if df is None or df.empty:
+            return 0
+        return self._duplicate_detector.count_duplicates(df, subset)
+
+    @memoized
+    def get_duplicate_groups(
+        self, df: pd.DataFrame, subset: Optional[list] = None, top_n: Optional[int] = None
+    ):
+        """
+        Retorna los grupos de filas repetidas, de más a menos repetidos
+        (ver ``DuplicateDetector.duplicate_groups``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+            top_n (int, optional): Número máximo de grupos. Por defecto, todos.
+
+        Returns:
+            pd.DataFrame: Los valores de cada grupo y su número de apariciones (``count``).
+
+        Raises:
+            ValueError: Si alguna columna no existe.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return self._duplicate_detector.duplicate_groups(df, subset, top_n)
+
+    def get_duplicate_mask(self, df: pd.DataFrame, subset: Optional[list] = None, keep="first"):
+        """
+        Máscara de filas duplicadas, como ``df.duplicated(subset, keep)``, a
+        partir de los hashes por fila ya calculados para esta versión de los datos.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+            keep: 'first', 'last' o False, como en Pandas.
+
+        Returns:
+            np.ndarray: Array booleano con una posición por fila.
+
+        Raises:
+            ValueError: Si alguna columna no existe.
+        """
+        if df is None or df.empty:
+            return np.zeros(0 if df is None else len(df), dtype=bool)
+        return self._duplicate_detector.duplicated(df, subset, keep)
+
+    @memoized
+    def detect_outliers(
+        self,
+        df: pd.DataFrame,
+        method: str = "iqr",
+        columns: Optional[list] = None,
+        factor: Optional[float] = None,
+    ):
+        """
+        Marca los valores atípicos de todas las columnas numéricas en una pasada
+        vectorizada (ver ``OutlierDetector.detect``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            method (str): 'iqr', 'zscore' o 'mad'.
+            columns (list, optional): Columnas numéricas a analizar. Por defecto, todas.
+            factor (float, optional): Multiplicador de los umbrales.
+
+        Returns:
+            dict: ``method``, ``factor``, ``num_rows``, ``flagged_rows`` y, por
+                  columna, umbrales, conteo, porcentaje y filas marcadas.
+
+        Raises:
+            ValueError: Si el método no es válido o alguna columna no es numérica.
+        """
+        if df is None:
+            return {"method": method, "factor": factor, "num_rows": 0, "flagged_rows": 0, "columns": {}}
+        return self._outlier_detector.detect(df, method, columns, factor)
+
+    def clean_outliers(
+        self,
+        df: pd.DataFrame,
+        action: str = "cap",
+        method: str = "iqr",
+        columns: Optional[list] = None,
+        factor: Optional[float] = None,
+    ):
+        """
+        Recorta a los umbrales ('cap') o elimina ('drop') los valores atípicos
+        de ``detect_outliers`` en una copia de ``df``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a limpiar.
+            action (str): 'cap' o 'drop'.
+            method (str): 'iqr', 'zscore' o 'mad'.
+            columns (list, optional): Columnas numéricas a limpiar. Por defecto, todas.
+            factor (float, optional): Multiplicador de los umbrales.
+
+        Returns:
+            tuple: (DataFrame limpio, columnas modificadas, filas eliminadas o None).
+
+        Raises:
+            ValueError: Si la acción, el método o las columnas no son válidos.
+        """
+        report = self.detect_outliers(df, method, columns, factor)
+        return self._outlier_detector.clean(df, report, action)
+
+    @memoized
+    def group_aggregate(
+        self, df: pd.DataFrame, keys: list, aggregations: list, engine: str = "duckdb"
+    ):
+        """
+        Agrupa por una o varias columnas y calcula varias agregaciones en una
+        sola pasada (ver ``GroupAggregator.aggregate``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            keys (list): Columnas de agrupación.
+            aggregations (list): Pares (función, columna), p. ej.
+                                 ``[("sum", "ventas"), ("count", "*")]``.
+            engine (str): 'duckdb' (por defecto) o 'pandas'.
+
+        Returns:
+            pd.DataFrame: Una fila por grupo con las claves y las agregaciones.
+
+        Raises:
+            ValueError: Si las claves, las funciones o el motor no son válidos.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return self._group_aggregator.aggregate(df, keys, aggregations, engine)
+
+    @memoized
+    def get_correlation_matrix(
+        self,
+        df: pd.DataFrame,
+        method: str = "pearson",
+        columns: Optional[list] = None,
+        min_periods: int = 1,
+    ):
+        """
+        Retorna la matriz de correlación de las columnas numéricas, con nulos
+        por pares (ver ``CorrelationEngine.correlation``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            method (str): 'pearson' o 'spearman'.
+            columns (list, optional): Columnas numéricas a incluir. Por defecto, todas.
+            min_periods (int): Mínimo de filas válidas por par.
+
+        Returns:
+            pd.DataFrame: La matriz de correlación, o un DataFrame vacío si no
+                          hay columnas numéricas.
+
+        Raises:
+            ValueError: Si el método no es válido o alguna columna no es numérica.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        if columns is None and not self._correlation_engine.get_numeric_columns(df):
+            print("DataAnalyzer: No hay columnas numéricas para calcular correlaciones.")
+            return pd.DataFrame()
+        return self._correlation_engine.correlation(df, method, columns, min_periods)
+
+    @memoized
+    def get_covariance_matrix(
+        self, df: pd.DataFrame, columns: Optional[list] = None, min_periods: int = 1
+    ):
+        """
+        Retorna la matriz de covarianza muestral de las columnas numéricas,
+        con nulos por pares (ver ``CorrelationEngine.covariance``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            columns (list, optional): Columnas numéricas a incluir. Por defecto, todas.
+            min_periods (int): Mínimo de filas válidas por par.
+
+        Returns:
+            pd.DataFrame: La matriz de covarianza, o un DataFrame vacío si no
+                          hay columnas numéricas.
+
+        Raises:
+            ValueError: Si alguna columna no es numérica.
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        if columns is None and not self._correlation_engine.get_numeric_columns(df):
+            print("DataAnalyzer: No hay columnas numéricas para calcular covarianzas.")
+            return pd.DataFrame()
+        return self._correlation_engine.covariance(df, columns, min_periods)
+
+    @memoized
+    def profile(self, df: pd.DataFrame, approximate: Optional[bool] = None):
+        """
+        Calcula en una sola pasada el perfil completo del DataFrame: por columna,
+        conteo de no nulos, nulos, valores distintos y, para las numéricas,
+        mínimo, máximo, media, desviación estándar y cuartiles.
+
+        Las columnas numéricas se recorren una a una, sin copiarlas juntas a
+        una matriz: en las enteras los cuartiles se obtienen por selección
+        parcial (``np.partition``) y los distintos se cuentan con el tipo
+        original; en las de coma flotante se ordena una copia de la columna,
+        de la que salen los cuartiles y los distintos. Con ``workers > 1`` los
+        bloques de columnas se reparten entre hilos. Los botones de información
+        (forma, tipos, nulos, info) leen de este resultado.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            approximate (bool, optional): Usar ``profile_approximate``. Por defecto,
+                                          según ``approximate_rows``.
+
+        Returns:
+            dict: ``num_rows``, ``num_cols``, ``memory_bytes``, ``approximate`` y ``columns``: un
+                  diccionario por columna con ``dtype``, ``non_null``, ``nulls``,
+                  ``null_percent``, ``distinct``, ``is_numeric`` y, si es numérica,
+                  ``mean``, ``std``, ``min``, ``25%``, ``50%``, ``75%`` y ``max``.
+        """
+        if df is None:
+            return {
+                "num_rows": 0,
+                "num_cols": 0,
+                "memory_bytes": 0,
+                "approximate": False,
+                "columns": {},
+            }
+        if self._use_approximate(df, approximate):
+            return self.profile_approximate(df)
+
+        num_rows = len(df)
+        columns = {}
+        numeric_positions, other_positions = [], []
+        for position, (column, dtype) in enumerate(df.dtypes.items()):
+            is_numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            columns[column] = {"dtype": str(dtype), "is_numeric": is_numeric}
+            (numeric_positions if is_numeric else other_positions).append(position)
+
+        if self._executor is not None and len(df.columns) > 1:
+            # Modo paralelo: los hilos comparten el DataFrame sin copiarlo ni
+            # serializarlo; NumPy y Pandas liberan el GIL al ordenar y contar.
+            # Los resultados se combinan en el orden de envío, no de llegada.
+            block_size = max(1, -(-len(numeric_positions) // (2 * self.workers)))
+            futures = [
+                self._executor.submit(
+                    self._profile_numeric_columns, df, numeric_positions[start : start + block_size]
+                )
+                for start in range(0, len(numeric_positions), block_size)
+            ] + [
+                self._executor.submit(self._profile_other_columns, df, [position])
+                for position in other_positions
+            ]
+            partials = [future.result() for future in futures]
+        else:
+            partials = [
+                self._profile_numeric_columns(df, numeric_positions),
+                self._profile_other_columns(df, other_positions),
+            ]
+        for partial in partials:
+            for position, column_stats in partial.items():
+                columns[df.columns[position]].update(column_stats)
+
+        for column_profile in columns.values():
+            column_profile["non_null"] = num_rows - column_profile["nulls"]
+            column_profile["null_percent"] = (
+                round(column_profile["nulls"] / num_rows * 100, 2) if num_rows else 0.0
+            )
+
+        return {
+            "num_rows": num_rows,
+            "num_cols": len(df.columns),
+            "memory_bytes": int(df.memory_usage(index=True, deep=False).sum()),
+            "approximate": False,
+            "columns": columns,
+        }
+
+    @staticmethod
+    def _profile_numeric_columns(df: pd.DataFrame, positions: list) -> dict:
+        """
+        Perfil de un bloque de columnas numéricas (posición -> estadísticas).
+
+        Las columnas se procesan de una en una, sin copiar el bloque entero.
+        En las enteras, los distintos se cuentan con el tipo original (en
+        float64 se confunden los enteros mayores que 2**53) y los extremos y
+        cuartiles salen de ``np.partition`` sobre su conversión a float64, que
+        ya es una copia. En las de coma flotante los distintos necesitan los
+        valores ordenados, así que se ordena una copia de la columna y de ella
+        salen también los extremos y cuartiles.
+        """
+        results = {}
+        for position in positions:
+            series = df.iloc[:, position]
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            missing = np.isnan(values)
+            nulls = int(missing.sum())
+            valid = values[~missing] if nulls else values
+            count = len(valid)
+            column_stats = {"nulls": nulls}
+            results[position] = column_stats
+            if not count:
+                column_stats["distinct"] = 0
+                for name in ("mean", "std", "min", *PROFILE_QUANTILES, "max"):
+                    column_stats[name] = None
+                continue
+
+            mean = float(valid.sum() / count)
+            column_stats["mean"] = mean
+            column_stats["std"] = (
+                float(np.sqrt(np.square(valid - mean).sum() / (count - 1)))
+                if count > 1
+                else None
+            )
+
+            # Interpolación lineal, como pandas.describe()
+            ranks = {label: quantile * (count - 1) for label, quantile in PROFILE_QUANTILES.items()}
+            if pd.api.types.is_float_dtype(series.dtype):
+                ordered = np.sort(valid)
+                column_stats["distinct"] = int(np.count_nonzero(ordered[1:] != ordered[:-1])) + 1
+            else:
+                column_stats["distinct"] = int(series.nunique(dropna=True))
+                # Posiciones que deben quedar en su sitio: extremos y vecinos de cada cuartil
+                kth = {0, count - 1}
+                for rank in ranks.values():
+                    kth.update((int(rank), min(int(rank) + 1, count - 1)))
+                ordered = valid
+                ordered.partition(sorted(kth))
+            column_stats["min"] = float(ordered[0])
+            for label, rank in ranks.items():
+                lower = int(rank)
+                upper = min(lower + 1, count - 1)
+                column_stats[label] = float(
+                    ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+                )
+            column_stats["max"] = float(ordered[-1])
+        return results
+
+    @staticmethod
+    def _profile_other_columns(df: pd.DataFrame, positions: list) -> dict:
+        """Perfil de columnas no numéricas: nulos y distintos (posición -> estadísticas)."""
+        results = {}
+        for position in positions:
+            series = df.iloc[:, position]
+            results[position] = {
+                "nulls": int(series.isna().sum()),
+                "distinct": int(series.nunique(dropna=True)),
+            }
+        return results
+
+    @memoized
+    def profile_approximate(
+        self,
+        data,
+        top_k: int = 10,
+        hll_precision: int = 14,
+        kll_k: int = 200,
+    ):
+        """
+        Perfil aproximado en una sola pasada por bloques, con memoria acotada.
+
+        Los conteos, nulos, mínimo, máximo, media y desviación son exactos
+        (acumuladores por bloque; la media y la suma de cuadrados de las
+        desviaciones de cada bloque se combinan con la fórmula de Chan et al.,
+        sin perder precisión con valores grandes). Los distintos se estiman con HyperLogLog
+        (error ~1.04/sqrt(2^hll_precision), 0.8% por defecto), los cuartiles con
+        KLL (error de rango ~1.65% con k=200) y los valores más frecuentes con
+        Space-Saving (sobrestimación máxima N / capacidad).
+
+        Args:
+            data: Un DataFrame o un iterable de DataFrames con las mismas
+                  columnas (p. ej. ``pd.read_csv(..., chunksize=...)``).
+            top_k (int): Valores más frecuentes a retornar por columna.
+            hll_precision (int): Precisión de HyperLogLog (4-18).
+            kll_k (int): Parámetro k de KLL.
+
+        Returns:
+            dict: Mismo formato que ``profile`` con ``approximate=True``, además de
+                  ``error_bounds`` globales y ``top_values`` por columna (lista de
+                  pares valor-conteo; None en columnas decimales).
+        """
+        num_rows = 0
+        memory_bytes = 0
+        columns = None
+        sketches = {}
+        for chunk in self._iter_chunks(data):
+            if columns is None:
+                columns = {}
+                for column, dtype in chunk.dtypes.items():
+                    is_numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                    columns[column] = {"dtype": str(dtype), "is_numeric": is_numeric, "nulls": 0}
+                    sketches[column] = {
+                        "distinct": HyperLogLog(hll_precision),
+                        # En columnas decimales casi todos los valores son únicos: sin top-k
+                        "top": (
+                            None
+                            if pd.api.types.is_float_dtype(dtype)
+                            else SpaceSaving(capacity=max(100, 10 * top_k))
+                        ),
+                        "quantiles": KLLSketch(kll_k, seed=0) if is_numeric else None,
+                        "count": 0,
+                        "mean": 0.0,
+                        "m2": 0.0,
+                    }
+            num_rows += len(chunk)
+            memory_bytes += int(chunk.memory_usage(index=True, deep=False).sum())
+            for position, (column, column_profile) in enumerate(columns.items()):
+                series = chunk.iloc[:, position]
+                valid = series[series.notna()]
+                column_profile["nulls"] += len(series) - len(valid)
+                column_sketches = sketches[column]
+                column_sketches["distinct"].update(valid)
+                if column_sketches["top"] is not None:
+                    column_sketches["top"].update(valid)
+                if column_profile["is_numeric"]:
+                    values = valid.to_numpy(dtype="float64")
+                    column_sketches["quantiles"].update(values)
+                    if len(values):
+                        chunk_mean = float(values.mean())
+                        self._merge_moments(
+                            column_sketches,
+                            len(values),
+                            chunk_mean,
+                            float(np.square(values - chunk_mean).sum()),
+                        )
+
+        for column, column_profile in (columns or {}).items():
+            column_sketches = sketches[column]
+            count = num_rows - column_profile["nulls"]
+            column_profile["non_null"] = count
+            column_profile["null_percent"] = (
+                round(column_profile["nulls"] / num_rows * 100, 2) if num_rows else 0.0
+            )
+            column_profile["distinct"] = min(column_sketches["distinct"].estimate(), count)
+            column_profile["top_values"] = (
+                list(column_sketches["top"].top(top_k).items())
+                if column_sketches["top"] is not None
+                else None
+            )
+            if column_profile["is_numeric"]:
+                column_profile["mean"] = column_sketches["mean"] if count else None
+                column_profile["std"] = (
+                    float(np.sqrt(column_sketches["m2"] / (count - 1))) if count > 1 else None
+                )
+                quantiles = column_sketches["quantiles"].quantiles(
+                    [0.0, *PROFILE_QUANTILES.values(), 1.0]
+                )
+                column_profile["min"] = quantiles[0]
+                for label, value in zip(PROFILE_QUANTILES, quantiles[1:-1]):
+                    column_profile[label] = value
+                column_profile["max"] = quantiles[-1]
+
+        return {
+            "num_rows": num_rows,
+            "num_cols": len(columns or {}),
+            "memory_bytes": memory_bytes,
+            "approximate": True,
+            "error_bounds": {
+                "distinct_relative_error": HyperLogLog(hll_precision).relative_error,
+                "quantile_rank_error": KLLSketch(kll_k).rank_error,
+                "top_values_max_overcount": f"N / {max(100, 10 * top_k)}",
+            },
+            "columns": columns or {},
+        }
+
+    @staticmethod
+    def _merge_moments(moments: dict, count: int, mean: float, m2: float):
+        """
+        Añade a ``moments`` (``count``, ``mean`` y ``m2``: suma de cuadrados de
+        las desviaciones a la media) los de otro grupo de valores, con la
+        fórmula de combinación de Chan et al.
+        """
+        total = moments["count"] + count
+        delta = mean - moments["mean"]
+        moments["mean"] += delta * count / total
+        moments["m2"] += m2 + delta * delta * moments["count"] * count / total
+        moments["count"] = total
+
+    def handle_dataset_change(self, change: dict):
+        """
+        Actualiza las estadísticas incrementales tras un cambio del DataFrame
+        activo y descarta de la caché los resultados de versiones anteriores.
+        Se registra con ``AppState.add_change_listener``.
+
+        Si solo se eliminaron filas o cambiaron algunas columnas, se aplican los
+        cambios; si se añadieron filas o los datos se reemplazaron, se recalcula todo.
+        """
+        if self._result_cache is not None:
+            self._result_cache.invalidate()
+        self._duplicate_detector.invalidate()
+        df = change.get("dataframe")
+        version = change.get("version")
+        statistics = self._running_statistics
+        try:
+            if df is None:
+                self._tracked_dataframe = None
+                statistics.version = None
+                return
+            if (
+                change.get("kind") != "updated"
+                or self._tracked_dataframe is None
+                # Las filas añadidas no se acumulan de forma incremental
+                or change.get("added_rows") is not None
+            ):
+                statistics.refresh(df, version)
+            elif change.get("removed_rows") is not None:
+                statistics.apply_removed_rows(
+                    df, change["removed_rows"], version, change.get("changed_columns")
+                )
+            else:
+                statistics.apply_changed_columns(df, change.get("changed_columns") or [], version)
+            self._tracked_dataframe = df
+        except Exception as e:
+            self._tracked_dataframe = None
+            statistics.version = None
+            print(f"DataAnalyzer Error: No se pudieron actualizar las estadísticas: {e}")
+            return
+        print(
+            f"DataAnalyzer: Estadísticas actualizadas ({statistics.last_refresh['mode']}, "
+            f"{statistics.last_refresh['seconds'] * 1000:.1f} ms)."
+        )
+
+    @memoized
+    def get_running_statistics(self, df: pd.DataFrame) -> dict:
+        """
+        Retorna conteos, nulos, suma, media, desviación, mínimo y máximo por
+        columna (ver ``RunningStatistics.get_summary``).
+
+        Si ``df`` es el DataFrame activo, el resumen sale de las estadísticas
+        incrementales sin recorrer los datos; en otro caso se calcula.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+
+        Returns:
+            dict: ``num_rows``, ``num_cols`` y ``columns``.
+        """
+        if df is None:
+            return {"num_rows": 0, "num_cols": 0, "columns": {}}
+        if df is self._tracked_dataframe and self._running_statistics.version is not None:
+            return self._running_statistics.get_summary()
+        statistics = RunningStatistics()
+        statistics.refresh(df)
+        return statistics.get_summary()
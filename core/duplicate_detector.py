@@ -0,0 +1,255 @@
+import duckdb
+import numpy as np
+import pandas as pd
+from typing import Optional
+from core.result_cache import ResultCache
+
+
+class DuplicateDetector:
+    """
+    Detección de filas duplicadas a partir de un hash de 64 bits por fila.
+
+    Los hashes se calculan una sola vez por DataFrame, versión de los datos y
+    subconjunto de columnas con ``pd.util.hash_pandas_object`` (vectorizado) y
+    se reutilizan para el conteo, la máscara y los grupos de duplicados. Filas
+    iguales tienen siempre el mismo hash (los ceros con signo y los NaN de las
+    columnas decimales se normalizan antes), pero el mismo hash no garantiza
+    filas iguales: en columnas ``object``, por ejemplo, ``1`` y ``'1'`` tienen
+    el mismo hash. Por eso los hashes solo descartan las filas únicas y las
+    candidatas se comparan con Pandas, de modo que el resultado coincide con
+    ``df.duplicated``.
+
+    A partir de ``max_hash_rows`` filas el conteo y los grupos se calculan con
+    un GROUP BY de DuckDB, que puede volcar a disco y no necesita la columna de
+    hashes en memoria. Solo se usa si ninguna columna comparada es ``object``,
+    porque DuckDB las convierte a texto.
+    """
+
+    def __init__(
+        self,
+        version_provider=None,
+        max_hash_rows: Optional[int] = None,
+        cache_size: int = 8,
+    ):
+        """
+        Args:
+            version_provider (callable, optional): Función sin argumentos que
+                retorna la versión actual de los datos (p. ej.
+                ``AppState.get_dataset_version``).
+            max_hash_rows (int, optional): A partir de este número de filas el
+                conteo y los grupos usan DuckDB. None lo desactiva.
+            cache_size (int): Número máximo de columnas de hashes guardadas.
+        """
+        self.max_hash_rows = max_hash_rows
+        # Los hashes son de solo lectura: se comparten sin copiarlos
+        self._hash_cache = ResultCache(
+            cache_size, version_provider=version_provider, copy_results=False
+        )
+        # Conexión propia en memoria; cada consulta usa su propio cursor
+        self._connection = duckdb.connect(database=":memory:")
+
+    @staticmethod
+    def _resolve_subset(df: pd.DataFrame, subset: Optional[list]) -> list:
+        """
+        Retorna las columnas a comparar (todas si ``subset`` es None).
+
+        Raises:
+            ValueError: Si alguna columna no existe.
+        """
+        if subset is None:
+            return list(df.columns)
+        subset = list(subset)
+        missing = [column for column in subset if column not in df.columns]
+        if missing:
+            raise ValueError(f"DuplicateDetector Error: Columnas no encontradas: {missing}")
+        if not subset:
+            raise ValueError("DuplicateDetector Error: Indique al menos una columna.")
+        return subset
+
+    @staticmethod
+    def _quote(identifier) -> str:
+        """Entrecomilla un nombre de columna para SQL."""
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    def _use_duckdb(self, df: pd.DataFrame, columns: list) -> bool:
+        """Decide si el conteo y los grupos se calculan con DuckDB."""
+        return (
+            self.max_hash_rows is not None
+            and len(df) >= self.max_hash_rows
+            and not any(pd.api.types.is_object_dtype(dtype) for dtype in df[columns].dtypes)
+        )
+
+    @staticmethod
+    def _normalize_floats(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normaliza las columnas decimales para el hash: -0.0 pasa a 0.0 y todos
+        los NaN a un mismo valor, que Pandas considera iguales al comparar filas.
+        """
+        float_columns = [
+            position
+            for position, dtype in enumerate(data.dtypes)
+            if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_complex_dtype(dtype)
+        ]
+        if not float_columns:
+            return data
+        data = data.copy(deep=False)
+        for position in float_columns:
+            series = data.iloc[:, position] + 0.0
+            data.isetitem(position, series.mask(series.isna()))
+        return data
+
+    def _candidates(self, df: pd.DataFrame, columns: list) -> np.ndarray:
+        """Posiciones de las filas cuyo hash se repite (posibles duplicados)."""
+        hashes = pd.Series(self.row_hashes(df, columns), copy=False)
+        return np.flatnonzero(hashes.duplicated(keep=False).to_numpy())
+
+    def row_hashes(self, df: pd.DataFrame, subset: Optional[list] = None) -> np.ndarray:
+        """
+        Retorna el hash de 64 bits de cada fila sobre las columnas ``subset``.
+        El array es de solo lectura y se guarda hasta que cambian los datos.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+
+        Returns:
+            np.ndarray: Array ``uint64`` con una posición por fila.
+        """
+        columns = self._resolve_subset(df, subset)
+
+        def compute():
+            hashes = pd.util.hash_pandas_object(
+                self._normalize_floats(df[columns]), index=False
+            ).to_numpy()
+            hashes.flags.writeable = False
+            return hashes
+
+        return self._hash_cache.get_or_compute(df, "row_hashes", (tuple(columns),), {}, compute)
+
+    def duplicated(
+        self, df: pd.DataFrame, subset: Optional[list] = None, keep="first"
+    ) -> np.ndarray:
+        """
+        Máscara de filas duplicadas, igual a ``df.duplicated(subset, keep)``.
+        Pandas solo compara las filas cuyo hash se repite.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+            keep: 'first', 'last' o False, como en Pandas.
+
+        Returns:
+            np.ndarray: Array booleano con una posición por fila.
+        """
+        columns = self._resolve_subset(df, subset)
+        mask = np.zeros(len(df), dtype=bool)
+        candidates = self._candidates(df, columns)
+        if len(candidates):
+            # Las filas con hash único no son iguales a ninguna otra: comparar
+            # solo las candidatas da el mismo resultado que todo el DataFrame
+            mask[candidates] = (
+                df.iloc[candidates].duplicated(subset=columns, keep=keep).to_numpy()
+            )
+        return mask
+
+    def count_duplicates(self, df: pd.DataFrame, subset: Optional[list] = None) -> int:
+        """
+        Número de filas que repiten una fila anterior (las que eliminaría
+        ``drop_duplicates``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+
+        Returns:
+            int: Número de filas duplicadas.
+        """
+        columns = self._resolve_subset(df, subset)
+        if self._use_duckdb(df, columns):
+            try:
+                return self._count_duplicates_duckdb(df, columns)
+            except Exception as e:
+                print(f"DuplicateDetector Error: DuckDB falló, se usan los hashes: {e}")
+        return int(self.duplicated(df, columns).sum())
+
+    def duplicate_groups(
+        self, df: pd.DataFrame, subset: Optional[list] = None, top_n: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Grupos de filas repetidas: los valores de las columnas comparadas y el
+        número de veces que aparecen, de más a menos repetidos.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            subset (list, optional): Columnas a comparar. Por defecto, todas.
+            top_n (int, optional): Número máximo de grupos. Por defecto, todos.
+
+        Returns:
+            pd.DataFrame: Las columnas comparadas, ``count`` (apariciones) y
+                          ``first_row`` (índice de la primera aparición; solo
+                          con hashes).
+        """
+        columns = self._resolve_subset(df, subset)
+        if self._use_duckdb(df, columns):
+            try:
+                return self._duplicate_groups_duckdb(df, columns, top_n)
+            except Exception as e:
+                print(f"DuplicateDetector Error: DuckDB falló, se usan los hashes: {e}")
+
+        # Los grupos se forman con los valores de las filas candidatas, no con
+        # sus hashes, de modo que filas distintas con el mismo hash no se mezclan
+        positions = self._candidates(df, columns)
+        group_ids = (
+            df.iloc[positions].groupby(columns, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        )
+        groups = (
+            pd.DataFrame({"group": group_ids, "position": positions})
+            .groupby("group", sort=False)
+            .agg(count=("position", "size"), position=("position", "first"))
+        )
+        groups = groups[groups["count"] > 1].sort_values("count", ascending=False, kind="stable")
+        if top_n is not None:
+            groups = groups.head(top_n)
+        first_positions = groups["position"].to_numpy()
+        return (
+            df.iloc[first_positions][columns]
+            .assign(count=groups["count"].to_numpy(), first_row=df.index[first_positions])
+            .reset_index(drop=True)
+        )
+
+    def _count_duplicates_duckdb(self, df: pd.DataFrame, columns: list) -> int:
+        """Cuenta los duplicados con un GROUP BY de DuckDB."""
+        column_list = ", ".join(self._quote(column) for column in columns)
+        query = (
+            "SELECT COALESCE(SUM(repeats - 1), 0) FROM ("
+            f"SELECT COUNT(*) AS repeats FROM duplicate_source GROUP BY {column_list})"
+        )
+        cursor = self._connection.cursor()
+        try:
+            # DuckDB lee del DataFrame solo las columnas que usa la consulta
+            cursor.register("duplicate_source", df)
+            return int(cursor.execute(query).fetchone()[0])
+        finally:
+            cursor.close()
+
+    def _duplicate_groups_duckdb(
+        self, df: pd.DataFrame, columns: list, top_n: Optional[int]
+    ) -> pd.DataFrame:
+        """Calcula los grupos de duplicados con un GROUP BY de DuckDB."""
+        column_list = ", ".join(self._quote(column) for column in columns)
+        query = (
+            f"SELECT {column_list}, COUNT(*) AS count FROM duplicate_source "
+            f"GROUP BY {column_list} HAVING COUNT(*) > 1 ORDER BY count DESC"
+        )
+        if top_n is not None:
+            query += f" LIMIT {int(top_n)}"
+        cursor = self._connection.cursor()
+        try:
+            cursor.register("duplicate_source", df)
+            return cursor.execute(query).fetch_arrow_table().to_pandas()
+        finally:
+            cursor.close()
+
+    def invalidate(self):
+        """Descarta los hashes de versiones anteriores de los datos."""
+        self._hash_cache.invalidate()
@@ -0,0 +1,154 @@
+import duckdb
+import pandas as pd
+
+
+# Funciones de agregación soportadas: expresión SQL de DuckDB y equivalente de Pandas
+GROUP_AGGREGATE_FUNCTIONS = {
+    "count": ("COUNT({column})", "count"),
+    "sum": ("SUM({column})", "sum"),
+    "mean": ("AVG({column})", "mean"),
+    "min": ("MIN({column})", "min"),
+    "max": ("MAX({column})", "max"),
+    "median": ("MEDIAN({column})", "median"),
+    "std": ("STDDEV_SAMP({column})", "std"),
+    "nunique": ("COUNT(DISTINCT {column})", "nunique"),
+}
+
+# Motores de ejecución: DuckDB (por defecto) y Pandas como alternativa
+GROUP_BY_ENGINES = ("duckdb", "pandas")
+
+# Columna "*" de count(*): número de filas del grupo
+COUNT_ALL_COLUMN = "*"
+
+
+class GroupAggregator:
+    """
+    Agregaciones por grupos (varias claves y varias agregaciones) en una sola
+    pasada de agregación hash de DuckDB, que trabaja en paralelo y directamente
+    sobre las columnas del DataFrame, sin copiarlas. Si DuckDB falla, se usa un
+    único ``groupby().agg()`` de Pandas con el mismo resultado.
+    """
+
+    def __init__(self):
+        # Conexión propia en memoria; cada agregación usa su propio cursor
+        self._connection = duckdb.connect(database=":memory:")
+
+    @staticmethod
+    def get_output_name(function: str, column: str) -> str:
+        """Nombre de la columna de resultado de una agregación (p. ej. 'sum_ventas')."""
+        return "rows" if column == COUNT_ALL_COLUMN else f"{function}_{column}"
+
+    @staticmethod
+    def _quote(identifier) -> str:
+        """Entrecomilla un nombre de columna para SQL."""
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    def validate(self, df: pd.DataFrame, keys: list, aggregations: list):
+        """
+        Comprueba las claves y las agregaciones.
+
+        Raises:
+            ValueError: Si falta una columna, una función no es soportada o un
+                        nombre de resultado se repite.
+        """
+        if not keys:
+            raise ValueError("GroupAggregator Error: Indique al menos una columna de agrupación.")
+        if not aggregations:
+            raise ValueError("GroupAggregator Error: Indique al menos una agregación.")
+        missing = [key for key in keys if key not in df.columns]
+        missing += [
+            column
+            for _, column in aggregations
+            if column != COUNT_ALL_COLUMN and column not in df.columns
+        ]
+        if missing:
+            raise ValueError(f"GroupAggregator Error: Columnas no encontradas: {missing}")
+        output_names = list(keys)
+        for function, column in aggregations:
+            if function not in GROUP_AGGREGATE_FUNCTIONS:
+                raise ValueError(
+                    f"GroupAggregator Error: Función no soportada: '{function}'. "
+                    f"Opciones: {', '.join(GROUP_AGGREGATE_FUNCTIONS)}."
+                )
+            if column == COUNT_ALL_COLUMN and function != "count":
+                raise ValueError("GroupAggregator Error: '*' solo se admite en count(*).")
+            output_names.append(self.get_output_name(function, column))
+        if len(set(output_names)) < len(output_names):
+            raise ValueError("GroupAggregator Error: Hay agregaciones o claves repetidas.")
+
+    def aggregate(
+        self, df: pd.DataFrame, keys: list, aggregations: list, engine: str = "duckdb"
+    ) -> pd.DataFrame:
+        """
+        Agrupa ``df`` por ``keys`` y calcula todas las agregaciones a la vez.
+        Los nulos de las claves forman su propio grupo y los grupos se
+        ordenan por las claves.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a agrupar.
+            keys (list): Columnas de agrupación.
+            aggregations (list): Pares (función, columna); ``("count", "*")``
+                                 cuenta las filas de cada grupo.
+            engine (str): 'duckdb' (por defecto) o 'pandas'.
+
+        Returns:
+            pd.DataFrame: Las claves y una columna por agregación ('rows' o
+                          '{función}_{columna}').
+
+        Raises:
+            ValueError: Si los argumentos no son válidos.
+        """
+        if engine not in GROUP_BY_ENGINES:
+            raise ValueError(
+                f"GroupAggregator Error: Motor no soportado: '{engine}'. "
+                f"Opciones: {', '.join(GROUP_BY_ENGINES)}."
+            )
+        keys = list(keys)
+        aggregations = [(function.lower(), column) for function, column in aggregations]
+        self.validate(df, keys, aggregations)
+
+        if engine == "duckdb":
+            try:
+                return self._aggregate_duckdb(df, keys, aggregations)
+            except Exception as e:
+                print(f"GroupAggregator Error: DuckDB falló, se usa Pandas: {e}")
+        return self._aggregate_pandas(df, keys, aggregations)
+
+    def _aggregate_duckdb(self, df: pd.DataFrame, keys: list, aggregations: list) -> pd.DataFrame:
+        """Ejecuta la agregación como un único GROUP BY de DuckDB."""
+        key_list = ", ".join(self._quote(key) for key in keys)
+        expressions = [
+            (
+                "COUNT(*)"
+                if column == COUNT_ALL_COLUMN
+                else GROUP_AGGREGATE_FUNCTIONS[function][0].format(column=self._quote(column))
+            )
+            + f" AS {self._quote(self.get_output_name(function, column))}"
+            for function, column in aggregations
+        ]
+        query = (
+            f"SELECT {key_list}, {', '.join(expressions)} FROM group_source "
+            f"GROUP BY {key_list} ORDER BY {key_list} NULLS LAST"
+        )
+        cursor = self._connection.cursor()
+        try:
+            # DuckDB lee del DataFrame solo las columnas que usa la consulta
+            cursor.register("group_source", df)
+            return cursor.execute(query).fetch_arrow_table().to_pandas()
+        finally:
+            cursor.close()
+
+    def _aggregate_pandas(self, df: pd.DataFrame, keys: list, aggregations: list) -> pd.DataFrame:
+        """Ejecuta la agregación con un único ``groupby().agg()`` de Pandas."""
+        named_aggregations = {
+            self.get_output_name(function, column): (
+                (keys[0], "size")
+                if column == COUNT_ALL_COLUMN
+                else (column, GROUP_AGGREGATE_FUNCTIONS[function][1])
+            )
+            for function, column in aggregations
+        }
+        result = df.groupby(keys, dropna=False, sort=True, observed=True).agg(
+            **named_aggregations
+        )
+        return result.reset_index()
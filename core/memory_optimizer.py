@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Sin PyArrow no se recomiendan cadenas Arrow
+    pa = None
+
+
+# Proporción máxima de valores distintos para recomendar 'category'
+CATEGORY_MAX_RATIO = 0.5
+
+# Proporción mínima de nulos para recomendar una columna dispersa (sparse)
+SPARSE_MIN_NULL_RATIO = 0.9
+
+# Tipos enteros candidatos, del más pequeño al más grande
+INTEGER_DTYPES = ("int8", "uint8", "int16", "uint16", "int32", "uint32", "int64")
+
+
+class MemoryOptimizer:
+    """
+    Informe de memoria por columna y conversión a representaciones más baratas:
+    enteros y decimales más pequeños (sin pérdida), 'category' para texto con
+    pocos valores distintos, columnas dispersas para las casi vacías y cadenas
+    Arrow para el resto del texto.
+    """
+
+    @staticmethod
+    def _integer_dtype(series: pd.Series):
+        """Retorna el tipo entero más pequeño que contiene todos los valores."""
+        if series.empty:
+            return None
+        minimum, maximum = series.min(), series.max()
+        for dtype in INTEGER_DTYPES:
+            limits = np.iinfo(dtype)
+            if limits.min <= minimum and maximum <= limits.max:
+                return np.dtype(dtype)
+        return None
+
+    def recommend(self, series: pd.Series) -> tuple:
+        """
+        Recomienda una representación más barata para una columna.
+
+        Returns:
+            tuple: (tipo recomendado, motivo), o (None, None) si no hay mejora.
+        """
+        dtype = series.dtype
+        num_rows = len(series)
+        if num_rows == 0 or isinstance(dtype, (pd.SparseDtype, pd.CategoricalDtype)):
+            return None, None
+        nulls = int(series.isna().sum())
+
+        if pd.api.types.is_float_dtype(dtype) and nulls / num_rows >= SPARSE_MIN_NULL_RATIO:
+            return pd.SparseDtype(dtype, np.nan), f"{nulls / num_rows:.0%} de nulos"
+
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            target = self._integer_dtype(series)
+            if target is not None and target.itemsize < dtype.itemsize:
+                return target, f"valores entre {series.min()} y {series.max()}"
+            return None, None
+
+        if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype) and dtype.itemsize > 4:
+            values = series.to_numpy()
+            # Solo si float32 representa exactamente todos los valores
+            if np.array_equal(values.astype(np.float32).astype(dtype), values, equal_nan=True):
+                return np.dtype("float32"), "float32 representa todos los valores sin pérdida"
+            return None, None
+
+        if dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+            distinct = series.nunique(dropna=True)
+            if distinct / num_rows <= CATEGORY_MAX_RATIO:
+                return pd.CategoricalDtype(), f"{distinct} valores distintos"
+            if pa is not None:
+                return pd.StringDtype("pyarrow"), "texto con muchos valores distintos"
+        return None, None
+
+    @staticmethod
+    def get_dtype_label(dtype) -> str:
+        """Nombre legible de un tipo (incluye el almacenamiento de las cadenas)."""
+        if isinstance(dtype, pd.StringDtype):
+            return f"string[{dtype.storage}]"
+        return str(dtype)
+
+    def memory_report(self, df: pd.DataFrame) -> dict:
+        """
+        Calcula la memoria real (``deep=True``) de cada columna y la que
+        ocuparía con la representación recomendada.
+
+        Returns:
+            dict: ``total_bytes``, ``optimized_bytes``, ``index_bytes`` y
+                  ``columns``: por columna ``dtype``, ``bytes``, ``recommended``
+                  (tipo como texto o None), ``target_dtype`` (el tipo de Pandas),
+                  ``optimized_bytes`` y ``reason``.
+        """
+        columns = {}
+        memory = df.memory_usage(deep=True, index=False)
+        for position, column in enumerate(df.columns):
+            series = df.iloc[:, position]
+            column_bytes = int(memory.iloc[position])
+            target, reason = self.recommend(series)
+            optimized_bytes = column_bytes
+            if target is not None:
+                optimized_bytes = int(series.astype(target).memory_usage(deep=True, index=False))
+                if optimized_bytes >= column_bytes:
+                    target, reason, optimized_bytes = None, None, column_bytes
+            columns[column] = {
+                "dtype": str(series.dtype),
+                "bytes": column_bytes,
+                "recommended": self.get_dtype_label(target) if target is not None else None,
+                "target_dtype": target,
+                "optimized_bytes": optimized_bytes,
+                "reason": reason,
+            }
+        index_bytes = int(df.index.memory_usage(deep=True))
+        return {
+            "total_bytes": index_bytes + sum(c["bytes"] for c in columns.values()),
+            "optimized_bytes": index_bytes + sum(c["optimized_bytes"] for c in columns.values()),
+            "index_bytes": index_bytes,
+            "columns": columns,
+        }
+
+    def optimize(self, df: pd.DataFrame, report: dict = None) -> tuple:
+        """
+        Aplica las recomendaciones y retorna un DataFrame nuevo (``df`` no cambia).
+
+        Args:
+            df (pd.DataFrame): El DataFrame a optimizar.
+            report (dict, optional): Informe de ``memory_report`` ya calculado para ``df``.
+
+        Returns:
+            tuple: (DataFrame optimizado, lista de columnas convertidas,
+                    bytes antes, bytes después).
+        """
+        report = report or self.memory_report(df)
+        optimized = df.copy(deep=False)
+        changed_columns = []
+        for position, (column, column_report) in enumerate(report["columns"].items()):
+            target = column_report["target_dtype"]
+            if target is None:
+                continue
+            optimized[column] = df.iloc[:, position].astype(target)
+            changed_columns.append(column)
+        bytes_after = int(optimized.memory_usage(deep=True, index=True).sum())
+        return optimized, changed_columns, report["total_bytes"], bytes_after
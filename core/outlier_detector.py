@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+# Métodos soportados y su factor por defecto: k·IQR fuera de los cuartiles,
+# k desviaciones de la media y k en la puntuación z modificada (MAD)
+OUTLIER_METHODS = {"iqr": 1.5, "zscore": 3.0, "mad": 3.5}
+
+# Acciones de limpieza: recortar a los umbrales o eliminar las filas marcadas
+OUTLIER_ACTIONS = ("cap", "drop")
+
+# Constante de la puntuación z modificada: MAD / 0.6745 estima la desviación típica
+MAD_SCALE = 0.6745
+
+
+class OutlierDetector:
+    """
+    Detección de valores atípicos en todas las columnas numéricas a la vez.
+
+    Las columnas se convierten por bloques a una matriz float64 y los umbrales
+    (cuartiles, media y desviación, o mediana y MAD) se calculan por columnas
+    con operaciones vectorizadas de NumPy; los cuantiles usan selección
+    (``np.partition``), de modo que el coste crece linealmente con las filas.
+    """
+
+    def __init__(self, block_values: int = 8_000_000):
+        """
+        Args:
+            block_values (int): Valores por bloque (filas × columnas) convertidos
+                                a float64 a la vez; acota la memoria adicional.
+        """
+        if block_values <= 0:
+            raise ValueError("OutlierDetector Error: block_values debe ser mayor que cero.")
+        self.block_values = block_values
+
+    @staticmethod
+    def get_numeric_columns(df: pd.DataFrame) -> list:
+        """Retorna las columnas numéricas (sin booleanas) de ``df``."""
+        return [
+            column
+            for column, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        ]
+
+    def _column_blocks(self, columns: list, num_rows: int):
+        """Divide las columnas en bloques de como mucho ``block_values`` valores."""
+        size = max(1, self.block_values // max(num_rows, 1))
+        for start in range(0, len(columns), size):
+            yield columns[start : start + size]
+
+    @staticmethod
+    def _quantiles(values: np.ndarray, quantiles: list) -> np.ndarray:
+        """
+        Cuantiles por columna ignorando los nulos. Sin nulos se calculan todas
+        las columnas en una sola llamada; con nulos, columna a columna.
+
+        Returns:
+            np.ndarray: Matriz (cuantiles × columnas).
+        """
+        if not len(values):
+            return np.full((len(quantiles), values.shape[1]), np.nan)
+        missing = np.isnan(values)
+        if not missing.any():
+            return np.quantile(values, quantiles, axis=0)
+        result = np.full((len(quantiles), values.shape[1]), np.nan)
+        for position in range(values.shape[1]):
+            column = values[~missing[:, position], position]
+            if len(column):
+                result[:, position] = np.quantile(column, quantiles)
+        return result
+
+    def _bounds(self, values: np.ndarray, method: str, factor: float) -> tuple:
+        """Calcula los umbrales inferior y superior de cada columna de ``values``."""
+        if method == "iqr":
+            first, third = self._quantiles(values, [0.25, 0.75])
+            spread = third - first
+            return first - factor * spread, third + factor * spread
+        if method == "zscore":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                counts = np.sum(~np.isnan(values), axis=0)
+                mean = np.nansum(values, axis=0) / counts
+                deviation = np.sqrt(
+                    np.nansum(np.square(values - mean), axis=0) / (counts - 1)
+                )
+            return mean - factor * deviation, mean + factor * deviation
+        median = self._quantiles(values, [0.5])[0]
+        deviation = self._quantiles(np.abs(values - median), [0.5])[0] / MAD_SCALE
+        return median - factor * deviation, median + factor * deviation
+
+    def _validate(self, df: pd.DataFrame, method: str, columns: Optional[list]) -> list:
+        """
+        Valida el método y las columnas; retorna las columnas a analizar.
+
+        Raises:
+            ValueError: Si el método no es válido o alguna columna no es numérica.
+        """
+        if method not in OUTLIER_METHODS:
+            raise ValueError(
+                f"OutlierDetector Error: Método no soportado: '{method}'. "
+                f"Opciones: {', '.join(OUTLIER_METHODS)}."
+            )
+        numeric_columns = self.get_numeric_columns(df)
+        if columns is None:
+            return numeric_columns
+        invalid = [column for column in columns if column not in numeric_columns]
+        if invalid:
+            raise ValueError(
+                f"OutlierDetector Error: Columnas no numéricas o inexistentes: {invalid}"
+            )
+        return list(columns)
+
+    def detect(
+        self,
+        df: pd.DataFrame,
+        method: str = "iqr",
+        columns: Optional[list] = None,
+        factor: Optional[float] = None,
+    ) -> dict:
+        """
+        Marca los valores atípicos de cada columna numérica.
+
+        Args:
+            df (pd.DataFrame): El DataFrame a analizar.
+            method (str): 'iqr', 'zscore' o 'mad'.
+            columns (list, optional): Columnas numéricas a analizar. Por defecto, todas.
+            factor (float, optional): Multiplicador de los umbrales. Por defecto,
+                                      1.5 (IQR), 3 (z-score) o 3.5 (MAD).
+
+        Returns:
+            dict: ``method``, ``factor``, ``num_rows``, ``flagged_rows`` (filas con
+                  algún atípico) y ``columns``: por columna ``lower``, ``upper``,
+                  ``count``, ``percent`` y ``rows`` (índice de las filas marcadas).
+
+        Raises:
+            ValueError: Si el método no es válido o alguna columna no es numérica.
+        """
+        columns = self._validate(df, method, columns)
+        factor = OUTLIER_METHODS[method] if factor is None else float(factor)
+        num_rows = len(df)
+        flagged = np.zeros(num_rows, dtype=bool)
+        report_columns = {}
+        for block_columns in self._column_blocks(columns, num_rows):
+            values = df[block_columns].to_numpy(dtype="float64", na_value=np.nan)
+            lower, upper = self._bounds(values, method, factor)
+            # Las comparaciones con NaN son falsas: los nulos nunca se marcan
+            mask = (values < lower) | (values > upper)
+            flagged |= mask.any(axis=1)
+            counts = mask.sum(axis=0)
+            for position, column in enumerate(block_columns):
+                count = int(counts[position])
+                report_columns[column] = {
+                    "lower": float(lower[position]),
+                    "upper": float(upper[position]),
+                    "count": count,
+                    "percent": count / num_rows * 100 if num_rows else 0.0,
+                    "rows": df.index[np.flatnonzero(mask[:, position])] if count else df.index[:0],
+                }
+        return {
+            "method": method,
+            "factor": factor,
+            "num_rows": num_rows,
+            "flagged_rows": int(flagged.sum()),
+            "columns": report_columns,
+        }
+
+    def get_mask(self, df: pd.DataFrame, report: dict) -> np.ndarray:
+        """
+        Retorna la máscara de filas con algún valor fuera de los umbrales de ``report``.
+        """
+        columns = [column for column, info in report["columns"].items() if info["count"]]
+        flagged = np.zeros(len(df), dtype=bool)
+        for block_columns in self._column_blocks(columns, len(df)):
+            values = df[block_columns].to_numpy(dtype="float64", na_value=np.nan)
+            lower = np.array([report["columns"][column]["lower"] for column in block_columns])
+            upper = np.array([report["columns"][column]["upper"] for column in block_columns])
+            flagged |= ((values < lower) | (values > upper)).any(axis=1)
+        return flagged
+
+    def clean(self, df: pd.DataFrame, report: dict, action: str = "cap") -> tuple:
+        """
+        Aplica una acción de limpieza a los atípicos de ``report`` y retorna un
+        DataFrame nuevo (``df`` no cambia).
+
+        Args:
+            df (pd.DataFrame): El DataFrame analizado.
+            report (dict): Resultado de ``detect`` para ``df``.
+            action (str): 'cap' recorta los valores a los umbrales; 'drop'
+                          elimina las filas con algún atípico.
+
+        Returns:
+            tuple: (DataFrame limpio, columnas modificadas, filas eliminadas o None).
+
+        Raises:
+            ValueError: Si la acción no es válida.
+        """
+        if action not in OUTLIER_ACTIONS:
+            raise ValueError(
+                f"OutlierDetector Error: Acción no soportada: '{action}'. "
+                f"Opciones: {', '.join(OUTLIER_ACTIONS)}."
+            )
+        if action == "drop":
+            flagged = self.get_mask(df, report)
+            return df[~flagged], [], df[flagged]
+
+        cleaned = df.copy(deep=False)
+        changed_columns = []
+        for column, info in report["columns"].items():
+            if not info["count"]:
+                continue
+            series = df[column]
+            # Umbrales dentro del rango observado: el recorte no cambia el tipo
+            # de las columnas enteras
+            lower, upper = info["lower"], info["upper"]
+            if pd.api.types.is_integer_dtype(series.dtype):
+                lower, upper = np.ceil(lower), np.floor(upper)
+            lower = max(lower, series.min())
+            upper = min(upper, series.max())
+            cleaned[column] = series.clip(lower=lower, upper=upper)
+            changed_columns.append(column)
+        return cleaned, changed_columns, None
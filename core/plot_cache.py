@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Optional
+from core.result_cache import ResultCache
+
+
+class PlotCache:
+    """
+    Caché acotada de gráficos ya renderizados (bytes PNG), en memoria y,
+    opcionalmente, en disco.
+
+    La clave combina el tipo de gráfico, sus parámetros (columnas, título,
+    tema...) y una huella del contenido de las columnas usadas. La huella se
+    guarda por DataFrame y versión de los datos, así que volver a pedir un
+    gráfico sin cambios no recorre los datos; al ser de contenido, las
+    imágenes en disco siguen siendo válidas entre sesiones.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 256,
+        version_provider=None,
+    ):
+        """
+        Args:
+            max_entries (int): Número máximo de imágenes en memoria.
+            cache_dir (str, optional): Carpeta para guardar las imágenes en disco.
+                                       None desactiva la caché en disco.
+            max_disk_entries (int): Número máximo de imágenes en disco; se
+                                    eliminan primero las más antiguas.
+            version_provider (callable, optional): Función sin argumentos que
+                retorna la versión actual de los datos. Sin ella, la huella de
+                los datos se recalcula en cada consulta.
+
+        Raises:
+            ValueError: Si ``max_entries`` o ``max_disk_entries`` no son positivos.
+        """
+        if max_entries <= 0 or max_disk_entries <= 0:
+            raise ValueError("PlotCache Error: El número de entradas debe ser mayor que cero.")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._images: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Huellas de contenido por DataFrame, versión y columnas
+        self._fingerprints = (
+            ResultCache(max_entries, version_provider=version_provider, copy_results=False)
+            if version_provider is not None
+            else None
+        )
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                print(f"PlotCache Error: No se pudo crear la carpeta de caché '{cache_dir}': {e}")
+                self.cache_dir = None
+
+    @staticmethod
+    def _compute_fingerprint(df: pd.DataFrame, columns: tuple) -> str:
+        """Huella del contenido (valores, índice y tipos) de las columnas de ``df``."""
+        data = df[list(columns)] if columns else df
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((len(data), [str(dtype) for dtype in data.dtypes])).encode("utf-8"))
+        digest.update(memoryview(pd.util.hash_pandas_object(data, index=True).to_numpy()))
+        return digest.hexdigest()
+
+    def fingerprint(self, df: pd.DataFrame, columns: Optional[list] = None) -> str:
+        """
+        Retorna la huella del contenido de ``columns`` (por defecto, todas) de ``df``.
+        """
+        columns = tuple(columns or ())
+        if self._fingerprints is None:
+            return self._compute_fingerprint(df, columns)
+        return self._fingerprints.get_or_compute(
+            df, "fingerprint", (columns,), {}, lambda: self._compute_fingerprint(df, columns)
+        )
+
+    def make_key(self, kind: str, df: pd.DataFrame, columns: list, params: dict) -> str:
+        """
+        Construye la clave de un gráfico.
+
+        Args:
+            kind (str): Tipo de gráfico (p. ej. 'histogram').
+            df (pd.DataFrame): Los datos que se dibujan.
+            columns (list): Columnas de ``df`` que usa el gráfico.
+            params (dict): Resto de parámetros que cambian la imagen (título, tema...).
+
+        Returns:
+            str: Clave hexadecimal.
+        """
+        description = repr(
+            (kind, [str(column) for column in columns], sorted(params.items(), key=str))
+        )
+        digest = hashlib.blake2b(description.encode("utf-8"), digest_size=16)
+        digest.update(self.fingerprint(df, columns).encode("ascii"))
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        """Ruta del archivo de una clave en la caché en disco."""
+        return os.path.join(self.cache_dir, f"{key}.png") if self.cache_dir else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna la imagen guardada para ``key``, o None si no está."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as file:
+                    image = file.read()
+                self._remember(key, image)
+                self.hits += 1
+                return image
+            except OSError as e:
+                print(f"PlotCache Error: No se pudo leer '{path}': {e}")
+        self.misses += 1
+        return None
+
+    def _remember(self, key: str, image: bytes):
+        """Guarda una imagen en memoria, descartando las menos usadas."""
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def put(self, key: str, image: bytes):
+        """Guarda una imagen en memoria y, si está activada, en disco."""
+        self._remember(key, image)
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            # Escritura atómica: otro proceso nunca lee un archivo a medias
+            temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(image)
+            os.replace(temporary_path, path)
+            self._prune_disk()
+        except OSError as e:
+            print(f"PlotCache Error: No se pudo guardar '{path}': {e}")
+
+    def _prune_disk(self):
+        """Elimina las imágenes más antiguas si se supera ``max_disk_entries``."""
+        entries = [
+            entry for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith(".png")
+        ]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def handle_dataset_change(self, change: dict):
+        """
+        Descarta las huellas de versiones anteriores de los datos. Se registra
+        con ``AppState.add_change_listener``; las imágenes se conservan, porque
+        la clave depende del contenido y no de la versión.
+        """
+        if self._fingerprints is not None:
+            self._fingerprints.invalidate()
+
+    def clear(self):
+        """Vacía la caché en memoria (la caché en disco se conserva)."""
+        with self._lock:
+            self._images.clear()
+        if self._fingerprints is not None:
+            self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._images)
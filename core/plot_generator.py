@@ -1,28 +1,142 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import io
 import base64
+import threading
 from typing import Optional
+from core.plot_cache import PlotCache
+
+# Matplotlib y Seaborn se importan con el primer gráfico (ver ``load_plotting_libraries``)
+plt = None
+sns = None
+LogNorm = None
+_plotting_lock = threading.Lock()
+
+# Estilo de Matplotlib y parámetros de apariencia de todos los gráficos
+PLOT_STYLE = "seaborn-v0_8-darkgrid"
+PLOT_RC_PARAMS = {
+    "figure.figsize": (10, 6),
+    "font.size": 12,
+    "axes.labelsize": 14,
+    "axes.titlesize": 16,
+    "xtick.labelsize": 10,
+    "ytick.labelsize": 10,
+    "legend.fontsize": 12,
+    "figure.titleweight": "bold",
+}
+
+# Resolución de las imágenes PNG
+PLOT_DPI = 100
+
+# Máximo de barras de un histograma
+HISTOGRAM_MAX_BINS = 100
+
+# Valores de la muestra aleatoria sobre la que se estima la curva KDE
+KDE_SAMPLE_SIZE = 10_000
+
+# Puntos en los que se evalúa la curva KDE
+KDE_GRID_POINTS = 200
+
+# A partir de este número de puntos, la dispersión se dibuja como densidad
+SCATTER_MAX_POINTS = 100_000
+
+# Celdas por eje de la rejilla de densidad
+SCATTER_DENSITY_BINS = 200
+
+# Celdas con como mucho este número de puntos se dibujan punto a punto,
+# para no ocultar los valores aislados (atípicos) en la densidad
+SCATTER_SPARSE_CELL_POINTS = 2
+
+# Máximo de puntos aislados dibujados sobre la densidad
+SCATTER_MAX_SPARSE_POINTS = 20_000
+
+
+def load_plotting_libraries():
+    """
+    Importa Matplotlib y Seaborn y aplica el estilo de los gráficos. Se llama
+    antes de dibujar el primer gráfico, de modo que arrancar la aplicación (o
+    servir una imagen desde la caché) no carga la pila de gráficos.
+    """
+    global plt, sns, LogNorm
+    if plt is not None:
+        return
+    with _plotting_lock:
+        if plt is not None:
+            return
+        import matplotlib.pyplot as pyplot
+        import seaborn
+        from matplotlib.colors import LogNorm as log_norm
+
+        # Configuración básica de Matplotlib para mejorar la apariencia
+        pyplot.style.use(PLOT_STYLE)
+        pyplot.rcParams.update(PLOT_RC_PARAMS)
+        sns, LogNorm = seaborn, log_norm
+        # Se asigna al final: indica que todo está listo para los demás hilos
+        plt = pyplot
 
 
 class PlotGenerator:
     """
     Clase encargada de generar diferentes tipos de gráficos
     a partir de un DataFrame de Pandas.
+
+    Con una ``PlotCache``, cada imagen se guarda por tipo de gráfico,
+    parámetros, tema y contenido de las columnas dibujadas: volver a pedir un
+    gráfico sin cambios no lo vuelve a renderizar. Crear el generador no
+    importa Matplotlib ni Seaborn; se cargan al dibujar el primer gráfico.
     """
     
-    def __init__(self):
-        # Configuración básica de Matplotlib para mejorar la apariencia
-        plt.style.use("seaborn-v0_8-darkgrid")
-        plt.rcParams["figure.figsize"] = (10, 6)
-        plt.rcParams["font.size"] = 12
-        plt.rcParams["axes.labelsize"] = 14
-        plt.rcParams["axes.titlesize"] = 16
-        plt.rcParams["xtick.labelsize"] = 10
-        plt.rcParams["ytick.labelsize"] = 10
-        plt.rcParams["legend.fontsize"] = 12
-        plt.rcParams["figure.titleweight"] = "bold"
+    def __init__(
+        self, cache: Optional[PlotCache] = None, scatter_max_points: int = SCATTER_MAX_POINTS
+    ):
+        """
+        Args:
+            cache (PlotCache, optional): Caché de imágenes renderizadas. None la desactiva.
+            scatter_max_points (int): A partir de este número de puntos, la
+                                      dispersión se dibuja como densidad.
+        """
+        self.cache = cache
+        self.scatter_max_points = scatter_max_points
+
+    @staticmethod
+    def get_theme() -> tuple:
+        """Retorna el estilo y los parámetros de apariencia (parte de la clave de caché)."""
+        return (PLOT_STYLE, sorted(PLOT_RC_PARAMS.items()), PLOT_DPI)
+
+    @staticmethod
+    def _figure_to_png(fig) -> bytes:
+        """Renderiza una figura de Matplotlib como PNG y la cierra."""
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight", dpi=PLOT_DPI)
+        plt.close(fig)
+        return buf.getvalue()
+
+    def _render(self, kind: str, df: pd.DataFrame, columns: list, params: dict, draw):
+        """
+        Retorna en base64 la imagen de un gráfico, desde la caché si ya se
+        dibujó con los mismos datos y parámetros.
+
+        Args:
+            kind (str): Tipo de gráfico.
+            df (pd.DataFrame): Los datos del gráfico.
+            columns (list): Columnas de ``df`` que usa (vacía: todas).
+            params (dict): Parámetros que cambian la imagen (título, etc.).
+            draw (callable): Función sin argumentos que crea y retorna la figura.
+
+        Returns:
+            str: Cadena base64 de la imagen PNG.
+        """
+        if self.cache is None:
+            load_plotting_libraries()
+            return base64.b64encode(self._figure_to_png(draw())).decode("utf-8")
+
+        key = self.cache.make_key(kind, df, columns, {**params, "theme": self.get_theme()})
+        image = self.cache.get(key)
+        if image is None:
+            load_plotting_libraries()
+            image = self._figure_to_png(draw())
+            self.cache.put(key, image)
+        return base64.b64encode(image).decode("utf-8")
 
     def _plot_to_base64(self, fig):
         """
@@ -35,12 +149,7 @@ class PlotGenerator:
         Returns:
             str: Una cadena base64 que representa la imagen PNG de la figura.
         """
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight", dpi=100) 
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode("utf-8")
-        plt.close(fig)
-        return img_base64
+        return base64.b64encode(self._figure_to_png(fig)).decode("utf-8")
 
     def generate_histogram(
         self, df: pd.DataFrame, column: str, title: Optional[str] = None
@@ -48,6 +157,10 @@ class PlotGenerator:
         """
         Genera un histograma para una columna numérica.
 
+        Las barras se cuentan con ``np.histogram`` sobre toda la columna y la
+        curva KDE se estima sobre una muestra de como mucho ``KDE_SAMPLE_SIZE``
+        valores (ver ``_compute_histogram``); Seaborn solo dibuja el resultado.
+
         Args:
             df (pd.DataFrame): El DataFrame.
             column (str): El nombre de la columna numérica.
@@ -67,14 +180,62 @@ class PlotGenerator:
             )
             return None
 
-        fig, ax = plt.subplots()
-        sns.histplot(
-            data=df, x=column, kde=True, ax=ax
-        )
-        ax.set_title(title or f"Histograma de {column}")
-        ax.set_xlabel(column)
-        ax.set_ylabel("Frecuencia")
-        return self._plot_to_base64(fig)
+        def draw():
+            histogram = self._compute_histogram(df[column])
+            fig, ax = plt.subplots()
+            edges = histogram["edges"]
+            bars = pd.DataFrame({"start": edges[:-1], "count": histogram["counts"]})
+            sns.histplot(data=bars, x="start", weights="count", bins=list(edges), ax=ax)
+            if histogram["kde_x"] is not None:
+                ax.plot(histogram["kde_x"], histogram["kde_y"], color=sns.color_palette()[0])
+            ax.set_title(title or f"Histograma de {column}")
+            ax.set_xlabel(column)
+            ax.set_ylabel("Frecuencia")
+            return fig
+
+        return self._render("histogram", df, [column], {"title": title}, draw)
+
+    @staticmethod
+    def _compute_histogram(series: pd.Series) -> dict:
+        """
+        Calcula las barras de un histograma y su curva KDE.
+
+        Los límites de las barras siguen la regla 'auto' de NumPy (con como
+        mucho ``HISTOGRAM_MAX_BINS`` barras) y el conteo es una pasada lineal de
+        ``np.histogram``. La KDE gaussiana (ancho de banda de Scott) se evalúa
+        sobre una muestra aleatoria acotada, de modo que su coste no depende
+        del número de filas, y se escala a la altura de las barras.
+
+        Returns:
+            dict: ``counts``, ``edges``, ``kde_x`` y ``kde_y`` (None si no hay
+                  al menos dos valores distintos) y ``num_values``.
+        """
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        values = values[np.isfinite(values)]
+        edges = np.histogram_bin_edges(values, bins="auto") if len(values) else np.array([0.0, 1.0])
+        if len(edges) > HISTOGRAM_MAX_BINS + 1:
+            edges = np.linspace(edges[0], edges[-1], HISTOGRAM_MAX_BINS + 1)
+        counts, edges = np.histogram(values, bins=edges)
+
+        kde_x = kde_y = None
+        sample = values
+        if len(sample) > KDE_SAMPLE_SIZE:
+            sample = np.random.default_rng(0).choice(values, KDE_SAMPLE_SIZE, replace=False)
+        deviation = sample.std(ddof=1) if len(sample) > 1 else 0.0
+        if deviation > 0:
+            bandwidth = deviation * len(sample) ** (-1 / 5)
+            kde_x = np.linspace(edges[0], edges[-1], KDE_GRID_POINTS)
+            distances = (kde_x[:, np.newaxis] - sample[np.newaxis, :]) / bandwidth
+            density = np.exp(-0.5 * np.square(distances)).mean(axis=1) / (bandwidth * np.sqrt(2 * np.pi))
+            # Densidad -> frecuencia: número de valores por ancho de barra
+            kde_y = density * len(values) * (edges[1] - edges[0])
+        return {
+            "counts": counts,
+            "edges": edges,
+            "kde_x": kde_x,
+            "kde_y": kde_y,
+            "num_values": len(values),
+        }
 
     def generate_scatterplot(
         self,
@@ -82,15 +243,22 @@ class PlotGenerator:
         x_column: str,
         y_column: str,
         title: Optional[str] = None,
+        aggregate: Optional[bool] = None,
     ):
         """
         Genera un diagrama de dispersión entre dos columnas numéricas.
 
+        Con muchos puntos se dibuja una rejilla de densidad (ver
+        ``_compute_scatter_density``), cuyo coste de dibujo no depende del
+        número de filas.
+
         Args:
             df (pd.DataFrame): El DataFrame.
             x_column (str): El nombre de la columna para el eje X.
             y_column (str): El nombre de la columna para el eje Y.
             title (str, optional): Título del gráfico. Por defecto, "Dispersión de [X] vs [Y]".
+            aggregate (bool, optional): Dibujar la densidad. Por defecto, solo a
+                                        partir de ``scatter_max_points`` puntos.
 
         Returns:
             str: Cadena base64 de la imagen del diagrama de dispersión, o None si hay un error.
@@ -113,12 +281,97 @@ class PlotGenerator:
             )
             return None
 
-        fig, ax = plt.subplots()
-        sns.scatterplot(x=df[x_column], y=df[y_column], ax=ax)
-        ax.set_title(title or f"Dispersión de {x_column} vs {y_column}")
-        ax.set_xlabel(x_column)
-        ax.set_ylabel(y_column)
-        return self._plot_to_base64(fig)
+        if aggregate is None:
+            aggregate = len(df) > self.scatter_max_points
+
+        def draw():
+            fig, ax = plt.subplots()
+            if aggregate:
+                density = self._compute_scatter_density(df[x_column], df[y_column])
+                self._draw_scatter_density(fig, ax, density)
+                ax.set_title(
+                    title
+                    or f"Dispersión de {x_column} vs {y_column} (densidad de {density['num_points']:,} puntos)"
+                )
+            else:
+                sns.scatterplot(x=df[x_column], y=df[y_column], ax=ax)
+                ax.set_title(title or f"Dispersión de {x_column} vs {y_column}")
+            ax.set_xlabel(x_column)
+            ax.set_ylabel(y_column)
+            return fig
+
+        return self._render(
+            "scatterplot", df, [x_column, y_column], {"title": title, "aggregate": aggregate}, draw
+        )
+
+    @staticmethod
+    def _compute_scatter_density(
+        x: pd.Series, y: pd.Series, bins: int = SCATTER_DENSITY_BINS
+    ) -> dict:
+        """
+        Cuenta los puntos de cada celda de una rejilla ``bins`` × ``bins`` con
+        operaciones vectorizadas (índice de celda y ``np.bincount``), en una
+        pasada lineal sobre los datos. Los puntos de celdas casi vacías se
+        conservan para dibujarlos uno a uno.
+
+        Returns:
+            dict: ``counts`` (matriz bins × bins), ``x_edges``, ``y_edges``,
+                  ``sparse_x``, ``sparse_y`` y ``num_points``.
+        """
+        x_values = x.to_numpy(dtype="float64", na_value=np.nan)
+        y_values = y.to_numpy(dtype="float64", na_value=np.nan)
+        valid = np.isfinite(x_values) & np.isfinite(y_values)
+        x_values, y_values = x_values[valid], y_values[valid]
+        if not len(x_values):
+            x_values = y_values = np.zeros(0)
+
+        edges, cells = [], []
+        for values in (x_values, y_values):
+            low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+            edges.append(np.linspace(low, high, bins + 1))
+            cell = ((values - low) * (bins / (high - low))).astype(np.int64)
+            # El máximo cae en la última celda
+            cells.append(np.minimum(cell, bins - 1))
+
+        flat_cells = cells[0] * bins + cells[1]
+        counts = np.bincount(flat_cells, minlength=bins * bins)
+        sparse = counts[flat_cells] <= SCATTER_SPARSE_CELL_POINTS
+        sparse_positions = np.flatnonzero(sparse)
+        if len(sparse_positions) > SCATTER_MAX_SPARSE_POINTS:
+            sparse_positions = np.random.default_rng(0).choice(
+                sparse_positions, SCATTER_MAX_SPARSE_POINTS, replace=False
+            )
+        return {
+            "counts": counts.reshape(bins, bins),
+            "x_edges": edges[0],
+            "y_edges": edges[1],
+            "sparse_x": x_values[sparse_positions],
+            "sparse_y": y_values[sparse_positions],
+            "num_points": len(x_values),
+        }
+
+    @staticmethod
+    def _draw_scatter_density(fig, ax, density: dict):
+        """Dibuja la rejilla de densidad (escala logarítmica) y los puntos aislados."""
+        counts = density["counts"].astype("float64")
+        dense = np.where(counts > SCATTER_SPARSE_CELL_POINTS, counts, np.nan)
+        if np.isfinite(dense).any():
+            mesh = ax.pcolormesh(
+                density["x_edges"],
+                density["y_edges"],
+                dense.T,
+                norm=LogNorm(vmin=np.nanmin(dense), vmax=max(np.nanmax(dense), np.nanmin(dense) + 1)),
+                cmap="viridis",
+                shading="flat",
+            )
+            fig.colorbar(mesh, ax=ax, label="Puntos por celda")
+        ax.scatter(density["sparse_x"], density["sparse_y"], s=4, color="tab:red", alpha=0.6, linewidths=0)
+        # Margen para que los puntos de los extremos no queden cortados
+        for set_limits, edges in ((ax.set_xlim, density["x_edges"]), (ax.set_ylim, density["y_edges"])):
+            margin = (edges[-1] - edges[0]) * 0.02
+            set_limits(edges[0] - margin, edges[-1] + margin)
 
     def generate_boxplot(
         self,
@@ -156,16 +409,20 @@ class PlotGenerator:
             )
             return None
 
-        fig, ax = plt.subplots()
-        if by_column:
-            sns.boxplot(x=df[by_column], y=df[column], ax=ax)
-            ax.set_title(title or f"Diagrama de Caja de {column} por {by_column}")
-            ax.set_xlabel(by_column)
-        else:
-            sns.boxplot(y=df[column], ax=ax)
-            ax.set_title(title or f"Diagrama de Caja de {column}")
-        ax.set_ylabel(column)
-        return self._plot_to_base64(fig)
+        def draw():
+            fig, ax = plt.subplots()
+            if by_column:
+                sns.boxplot(x=df[by_column], y=df[column], ax=ax)
+                ax.set_title(title or f"Diagrama de Caja de {column} por {by_column}")
+                ax.set_xlabel(by_column)
+            else:
+                sns.boxplot(y=df[column], ax=ax)
+                ax.set_title(title or f"Diagrama de Caja de {column}")
+            ax.set_ylabel(column)
+            return fig
+
+        columns = [column, by_column] if by_column else [column]
+        return self._render("boxplot", df, columns, {"title": title}, draw)
 
     def generate_countplot(
         self, df: pd.DataFrame, column: str, title: Optional[str] = None
@@ -187,9 +444,56 @@ class PlotGenerator:
             )
             return None
 
-        fig, ax = plt.subplots()
-        sns.countplot(y=df[column], order=df[column].value_counts().index, ax=ax)
-        ax.set_title(title or f"Conteo de {column}")
-        ax.set_xlabel("Conteo")
-        ax.set_ylabel(column)
-        return self._plot_to_base64(fig)
\ No newline at end of file
+        def draw():
+            fig, ax = plt.subplots()
+            sns.countplot(y=df[column], order=df[column].value_counts().index, ax=ax)
+            ax.set_title(title or f"Conteo de {column}")
+            ax.set_xlabel("Conteo")
+            ax.set_ylabel(column)
+            return fig
+
+        return self._render("countplot", df, [column], {"title": title}, draw)
+
+    def generate_heatmap(
+        self, matrix: pd.DataFrame, title: Optional[str] = None, annotate: Optional[bool] = None
+    ):
+        """
+        Genera un mapa de calor de una matriz cuadrada (p. ej. de correlación).
+
+        Args:
+            matrix (pd.DataFrame): La matriz a representar.
+            title (str, optional): Título del gráfico. Por defecto, "Matriz de correlación".
+            annotate (bool, optional): Escribir el valor en cada celda. Por defecto,
+                                       solo si hay 15 columnas o menos.
+
+        Returns:
+            str: Cadena base64 de la imagen del mapa de calor, o None si hay un error.
+        """
+        if matrix is None or matrix.empty:
+            print("PlotGenerator Error: Matriz vacía para el mapa de calor.")
+            return None
+
+        size = len(matrix.columns)
+        if annotate is None:
+            annotate = size <= 15
+        # Escala fija [-1, 1] para correlaciones; libre para otras matrices (p. ej. covarianzas)
+        is_correlation = bool(matrix.abs().max().max() <= 1)
+        side = min(4 + 0.5 * size, 20)
+
+        def draw():
+            fig, ax = plt.subplots(figsize=(side, side * 0.8))
+            sns.heatmap(
+                matrix,
+                vmin=-1 if is_correlation else None,
+                vmax=1 if is_correlation else None,
+                center=0,
+                cmap="coolwarm",
+                annot=annotate,
+                fmt=".2f",
+                square=True,
+                ax=ax,
+            )
+            ax.set_title(title or "Matriz de correlación")
+            return fig
+
+        return self._render("heatmap", matrix, [], {"title": title, "annotate": annotate}, draw)
@@ -0,0 +1,233 @@
+import asyncio
+import base64
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional
+import pandas as pd
+from core.plot_cache import PlotCache
+
+try:
+    import pyarrow as pa
+except ImportError:  # Sin PyArrow los datos se envían serializados con pickle
+    pa = None
+
+
+# Métodos de PlotGenerator que se pueden ejecutar en el servicio
+RENDER_METHODS = (
+    "generate_histogram",
+    "generate_scatterplot",
+    "generate_boxplot",
+    "generate_countplot",
+    "generate_heatmap",
+)
+
+# El bloque de memoria compartida pertenece al proceso principal, que lo elimina.
+# Desde Python 3.13 el trabajador lo abre sin registrarlo en el resource_tracker;
+# antes, el trabajador (creado con 'spawn') comparte el resource_tracker del
+# proceso principal y su registro coincide con el de este, que se borra al
+# eliminar el bloque: quitarlo desde el trabajador borraría el del principal.
+ATTACH_OPTIONS = {"track": False} if sys.version_info >= (3, 13) else {}
+
+# Generador de gráficos de cada proceso trabajador (se crea al iniciarlo)
+_worker_generator = None
+
+
+def _initialize_worker():
+    """Configura Matplotlib sin interfaz (Agg) y crea el generador del proceso."""
+    global _worker_generator
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from core.plot_generator import PlotGenerator, load_plotting_libraries
+
+    # El proceso carga la pila de gráficos al iniciarse, no con el primer gráfico
+    load_plotting_libraries()
+    _worker_generator = PlotGenerator()
+
+
+def _copy_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """Copia los códigos y categorías de las columnas categóricas, que ``to_pandas`` no copia."""
+    for position, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, pd.CategoricalDtype):
+            column = df.iloc[:, position].array
+            categories = pd.CategoricalDtype(column.categories.copy(deep=True), dtype.ordered)
+            df.isetitem(position, pd.Categorical.from_codes(column.codes.copy(), dtype=categories))
+    return df
+
+
+def _load_data(payload: tuple) -> pd.DataFrame:
+    """Reconstruye en el proceso trabajador el DataFrame enviado por ``_share_data``."""
+    kind, value = payload
+    if kind == "pickle":
+        return pickle.loads(value)
+    block = shared_memory.SharedMemory(name=value, **ATTACH_OPTIONS)
+    try:
+        # Arrow lee la memoria compartida sin copiarla; ``to_pandas`` crea los
+        # arrays de Pandas salvo los de las categorías, que se copian aparte
+        buffer = pa.py_buffer(block.buf)
+        with pa.ipc.open_stream(buffer) as reader:
+            table = reader.read_all()
+        df = _copy_categoricals(table.to_pandas())
+        # Sin referencias al búfer exportado, el bloque se puede cerrar
+        del reader, table, buffer
+        return df
+    finally:
+        block.close()
+
+
+def _render_in_worker(method: str, payload: tuple, args: tuple, kwargs: dict):
+    """Ejecuta un método de ``PlotGenerator`` en el proceso trabajador."""
+    return getattr(_worker_generator, method)(_load_data(payload), *args, **kwargs)
+
+
+class PlotRenderService:
+    """
+    Servicio de renderizado de gráficos en un conjunto de procesos.
+
+    Cada proceso ejecuta Matplotlib con el backend Agg y su propio
+    ``PlotGenerator``, de modo que los gráficos no bloquean la interfaz y
+    varios se dibujan a la vez. A cada proceso solo se envían las columnas que
+    usa el gráfico, en formato Arrow a través de memoria compartida (o con
+    pickle si PyArrow no está disponible). Las imágenes se guardan en la
+    ``PlotCache`` del proceso principal.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache: Optional[PlotCache] = None):
+        """
+        Args:
+            max_workers (int, optional): Procesos de renderizado. Por defecto,
+                                         uno por núcleo hasta 4.
+            cache (PlotCache, optional): Caché de imágenes renderizadas.
+        """
+        self.max_workers = max(1, int(max_workers or min(4, os.cpu_count() or 1)))
+        self.cache = cache
+        # El conjunto de procesos se crea con el primer gráfico
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el conjunto de procesos la primera vez que se necesita."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # 'spawn' evita heredar hilos y estado de Matplotlib del proceso principal
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+            )
+        return self._executor
+
+    @staticmethod
+    def _share_data(df: pd.DataFrame) -> tuple:
+        """
+        Prepara ``df`` para enviarlo a un proceso: en Arrow sobre memoria
+        compartida o, si no es posible, serializado con pickle.
+
+        Returns:
+            tuple: (tipo, valor) para ``_load_data`` y el bloque de memoria
+                   compartida (o None), que el llamador libera.
+        """
+        if pa is not None:
+            try:
+                table = pa.Table.from_pandas(df)
+                # Se mide el tamaño del stream sin escribirlo para crear el bloque
+                # y escribir directamente en él, sin un búfer intermedio
+                sink = pa.MockOutputStream()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                size = sink.size()
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                print(f"PlotRenderService: Datos no convertibles a Arrow, se usa pickle: {e}")
+            else:
+                block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                buffer = pa.py_buffer(block.buf)
+                with pa.ipc.new_stream(pa.FixedSizeBufferWriter(buffer), table.schema) as writer:
+                    writer.write_table(table)
+                # Sin referencias al búfer exportado, el bloque se puede cerrar
+                del writer, buffer
+                return ("arrow", block.name), block
+        return ("pickle", pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)), None
+
+    def submit(self, method: str, df: pd.DataFrame, columns: Optional[list], *args, **kwargs) -> Future:
+        """
+        Envía un gráfico a renderizar y retorna un ``Future`` con la imagen PNG
+        en base64 (o None si el gráfico no se pudo generar).
+
+        Args:
+            method (str): Método de ``PlotGenerator`` (p. ej. 'generate_histogram').
+            df (pd.DataFrame): Los datos del gráfico.
+            columns (list, optional): Columnas de ``df`` que usa el gráfico; solo
+                                      se envían esas. None envía todas.
+            *args, **kwargs: Resto de argumentos del método.
+
+        Raises:
+            ValueError: Si el método no está soportado.
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(
+                f"PlotRenderService Error: Método no soportado: '{method}'. "
+                f"Opciones: {', '.join(RENDER_METHODS)}."
+            )
+        columns = list(dict.fromkeys(columns)) if columns is not None else []
+        result: Future = Future()
+
+        key = None
+        if self.cache is not None:
+            from core.plot_generator import PlotGenerator
+
+            key = self.cache.make_key(
+                f"service:{method}",
+                df,
+                columns,
+                {"args": args, "kwargs": sorted(kwargs.items()), "theme": PlotGenerator.get_theme()},
+            )
+            image = self.cache.get(key)
+            if image is not None:
+                result.set_result(base64.b64encode(image).decode("utf-8"))
+                return result
+
+        data = df[columns] if columns else df
+        payload, block = self._share_data(data)
+        task = self._get_executor().submit(_render_in_worker, method, payload, args, kwargs)
+
+        def finish(task: Future):
+            if block is not None:
+                block.close()
+                block.unlink()
+            if task.cancelled():
+                result.cancel()
+                return
+            error = task.exception()
+            if error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    # Un proceso terminó de forma inesperada: se recrea en el próximo gráfico
+                    self._executor = None
+                result.set_exception(error)
+                return
+            image_base64 = task.result()
+            if image_base64 and key is not None:
+                self.cache.put(key, base64.b64decode(image_base64))
+            result.set_result(image_base64)
+
+        task.add_done_callback(finish)
+        return result
+
+    async def render(self, method: str, df: pd.DataFrame, columns: Optional[list], *args, **kwargs):
+        """
+        Versión asíncrona de ``submit``: espera la imagen sin bloquear el bucle
+        de eventos, de modo que se pueden lanzar varios gráficos con ``asyncio.gather``.
+
+        Returns:
+            str: Imagen PNG en base64, o None si el gráfico no se pudo generar.
+        """
+        return await asyncio.wrap_future(self.submit(method, df, columns, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        """Detiene los procesos de renderizado."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
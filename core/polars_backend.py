@@ -0,0 +1,235 @@
+import glob
+import importlib.util
+import os
+import threading
+import pandas as pd
+import pyarrow as pa
+from typing import Optional
+
+# Polars es opcional y se importa al crear el primer PolarsBackend (ver
+# ``load_polars``), de modo que arrancar con DuckDB o Pandas no lo carga
+pl = None
+_polars_lock = threading.Lock()
+
+
+# Lectores de Polars por extensión de archivo (perezosos salvo JSON, que Polars
+# solo lee completo)
+POLARS_SCANNERS = {
+    ".parquet": "scan_parquet",
+    ".pq": "scan_parquet",
+    ".csv": "scan_csv",
+    ".tsv": "scan_csv",
+    ".txt": "scan_csv",
+    ".json": "read_json",
+    ".ndjson": "scan_ndjson",
+    ".jsonl": "scan_ndjson",
+}
+
+# Filas del resumen descriptivo, en el mismo orden que pandas.describe()
+DESCRIBE_STATISTICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def load_polars():
+    """
+    Importa Polars la primera vez que se necesita.
+
+    Raises:
+        ImportError: Si Polars no está instalado.
+    """
+    global pl
+    if pl is not None:
+        return
+    with _polars_lock:
+        if pl is None:
+            import polars
+
+            pl = polars
+
+
+class PolarsBackend:
+    """
+    Backend de ejecución basado en Polars (LazyFrames, multihilo).
+
+    Sirve a ``QueryEngine`` (SQL mediante ``pl.SQLContext``) y a ``DataAnalyzer``
+    (estadísticas calculadas con consultas perezosas). Las conversiones desde y
+    hacia Pandas pasan por Arrow, sin copiar las columnas que lo permiten.
+    Es compatible con Polars 0.18 y posteriores.
+    """
+
+    def __init__(self):
+        if not self.is_available():
+            raise ImportError(
+                "PolarsBackend Error: Polars no está instalado (pip install polars)."
+            )
+        load_polars()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Indica si Polars está instalado (sin importarlo)."""
+        return pl is not None or importlib.util.find_spec("polars") is not None
+
+    @staticmethod
+    def to_polars(df: pd.DataFrame):
+        """Convierte un DataFrame de Pandas a Polars a través de Arrow."""
+        load_polars()
+        # preserve_index=False: el índice de Pandas no es una columna de datos
+        return pl.from_arrow(pa.Table.from_pandas(df, preserve_index=False))
+
+    @staticmethod
+    def to_pandas(frame) -> pd.DataFrame:
+        """Convierte un DataFrame (o LazyFrame) de Polars a Pandas a través de Arrow."""
+        if isinstance(frame, pl.LazyFrame):
+            frame = frame.collect()
+        return frame.to_arrow().to_pandas()
+
+    def to_lazy(self, df):
+        """Retorna un LazyFrame a partir de un DataFrame de Pandas o Polars."""
+        if isinstance(df, pl.LazyFrame):
+            return df
+        if isinstance(df, pd.DataFrame):
+            df = self.to_polars(df)
+        return df.lazy()
+
+    @staticmethod
+    def scan_file(path: str):
+        """
+        Retorna un LazyFrame que lee el archivo (o patrón glob) bajo demanda.
+
+        Raises:
+            ValueError: Si la extensión no es soportada.
+        """
+        load_polars()
+        extension = os.path.splitext(path)[1].lower()
+        scanner = POLARS_SCANNERS.get(extension)
+        if scanner is None:
+            raise ValueError(
+                f"PolarsBackend Error: Formato de archivo no soportado: {extension}"
+            )
+        if extension == ".tsv":
+            return pl.scan_csv(path, separator="\t")
+        if extension == ".json":
+            return PolarsBackend._read_json(path)
+        return getattr(pl, scanner)(path)
+
+    @staticmethod
+    def _read_json(path: str):
+        """
+        Lee uno o varios archivos JSON (patrón glob) como LazyFrame. Como
+        ``read_json_auto`` de DuckDB, admite un array de objetos o un objeto
+        por línea (NDJSON).
+        """
+        paths = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+        if not paths:
+            raise FileNotFoundError(f"PolarsBackend Error: No hay archivos que coincidan con '{path}'.")
+        frames = []
+        for file_path in paths:
+            try:
+                frames.append(pl.read_json(file_path).lazy())
+            except pl.exceptions.ComputeError:
+                # No es un array JSON: se lee como un objeto por línea
+                frames.append(pl.scan_ndjson(file_path))
+        return frames[0] if len(frames) == 1 else pl.concat(frames, how="diagonal_relaxed")
+
+    @staticmethod
+    def _group_by(lazy_frame, keys):
+        """``group_by`` en Polars >= 0.19, ``groupby`` en versiones anteriores."""
+        method = getattr(lazy_frame, "group_by", None) or getattr(lazy_frame, "groupby")
+        return method(keys)
+
+    @staticmethod
+    def _row_count():
+        """Expresión de conteo de filas: ``pl.len()`` o ``pl.count()`` en Polars < 0.20."""
+        return pl.len() if hasattr(pl, "len") else pl.count()
+
+    def execute_sql(self, tables: dict, query_string: str, file_sources=None) -> pa.Table:
+        """
+        Ejecuta una consulta SQL con ``pl.SQLContext`` sobre LazyFrames.
+
+        Args:
+            tables (dict): Tablas a registrar (nombre -> DataFrame de Pandas o Polars).
+            query_string (str): La cadena de consulta SQL.
+            file_sources (dict, optional): Archivos a registrar (nombre -> ruta o patrón).
+
+        Returns:
+            pa.Table: El resultado en formato Arrow.
+        """
+        context = pl.SQLContext()
+        for name, path in (file_sources or {}).items():
+            if name not in tables:
+                context.register(name, self.scan_file(path))
+        for name, table in tables.items():
+            context.register(name, self.to_lazy(table))
+        result = context.execute(query_string.strip().rstrip(";"), eager=False).collect()
+        return result.to_arrow()
+
+    def get_dataframe_info(self, df) -> dict:
+        """Equivalente de ``DataAnalyzer.get_dataframe_info`` en una sola consulta perezosa."""
+        lazy_frame = self.to_lazy(df)
+        columns = list(df.columns)
+        counts = lazy_frame.select(
+            [pl.col(column).null_count() for column in columns]
+            + [self._row_count().alias("__num_rows")]
+        ).collect().row(0)
+        return {
+            "num_rows": int(counts[-1] or 0),
+            "num_cols": len(columns),
+            "columns": columns,
+            "dtypes": df.dtypes.apply(lambda x: str(x)).to_dict()
+            if isinstance(df, pd.DataFrame)
+            else {column: str(dtype) for column, dtype in zip(columns, df.dtypes)},
+            "missing_values": {
+                column: int(count) for column, count in zip(columns, counts[:-1])
+            },
+        }
+
+    def get_descriptive_statistics(self, df, columns: list) -> pd.DataFrame:
+        """
+        Equivalente de ``describe()`` para las columnas numéricas indicadas,
+        calculado en una sola consulta perezosa.
+
+        Returns:
+            pd.DataFrame: Mismo formato que ``pandas.DataFrame.describe()``.
+        """
+        # Solo se convierten a Arrow las columnas que se van a resumir
+        lazy_frame = self.to_lazy(df[columns] if isinstance(df, pd.DataFrame) else df)
+        expressions = []
+        for position, column in enumerate(columns):
+            values = pl.col(column).cast(pl.Float64)
+            expressions += [
+                pl.col(column).count().cast(pl.Float64).alias(f"__{position}_count"),
+                values.mean().alias(f"__{position}_mean"),
+                values.std().alias(f"__{position}_std"),
+                values.min().alias(f"__{position}_min"),
+                values.quantile(0.25, interpolation="linear").alias(f"__{position}_25%"),
+                values.quantile(0.5, interpolation="linear").alias(f"__{position}_50%"),
+                values.quantile(0.75, interpolation="linear").alias(f"__{position}_75%"),
+                values.max().alias(f"__{position}_max"),
+            ]
+        row = lazy_frame.select(expressions).collect().row(0, named=True)
+        return pd.DataFrame(
+            {
+                column: [row[f"__{position}_{stat}"] for stat in DESCRIBE_STATISTICS]
+                for position, column in enumerate(columns)
+            },
+            index=DESCRIBE_STATISTICS,
+        )
+
+    def get_unique_values(self, df, column_name: str, top_n: Optional[int] = 10) -> pd.Series:
+        """
+        Equivalente de ``value_counts().head(top_n)`` calculado con un group-by perezoso.
+        """
+        source = df[[column_name]] if isinstance(df, pd.DataFrame) else df
+        lazy_frame = self.to_lazy(source).filter(pl.col(column_name).is_not_null())
+        counts = (
+            self._group_by(lazy_frame, column_name)
+            .agg(self._row_count().alias("count"))
+            .sort("count", descending=True)
+        )
+        if top_n:
+            counts = counts.limit(top_n)
+        result = counts.collect()
+        return pd.Series(
+            result.get_column("count").to_list(),
+            index=pd.Index(result.get_column(column_name).to_list(), name=column_name),
+            name="count",
+        )
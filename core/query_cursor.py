@@ -0,0 +1,190 @@
+import os
+import pandas as pd
+import pyarrow as pa
+from typing import Optional
+
+
+class QueryCursor:
+    """
+    Cursor paginado sobre el resultado de una consulta SQL de DuckDB.
+
+    En lugar de materializar todo el resultado con ``fetchdf()``, lee lotes
+    Arrow (RecordBatch) de forma perezosa y solo convierte a Pandas la página
+    que se solicita. Las páginas ya leídas se conservan para poder volver atrás
+    sin reejecutar la consulta.
+
+    La consulta se ejecuta una sola vez: el total de filas no se cuenta de
+    antemano (un COUNT(*) ejecutaría la consulta completa antes de la primera
+    página), sino que se conoce al agotar el lector. Hasta entonces
+    ``total_rows`` es None.
+    """
+
+    def __init__(
+        self,
+        connection,
+        query_string: str,
+        page_size: int = 100,
+        on_close=None,
+        cached_result: Optional[tuple] = None,
+    ):
+        """
+        Args:
+            connection: Conexión (o cursor) de DuckDB donde ya están registradas
+                        las tablas que usa la consulta. El cursor se adueña de ella
+                        y la cierra en ``close()``.
+            query_string (str): La cadena de consulta SQL.
+            page_size (int): Número de filas por página.
+            on_close (callable, optional): Función que recibe el cursor al cerrarse,
+                                           p. ej. para registrar sus estadísticas.
+            cached_result (tuple, optional): (esquema, páginas) de un resultado ya
+                leído por completo (ver ``get_result_pages``). Si se indica, la
+                consulta no se ejecuta y el cursor sirve esas páginas.
+        """
+        if page_size <= 0:
+            raise ValueError("QueryCursor Error: page_size debe ser mayor que cero.")
+
+        self._connection = connection
+        self.query_string = query_string
+        self.page_size = page_size
+        self._pages: list[pd.DataFrame] = []
+        self._pending: Optional[pa.Table] = None
+        self._exhausted = False
+        self._closed = False
+        self.on_close = on_close
+        # Estadísticas: bytes Arrow traídos de DuckDB, 1 si el resultado se reutilizó
+        # de una ejecución anterior y segundos leyendo páginas tras la primera
+        # (ver ``QueryEngine.fetch_page``)
+        self.bytes_materialized = 0
+        self.cache_hits = 0
+        self.page_fetch_time = 0.0
+        # Clave con la que el motor guarda el resultado para reutilizarlo, si procede
+        self.reuse_key = None
+        # Archivo donde DuckDB escribe el perfil de la ejecución, si se perfila
+        # (ver ``QueryEngine.get_query_profile``); se borra al cerrar el cursor
+        self.profile_path: Optional[str] = None
+        # Se conoce al agotar el lector (o si quien crea el cursor lo indica)
+        self.total_rows: Optional[int] = None
+
+        if cached_result is not None:
+            self.schema, pages = cached_result
+            # Copias superficiales: quien lee una página no altera el resultado guardado
+            self._pages = [page.copy(deep=False) for page in pages]
+            self._reader = None
+            self._exhausted = True
+            self.total_rows = sum(len(page) for page in self._pages)
+            self.cache_hits = 1
+        else:
+            self._reader = connection.execute(query_string).fetch_record_batch(page_size)
+            self.schema = self._reader.schema
+        self.columns = self.schema.names
+
+    @property
+    def connection(self):
+        """Conexión de DuckDB que lee el resultado (p. ej. para interrumpirla)."""
+        return self._connection
+
+    def _read_next_page(self) -> Optional[pd.DataFrame]:
+        """Lee del lector Arrow las filas necesarias para completar una página."""
+        tables = [self._pending] if self._pending is not None else []
+        rows = self._pending.num_rows if self._pending is not None else 0
+        self._pending = None
+
+        while rows < self.page_size and not self._exhausted:
+            try:
+                batch = self._reader.read_next_batch()
+            except StopIteration:
+                self._exhausted = True
+                break
+            tables.append(pa.Table.from_batches([batch], schema=self.schema))
+            rows += batch.num_rows
+
+        if rows == 0:
+            if self.total_rows is None:
+                self.total_rows = sum(len(p) for p in self._pages)
+            return None
+
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        if table.num_rows > self.page_size:
+            self._pending = table.slice(self.page_size)
+            table = table.slice(0, self.page_size)
+
+        self.bytes_materialized += table.nbytes
+        page = table.to_pandas()
+        page.index = pd.RangeIndex(
+            len(self._pages) * self.page_size,
+            len(self._pages) * self.page_size + len(page),
+        )
+        self._pages.append(page)
+
+        if self._exhausted and self._pending is None and self.total_rows is None:
+            self.total_rows = sum(len(p) for p in self._pages)
+        return page
+
+    def fetch_page(self, page_number: int) -> pd.DataFrame:
+        """
+        Retorna la página solicitada (base 0) como DataFrame de Pandas.
+        Solo lee del resultado las páginas que aún no se hayan leído.
+
+        Returns:
+            pd.DataFrame: Las filas de la página, o un DataFrame vacío con las
+                          columnas del resultado si la página está fuera de rango.
+        """
+        if self._closed:
+            raise ValueError("QueryCursor Error: El cursor ya está cerrado.")
+        if page_number < 0:
+            raise ValueError("QueryCursor Error: El número de página no puede ser negativo.")
+
+        while len(self._pages) <= page_number:
+            if self._read_next_page() is None:
+                return pd.DataFrame(columns=self.columns)
+        return self._pages[page_number]
+
+    def is_empty(self) -> bool:
+        """Indica si el resultado no tiene filas (lee la primera página si hace falta)."""
+        return self.fetch_page(0).empty
+
+    def get_result_pages(self) -> Optional[list]:
+        """
+        Retorna todas las páginas si el resultado ya se leyó por completo
+        (y el cursor sigue abierto), o None en caso contrario.
+        """
+        if self._closed or not self._exhausted or self._pending is not None:
+            return None
+        return list(self._pages)
+
+    def get_page_count(self) -> Optional[int]:
+        """Retorna el número total de páginas, o None si aún no se conoce."""
+        if self.total_rows is None:
+            return None
+        return max(1, -(-self.total_rows // self.page_size))
+
+    def has_page(self, page_number: int) -> bool:
+        """Indica si existe la página solicitada, leyéndola si es necesario."""
+        if page_number < 0:
+            return False
+        page_count = self.get_page_count()
+        if page_count is not None:
+            return page_number < page_count
+        return not self.fetch_page(page_number).empty
+
+    def close(self):
+        """Libera el lector Arrow y la conexión asociada."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.on_close is not None:
+            try:
+                self.on_close(self)
+            except Exception as e:
+                print(f"QueryCursor Error: Error en on_close: {e}")
+        self._pages.clear()
+        self._pending = None
+        try:
+            self._connection.close()
+        except Exception as e:
+            print(f"QueryCursor Error: Error al cerrar la conexión: {e}")
+        if self.profile_path and os.path.exists(self.profile_path):
+            try:
+                os.remove(self.profile_path)
+            except OSError as e:
+                print(f"QueryCursor Error: No se pudo borrar el perfil: {e}")
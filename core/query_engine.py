@@ -1,20 +1,331 @@
+import asyncio
+import glob
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import weakref
 import pandas as pd
 import duckdb
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional
+from core.aggregate_view import AggregateView
+from core.polars_backend import PolarsBackend
+from core.query_cursor import QueryCursor
+from core.query_history import QueryHistory
+
+
+# Lectores nativos de DuckDB por extensión de archivo
+FILE_READERS = {
+    ".parquet": "read_parquet",
+    ".pq": "read_parquet",
+    ".csv": "read_csv_auto",
+    ".tsv": "read_csv_auto",
+    ".txt": "read_csv_auto",
+    ".json": "read_json_auto",
+    ".ndjson": "read_json_auto",
+    ".jsonl": "read_json_auto",
+}
+
+
+# Backends de ejecución disponibles para las consultas SQL
+QUERY_BACKENDS = ("duckdb", "polars")
+# Intervalo (s) para reenviar una interrupción hasta que la consulta se detiene
+INTERRUPT_RETRY_SECONDS = 0.05
+
+# Filas máximas de un resultado que se guarda para reutilizarlo
+REUSE_MAX_ROWS = 10_000
+# Solo se reutilizan consultas de lectura sin funciones volátiles
+REUSABLE_QUERY = re.compile(r"^\s*(select|with|from)\b", re.IGNORECASE)
+VOLATILE_FUNCTIONS = re.compile(
+    r"\b(random|uuid|gen_random_uuid|now|today|current_date|current_time|current_timestamp|"
+    r"get_current_time|get_current_timestamp|nextval|currval|setseed)\b",
+    re.IGNORECASE,
+)
+
+
+class QueryCancelledError(Exception):
+    """Se lanza cuando una consulta en ejecución es cancelada por el usuario."""
+
+
+class _PolarsQuery:
+    """
+    Consulta de Polars en curso, registrada como las de DuckDB para que
+    ``cancel_running_queries`` la alcance. Polars no permite interrumpir una
+    consulta: ``interrupt`` solo indica que se deje de esperarla.
+    """
+
+    def __init__(self):
+        self.interrupted = threading.Event()
+
+    def interrupt(self):
+        self.interrupted.set()
+
+    def close(self):
+        pass
 
 
 class QueryEngine:
     """
     Clase encargada de ejecutar consultas SQL sobre un DataFrame de Pandas
-    utilizando DuckDB.
+    utilizando DuckDB. El DataFrame principal se expone como 'my_table' y se
+    pueden registrar otros DataFrames por nombre para cruzarlos entre sí.
+
+    Por defecto la base de datos vive en memoria. Si se indica un archivo en
+    ``database``, DuckDB puede volcar a disco los resultados intermedios y las
+    tablas materializadas persisten entre sesiones.
+
+    Además de la API bloqueante ofrece una API asíncrona (``await engine.query(...)``)
+    para los manejadores async de Flet: el trabajo de DuckDB corre en un pool
+    de hilos acotado, con un cursor propio por tarea sobre la conexión compartida.
+
+    Con ``backend="polars"`` las consultas se ejecutan con ``pl.SQLContext`` sobre
+    LazyFrames; DuckDB solo se usa entonces para paginar el resultado Arrow.
     """
-    
-    def execute_query_on_dataframe(self, df: pd.DataFrame, query_string: str):
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        default_timeout: Optional[float] = 60.0,
+        max_concurrent_queries: int = 4,
+        database: str = ":memory:",
+        memory_limit: Optional[str] = None,
+        threads: Optional[int] = None,
+        temp_directory: Optional[str] = None,
+        history: Optional[QueryHistory] = None,
+        backend: str = "duckdb",
+        reuse_results: int = 16,
+    ):
+        """
+        Args:
+            page_size (int): Filas por página de los cursores de resultados.
+            default_timeout (float, optional): Tiempo límite por defecto (s).
+            max_concurrent_queries (int): Consultas simultáneas como máximo.
+            database (str): ':memory:' o la ruta a un archivo DuckDB local.
+            memory_limit (str, optional): Límite de memoria de DuckDB (p. ej. '4GB').
+            threads (int, optional): Hilos que DuckDB puede usar por consulta.
+            temp_directory (str, optional): Carpeta para volcar a disco
+                                            los datos que no caben en memoria.
+            history (QueryHistory, optional): Historial donde registrar cada consulta.
+            backend (str): 'duckdb' (por defecto) o 'polars'.
+            reuse_results (int): Resultados leídos por completo que se guardan para
+                servir sin ejecutar la misma consulta sobre la misma versión de
+                los datos (ver ``_get_reuse_key``). 0 lo desactiva.
+
+        Raises:
+            ValueError: Si el backend no es válido.
+            ImportError: Si se pide el backend 'polars' y Polars no está instalado.
+        """
+        if backend not in QUERY_BACKENDS:
+            raise ValueError(
+                f"QueryEngine Error: Backend no soportado: '{backend}'. "
+                f"Opciones: {', '.join(QUERY_BACKENDS)}."
+            )
+        self.backend = backend
+        self._polars = PolarsBackend() if backend == "polars" else None
+        # Conexión compartida; cada consulta usa su propio cursor para que los
+        # registros de tablas y los resultados en streaming no se mezclen.
+        self._connection = None
+        self.database = database
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self.temp_directory = temp_directory
+        self.page_size = page_size
+        self.default_timeout = default_timeout
+        self.history = history
+        # Hilos de trabajo para no bloquear la interfaz mientras DuckDB ejecuta
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_queries, thread_name_prefix="query-engine"
+        )
+        # Hilos donde se ejecutan las consultas de Polars mientras se espera su
+        # resultado con tiempo límite (ver ``_execute_polars``)
+        self._polars_executor = (
+            ThreadPoolExecutor(max_workers=max_concurrent_queries, thread_name_prefix="query-polars")
+            if backend == "polars"
+            else None
+        )
+        # Archivos consultados directamente por DuckDB: nombre de tabla -> ruta o patrón
+        self._file_sources: dict[str, str] = {}
+        # Vistas agregadas materializadas sobre el DataFrame activo: nombre -> vista
+        self._aggregate_views: dict[str, AggregateView] = {}
+        # Resultados reutilizables: clave -> (referencias a las tablas, esquema, páginas)
+        self.reuse_results = reuse_results
+        self._reusable_results: OrderedDict = OrderedDict()
+        # Aumenta con cada invalidación, para no guardar resultados leídos antes de ella
+        self._results_generation = 0
+        # Cursores en ejecución: id -> [cursor, motivo de interrupción, etiqueta]
+        self._running_queries: dict[int, list] = {}
+        # Etiquetas únicas para las consultas lanzadas desde la API asíncrona
+        self._async_tags = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _get_connection(self):
+        """Retorna la conexión DuckDB compartida, creándola si es necesario."""
+        with self._lock:
+            if self._connection is None:
+                config = {}
+                if self.memory_limit:
+                    config["memory_limit"] = str(self.memory_limit)
+                if self.threads:
+                    config["threads"] = int(self.threads)
+                if self.temp_directory:
+                    os.makedirs(self.temp_directory, exist_ok=True)
+                    config["temp_directory"] = self.temp_directory
+                if self.database != ":memory:":
+                    database_dir = os.path.dirname(os.path.abspath(self.database))
+                    os.makedirs(database_dir, exist_ok=True)
+                self._connection = duckdb.connect(
+                    database=self.database, read_only=False, config=config
+                )
+                print(f"QueryEngine: Conectado a la base de datos DuckDB '{self.database}'.")
+            return self._connection
+
+    def is_persistent(self) -> bool:
+        """Indica si el motor usa una base de datos en disco."""
+        return self.database != ":memory:"
+
+    def _prepare_cursor(self, df: Optional[pd.DataFrame], tables=None):
+        """
+        Crea un cursor nuevo con el DataFrame registrado como 'my_table' y
+        cada DataFrame de ``tables`` registrado con su nombre, de modo que la
+        consulta pueda cruzarlos (JOIN, UNION...).
+        """
+        tables = self._collect_tables(df, tables, allow_materialized=True)
+        cursor = self._get_connection().cursor()
+        # Registrar cada DataFrame de Pandas como una vista temporal; el registro
+        # no copia los datos y es visible solo para este cursor
+        for name, table in tables.items():
+            cursor.register(name, table)
+        # Los archivos se exponen como vistas perezosas: DuckDB lee solo las
+        # columnas y filas que la consulta necesita (projection/filter pushdown)
+        for name, path in self._file_sources.items():
+            if name not in tables:
+                cursor.execute(
+                    f'CREATE OR REPLACE TEMP VIEW "{name}" AS '
+                    f"SELECT * FROM {self.get_file_reader_sql(path)}"
+                )
+        return cursor
+
+    def _collect_tables(self, df, tables=None, allow_materialized: bool = False) -> dict:
+        """
+        Reúne las tablas de la consulta (con ``df`` como 'my_table') y valida
+        que haya algo que consultar.
+
+        Raises:
+            ValueError: Si no hay datos, archivos registrados ni tablas materializadas.
+        """
+        # Las vistas agregadas se consultan como tablas; las tablas indicadas tienen prioridad
+        with self._lock:
+            views = list(self._aggregate_views.values())
+        tables = {
+            **{view.name: view.get_result() for view in views if not view.error},
+            **{name: table for name, table in (tables or {}).items() if table is not None},
+        }
+        if df is not None and not df.empty:
+            tables["my_table"] = df
+        # DuckDB no lee columnas dispersas (p. ej. tras optimizar la memoria)
+        tables = {name: self._densify(table) for name, table in tables.items()}
+        has_data = any(not table.empty for table in tables.values()) or bool(
+            self._file_sources
+        )
+        if not has_data and not (allow_materialized and self.list_materialized_tables()):
+            raise ValueError(
+                "QueryEngine Error: No hay un DataFrame cargado o está vacío para consultar."
+            )
+        return tables
+
+    @staticmethod
+    def _densify(table: pd.DataFrame) -> pd.DataFrame:
+        """Convierte a densas las columnas dispersas (SparseDtype) de una tabla."""
+        sparse_columns = [
+            column
+            for column, dtype in table.dtypes.items()
+            if isinstance(dtype, pd.SparseDtype)
+        ]
+        if not sparse_columns:
+            return table
+        dense = table.copy(deep=False)
+        for column in sparse_columns:
+            dense[column] = table[column].sparse.to_dense()
+        return dense
+
+    @staticmethod
+    def _validate_table_name(table_name: str):
+        """Valida que el nombre pueda usarse como identificador SQL."""
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table_name or ""):
+            raise ValueError(
+                "QueryEngine Error: El nombre de la tabla solo puede contener letras, "
+                "números y '_', y no puede empezar por un número."
+            )
+
+    @staticmethod
+    def get_file_reader_sql(path: str) -> str:
+        """
+        Retorna la llamada al lector nativo de DuckDB para una ruta o patrón
+        glob, p. ej. ``read_parquet('datos/*.parquet')``.
+
+        Raises:
+            ValueError: Si la extensión no es soportada.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        reader = FILE_READERS.get(extension)
+        if reader is None:
+            raise ValueError(
+                f"QueryEngine Error: Formato de archivo no soportado para consulta directa: {extension}"
+            )
+        escaped_path = path.replace("'", "''")
+        return f"{reader}('{escaped_path}')"
+
+    def register_file_source(self, table_name: str, path: str):
+        """
+        Registra un archivo (o patrón glob) como tabla consultable sin cargarlo
+        en Pandas. Solo el resultado de cada consulta se trae a memoria.
+
+        Args:
+            table_name (str): Nombre de la tabla en las consultas SQL.
+            path (str): Ruta a un archivo Parquet, CSV o JSON, o un patrón glob
+                        como ``datos/ventas_*.parquet``.
+        Raises:
+            ValueError: Si el nombre, la extensión o la ruta no son válidos.
+        """
+        self._validate_table_name(table_name)
+        self.get_file_reader_sql(path)
+        if not glob.glob(path):
+            raise ValueError(
+                f"QueryEngine Error: No se encontraron archivos para '{path}'."
+            )
+        self._file_sources[table_name] = path
+        self._invalidate_results()
+        print(f"QueryEngine: Archivo '{path}' registrado como tabla '{table_name}'.")
+
+    def unregister_file_source(self, table_name: str):
+        """Elimina un archivo registrado como tabla."""
+        if self._file_sources.pop(table_name, None) is not None:
+            self._invalidate_results()
+
+    def get_file_sources(self) -> dict[str, str]:
+        """Retorna los archivos registrados (nombre de tabla -> ruta o patrón)."""
+        return dict(self._file_sources)
+
+    def execute_query_on_dataframe(
+        self, df: pd.DataFrame, query_string: str, tables=None, dataset_version=None
+    ):
         """
         Ejecuta una consulta SQL sobre el DataFrame de Pandas proporcionado.
 
+        Materializa el resultado completo; para resultados grandes que se
+        muestran por páginas utilice ``open_query_cursor``.
+
         Args:
             df (pd.DataFrame): El DataFrame sobre el cual ejecutar la consulta.
             query_string (str): La cadena de consulta SQL.
+            tables (dict, optional): Tablas adicionales (nombre -> DataFrame).
+            dataset_version (int, optional): Versión de los datos, para el historial.
 
         Returns:
             pd.DataFrame: Un nuevo DataFrame con los resultados de la consulta.
@@ -24,33 +335,959 @@ class QueryEngine:
             ValueError: Si el DataFrame de entrada es None o está vacío.
             duckdb.Error: Si hay un error en la ejecución de la consulta SQL.
         """
-        if df is None or df.empty:
-            raise ValueError(
-                "QueryEngine Error: No hay un DataFrame cargado o está vacío para consultar."
-            )
-
+        if self.backend == "polars":
+            cursor = None
+            query_tables = self._collect_tables(df, tables)
+        else:
+            cursor = self._prepare_cursor(df, tables)
+        start_time = time.perf_counter()
         try:
-            # Conectar a una base de datos DuckDB en memoria
-            # DuckDB permite registrar DataFrames de Pandas como tablas temporales
-            # y luego consultarlas usando SQL.
-            con = duckdb.connect(database=":memory:", read_only=False)
-
-            # Registrar el DataFrame de Pandas como una tabla temporal llamada 'my_table'
-            con.register("my_table", df)
-
             # Ejecutar la consulta SQL
-            result_df = con.execute(query_string).fetchdf()
-
-            # Cerrar la conexión
-            con.close()
+            if cursor is None:
+                result_df = self._polars.execute_sql(
+                    query_tables, query_string, self._file_sources
+                ).to_pandas()
+            else:
+                result_df = cursor.execute(query_string).fetchdf()
+            if not self._is_read_only(query_string):
+                self._invalidate_results()
 
             print(
                 f"QueryEngine: Consulta SQL ejecutada exitosamente. Filas resultantes: {len(result_df)}"
             )
+            self._record_history(
+                query_string,
+                start_time,
+                dataset_version,
+                rows_returned=len(result_df),
+                bytes_materialized=int(result_df.memory_usage(index=False).sum()),
+            )
             return result_df
         except duckdb.Error as e:
             print(f"QueryEngine Error: Error al ejecutar la consulta SQL: {e}")
+            self._record_history(query_string, start_time, dataset_version, status="error")
             raise
         except Exception as e:
             print(f"QueryEngine Error: Error inesperado en el motor de consultas: {e}")
+            self._record_history(query_string, start_time, dataset_version, status="error")
+            raise
+        finally:
+            # Cerrar el cursor
+            if cursor is not None:
+                cursor.close()
+
+    def _track_query(self, cursor, tag=None) -> int:
+        """Registra un cursor como consulta en ejecución."""
+        with self._lock:
+            self._running_queries[id(cursor)] = [cursor, None, tag]
+        return id(cursor)
+
+    def _untrack_query(self, query_id: int):
+        """Elimina un cursor de las consultas en ejecución."""
+        with self._lock:
+            self._running_queries.pop(query_id, None)
+
+    def _interrupt_query(self, query_id: int, reason: str) -> bool:
+        """
+        Interrumpe la consulta indicada si sigue en ejecución.
+        Retorna True si se envió la interrupción.
+        """
+        with self._lock:
+            entry = self._running_queries.get(query_id)
+            if entry is None or entry[1] is not None:
+                return False
+            entry[1] = reason
+            cursor = entry[0]
+        cursor.interrupt()
+        # DuckDB descarta la interrupción si la consulta aún no había empezado,
+        # así que se repite mientras la consulta siga registrada como en curso.
+        # El hilo no es daemon: termina en cuanto la consulta se detiene y así
+        # no queda dentro de DuckDB al cerrar el intérprete.
+        threading.Thread(
+            target=self._repeat_interrupt,
+            args=(query_id, cursor),
+            name="query-engine-interrupt",
+        ).start()
+        return True
+
+    def _repeat_interrupt(self, query_id: int, cursor):
+        """Reenvía la interrupción a un cursor hasta que su consulta termina."""
+        while True:
+            time.sleep(INTERRUPT_RETRY_SECONDS)
+            with self._lock:
+                if self._running_queries.get(query_id, [None])[0] is not cursor:
+                    return
+            try:
+                cursor.interrupt()
+            except duckdb.Error:
+                # El cursor ya se cerró al fallar la consulta
+                return
+
+    def cancel_running_queries(self, tag=None) -> int:
+        """
+        Cancela las consultas en ejecución mediante la interrupción de DuckDB.
+
+        Args:
+            tag (optional): Si se indica, solo se cancelan las consultas lanzadas
+                            con esa etiqueta (p. ej. las de una vista concreta).
+
+        Returns:
+            int: Número de consultas a las que se envió la interrupción.
+        """
+        with self._lock:
+            query_ids = [
+                query_id
+                for query_id, entry in self._running_queries.items()
+                if tag is None or entry[2] == tag
+            ]
+        cancelled = sum(
+            1 for query_id in query_ids if self._interrupt_query(query_id, "cancelled")
+        )
+        if cancelled:
+            print(f"QueryEngine: Se cancelaron {cancelled} consulta(s) en ejecución.")
+        return cancelled
+
+    def submit_query(
+        self,
+        df: pd.DataFrame,
+        query_string: str,
+        page_size=None,
+        timeout: Optional[float] = None,
+        tables=None,
+        dataset_version=None,
+        tag=None,
+        profile: bool = False,
+    ) -> Future:
+        """
+        Ejecuta ``open_query_cursor`` en un hilo de trabajo.
+
+        Args:
+            df (pd.DataFrame): El DataFrame sobre el cual ejecutar la consulta.
+            query_string (str): La cadena de consulta SQL.
+            page_size (int, optional): Filas por página.
+            timeout (float, optional): Segundos máximos de ejecución.
+                                       Por defecto, ``self.default_timeout``.
+            tables (dict, optional): Tablas adicionales (nombre -> DataFrame).
+            dataset_version (int, optional): Versión de los datos, para el historial.
+            tag (optional): Etiqueta para cancelar la consulta con ``cancel_running_queries``.
+            profile (bool): Perfilar la ejecución (ver ``open_query_cursor``).
+
+        Returns:
+            Future: Se resuelve con el QueryCursor, o con la excepción de la consulta
+                    (TimeoutError, QueryCancelledError, duckdb.Error...).
+        """
+        return self._executor.submit(
+            self.open_query_cursor,
+            df,
+            query_string,
+            page_size,
+            timeout if timeout is not None else self.default_timeout,
+            tables,
+            dataset_version,
+            tag,
+            profile,
+        )
+
+    def open_query_cursor(
+        self,
+        df: pd.DataFrame,
+        query_string: str,
+        page_size=None,
+        timeout: Optional[float] = None,
+        tables=None,
+        dataset_version=None,
+        tag=None,
+        profile: bool = False,
+    ):
+        """
+        Ejecuta una consulta SQL y retorna un cursor paginado sobre el resultado.
+
+        El resultado se lee en lotes Arrow bajo demanda, de modo que la primera
+        página está disponible de inmediato aunque la consulta devuelva millones
+        de filas; el total de filas se conoce al leer la última página. El
+        llamador es responsable de cerrar el cursor.
+
+        Args:
+            df (pd.DataFrame): El DataFrame sobre el cual ejecutar la consulta.
+            query_string (str): La cadena de consulta SQL.
+            page_size (int, optional): Filas por página. Por defecto, ``self.page_size``.
+            timeout (float, optional): Segundos máximos hasta tener la primera página.
+                                       Sin límite si es None.
+            tables (dict, optional): Tablas adicionales (nombre -> DataFrame).
+            dataset_version (int, optional): Versión de los datos, para el historial.
+            tag (optional): Etiqueta para cancelar la consulta con ``cancel_running_queries``.
+            profile (bool): Activa el perfilado de DuckDB en esta misma ejecución
+                            (sin volver a ejecutar la consulta). El perfil se
+                            obtiene con ``get_query_profile`` cuando termina de
+                            leerse el resultado. Se ignora con el backend 'polars'.
+
+        Returns:
+            QueryCursor: Cursor con la primera página ya leída.
+        Raises:
+            ValueError: Si el DataFrame de entrada es None o está vacío.
+            TimeoutError: Si la consulta supera el tiempo límite.
+            QueryCancelledError: Si la consulta se cancela con ``cancel_running_queries``.
+            duckdb.Error: Si hay un error en la ejecución de la consulta SQL.
+        """
+        page_size = page_size or self.page_size
+        reuse_key = None if profile else self._get_reuse_key(
+            df, query_string, tables, dataset_version, page_size
+        )
+        if reuse_key is not None:
+            query_cursor = self._open_reused_result(reuse_key, query_string, page_size, dataset_version)
+            if query_cursor is not None:
+                return query_cursor
+        elif not self._is_read_only(query_string):
+            # La consulta puede modificar tablas: los resultados guardados dejan de valer
+            self._invalidate_results()
+
+        if self.backend == "polars":
+            query_tables = self._collect_tables(df, tables)
+            cursor = None
+        else:
+            cursor = self._prepare_cursor(df, tables)
+        polars_result = None
+        profile_path = None
+        if profile and self.backend != "polars":
+            # DuckDB escribe el perfil de la consulta del cursor al terminar su ejecución
+            profile_path = os.path.join(
+                self.temp_directory or tempfile.gettempdir(),
+                f"mugenc_profile_{uuid.uuid4().hex}.json",
+            )
+            cursor.execute("PRAGMA enable_profiling='json'")
+            cursor.execute(
+                "PRAGMA profiling_output='{}'".format(profile_path.replace("'", "''"))
+            )
+        start_time = time.perf_counter()
+
+        def open_cursor(connection):
+            if self.backend == "polars":
+                # Polars ya ejecutó la consulta; DuckDB pagina el resultado Arrow sin copiarlo
+                result = polars_result
+                connection.register("polars_result", result)
+                query_cursor = QueryCursor(
+                    connection, "SELECT * FROM polars_result", page_size=page_size
+                )
+                query_cursor.query_string = query_string
+                # El resultado ya está materializado: el total se conoce sin contarlo
+                query_cursor.total_rows = result.num_rows
+            else:
+                query_cursor = QueryCursor(connection, query_string, page_size=page_size)
+                query_cursor.profile_path = profile_path
+            # Lee la primera página dentro del tiempo límite
+            query_cursor.is_empty()
+            return query_cursor
+
+        try:
+            if self.backend == "polars":
+                polars_result = self._execute_polars(query_tables, query_string, timeout, tag)
+                cursor = self._get_connection().cursor()
+            query_cursor = self._run_tracked(cursor, open_cursor, timeout, tag)
+        except TimeoutError:
+            self._record_history(query_string, start_time, dataset_version, status="timeout")
+            raise
+        except QueryCancelledError:
+            self._record_history(query_string, start_time, dataset_version, status="cancelled")
+            raise
+        except Exception:
+            self._record_history(query_string, start_time, dataset_version, status="error")
+            raise
+
+        print(
+            f"QueryEngine: Consulta SQL ejecutada exitosamente. Filas resultantes: "
+            f"{query_cursor.total_rows if query_cursor.total_rows is not None else 'desconocidas'}"
+        )
+        entry = self._record_history(
+            query_string,
+            start_time,
+            dataset_version,
+            rows_returned=query_cursor.total_rows,
+            bytes_materialized=query_cursor.bytes_materialized,
+        )
+        if entry is not None:
+            # Al cerrar el cursor se guardan los bytes y el tiempo de lectura acumulados
+            query_cursor.on_close = lambda closed_cursor: self.history.update_entry(
+                entry,
+                rows_returned=closed_cursor.total_rows,
+                bytes_materialized=closed_cursor.bytes_materialized,
+                page_fetch_time=round(closed_cursor.page_fetch_time, 6),
+            )
+        query_cursor.reuse_key = reuse_key
+        self._remember_result(query_cursor)
+        return query_cursor
+
+    async def query(
+        self,
+        df: Optional[pd.DataFrame],
+        query_string: str,
+        page_size=None,
+        timeout: Optional[float] = None,
+        tables=None,
+        dataset_version=None,
+        tag=None,
+        profile: bool = False,
+    ) -> QueryCursor:
+        """
+        Versión asíncrona de ``open_query_cursor``: ``cursor = await engine.query(...)``.
+
+        La consulta corre en el pool de hilos del motor, así que el bucle de
+        eventos sigue libre y varias tareas pueden consultar a la vez (hasta
+        ``max_concurrent_queries``). Si la tarea que espera se cancela, se
+        interrumpe la consulta en DuckDB.
+
+        Args:
+            Los mismos que ``submit_query``. Si no se indica ``tag`` se usa una
+            etiqueta única para la tarea.
+
+        Returns:
+            QueryCursor: Cursor con la primera página ya leída.
+        Raises:
+            TimeoutError, QueryCancelledError, duckdb.Error: Como ``open_query_cursor``.
+            asyncio.CancelledError: Si se cancela la tarea que espera el resultado.
+        """
+        if tag is None:
+            tag = f"async-{next(self._async_tags)}"
+        future = self.submit_query(
+            df, query_string, page_size, timeout, tables, dataset_version, tag, profile
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancel_running_queries(tag)
+            # Si la consulta llegó a terminar, su cursor ya no tiene dueño
+            future.add_done_callback(self._close_orphan_cursor)
             raise
+
+    @staticmethod
+    def _close_orphan_cursor(future: Future):
+        """Cierra el cursor de una consulta cuyo resultado nadie va a leer."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def fetch_page(
+        self,
+        query_cursor: QueryCursor,
+        page_number: int,
+        timeout: Optional[float] = None,
+        tag=None,
+    ) -> tuple:
+        """
+        Lee una página de un cursor abierto con ``open_query_cursor`` como una
+        consulta en curso: se puede cancelar con ``cancel_running_queries`` y se
+        interrumpe al superar ``timeout``. Si falla, el cursor se cierra y el
+        fallo se registra en el historial con el texto de la consulta.
+
+        Args:
+            query_cursor (QueryCursor): El cursor del resultado.
+            page_number (int): Página a leer (base 0).
+            timeout (float, optional): Segundos máximos de lectura. Sin límite si es None.
+            tag (optional): Etiqueta para cancelar la lectura con ``cancel_running_queries``.
+
+        Returns:
+            tuple: (página como DataFrame, si existe la página siguiente). Saber
+                   si hay una página siguiente puede requerir leerla.
+        Raises:
+            TimeoutError: Si la lectura supera el tiempo límite.
+            QueryCancelledError: Si la lectura se cancela.
+            duckdb.Error: Si hay un error al leer el resultado.
+        """
+        start_time = time.perf_counter()
+
+        def read_page(connection):
+            page = query_cursor.fetch_page(page_number)
+            return page, query_cursor.has_page(page_number + 1)
+
+        try:
+            result = self._run_tracked(query_cursor.connection, read_page, timeout, tag)
+        except TimeoutError:
+            self._record_history(query_cursor.query_string, start_time, status="timeout")
+            query_cursor.close()
+            raise
+        except QueryCancelledError:
+            self._record_history(query_cursor.query_string, start_time, status="cancelled")
+            query_cursor.close()
+            raise
+        except Exception:
+            self._record_history(query_cursor.query_string, start_time, status="error")
+            query_cursor.close()
+            raise
+        query_cursor.page_fetch_time += time.perf_counter() - start_time
+        self._remember_result(query_cursor)
+        return result
+
+    async def fetch_query_page(
+        self,
+        query_cursor: QueryCursor,
+        page_number: int,
+        timeout: Optional[float] = None,
+        tag=None,
+    ) -> tuple:
+        """
+        Versión asíncrona de ``fetch_page``: la lectura corre en el pool de hilos
+        del motor. Si la tarea que espera se cancela, se interrumpe la lectura.
+
+        Args:
+            Los mismos que ``fetch_page``. Por defecto, ``timeout`` es
+            ``self.default_timeout`` y ``tag`` una etiqueta única para la tarea.
+
+        Returns:
+            tuple: (página como DataFrame, si existe la página siguiente).
+        Raises:
+            TimeoutError, QueryCancelledError, duckdb.Error: Como ``fetch_page``.
+            asyncio.CancelledError: Si se cancela la tarea que espera la página.
+        """
+        if tag is None:
+            tag = f"async-{next(self._async_tags)}"
+        future = self._executor.submit(
+            self.fetch_page,
+            query_cursor,
+            page_number,
+            timeout if timeout is not None else self.default_timeout,
+            tag,
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancel_running_queries(tag)
+            raise
+
+    async def run_async(self, method, *args, **kwargs):
+        """
+        Ejecuta cualquier método bloqueante del motor (p. ej. ``profile_query``,
+        ``materialize_query`` o ``execute_query_on_dataframe``) en el pool de
+        hilos acotado y espera su resultado sin bloquear el bucle de eventos.
+
+        Args:
+            method (callable): El método a ejecutar.
+            *args, **kwargs: Argumentos del método.
+
+        Returns:
+            El valor retornado por ``method``.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: method(*args, **kwargs)
+        )
+
+    @staticmethod
+    def _is_read_only(query_string: str) -> bool:
+        """Indica si la consulta es una sola sentencia de lectura (SELECT, WITH o FROM)."""
+        query = query_string.strip().rstrip(";")
+        return bool(REUSABLE_QUERY.match(query)) and ";" not in query
+
+    def _get_reuse_key(self, df, query_string: str, tables, dataset_version, page_size: int):
+        """
+        Retorna la clave con la que se reutiliza el resultado de una consulta
+        (texto SQL, versión de los datos, tamaño de página y tablas), o None si
+        no puede reutilizarse: sin versión de los datos, con archivos
+        registrados (pueden cambiar en disco), con funciones volátiles como
+        ``random()`` o ``now()``, o si la consulta no es de solo lectura.
+        """
+        if (
+            not self.reuse_results
+            or dataset_version is None
+            or self._file_sources
+            or not self._is_read_only(query_string)
+            or VOLATILE_FUNCTIONS.search(query_string)
+        ):
+            return None
+        frames = {**(tables or {}), "my_table": df}
+        frames = {name: table for name, table in frames.items() if table is not None}
+        key = (
+            query_string.strip().rstrip(";"),
+            dataset_version,
+            page_size,
+            tuple(sorted((name, id(table)) for name, table in frames.items())),
+        )
+        # Mientras las tablas sigan vivas, su id no puede pasar a otro objeto
+        references = tuple(weakref.ref(table) for table in frames.values())
+        with self._lock:
+            generation = self._results_generation
+        return key, references, generation
+
+    def _open_reused_result(
+        self, reuse_key: tuple, query_string: str, page_size: int, dataset_version
+    ) -> Optional[QueryCursor]:
+        """
+        Retorna un cursor sobre el resultado guardado de la misma consulta, sin
+        ejecutarla, o None si no hay uno válido. Se registra en el historial
+        como acierto de caché.
+        """
+        key = reuse_key[0]
+        with self._lock:
+            entry = self._reusable_results.get(key)
+            if entry is None:
+                return None
+            references, schema, pages = entry
+            if any(reference() is None for reference in references):
+                del self._reusable_results[key]
+                return None
+            self._reusable_results.move_to_end(key)
+
+        start_time = time.perf_counter()
+        query_cursor = QueryCursor(
+            self._get_connection().cursor(),
+            query_string,
+            page_size=page_size,
+            cached_result=(schema, pages),
+        )
+        print(
+            f"QueryEngine: Resultado reutilizado de una ejecución anterior. "
+            f"Filas resultantes: {query_cursor.total_rows}"
+        )
+        self._record_history(
+            query_string,
+            start_time,
+            dataset_version,
+            rows_returned=query_cursor.total_rows,
+            cache_hits=query_cursor.cache_hits,
+        )
+        return query_cursor
+
+    def _remember_result(self, query_cursor: QueryCursor):
+        """Guarda el resultado de un cursor reutilizable en cuanto se ha leído por completo."""
+        if query_cursor.reuse_key is None:
+            return
+        pages = query_cursor.get_result_pages()
+        if pages is None:
+            return
+        key, references, generation = query_cursor.reuse_key
+        query_cursor.reuse_key = None
+        if query_cursor.total_rows > REUSE_MAX_ROWS:
+            return
+        with self._lock:
+            # Las tablas cambiaron mientras se leía el resultado
+            if generation != self._results_generation:
+                return
+            self._reusable_results[key] = (references, query_cursor.schema, pages)
+            self._reusable_results.move_to_end(key)
+            while len(self._reusable_results) > self.reuse_results:
+                self._reusable_results.popitem(last=False)
+
+    def _invalidate_results(self):
+        """Descarta los resultados guardados (p. ej. al cambiar una tabla)."""
+        with self._lock:
+            self._reusable_results.clear()
+            self._results_generation += 1
+
+    def _record_history(
+        self,
+        query_string: str,
+        start_time: float,
+        dataset_version=None,
+        status: str = "ok",
+        **stats,
+    ):
+        """Registra la consulta en el historial, si hay uno configurado."""
+        if self.history is None:
+            return None
+        return self.history.record(
+            query_string,
+            wall_time=time.perf_counter() - start_time,
+            dataset_version=dataset_version,
+            status=status,
+            **stats,
+        )
+
+    def _execute_polars(
+        self, tables: dict, query_string: str, timeout: Optional[float] = None, tag=None
+    ):
+        """
+        Ejecuta la consulta con Polars y espera su resultado como mucho
+        ``timeout`` segundos o hasta que se cancele con ``cancel_running_queries``.
+
+        Polars no permite interrumpir una consulta en curso: al superar el
+        tiempo límite o al cancelarla se deja de esperar y se lanza el error,
+        pero el cálculo continúa en segundo plano y su resultado se descarta.
+
+        Returns:
+            pa.Table: El resultado de la consulta.
+        Raises:
+            TimeoutError: Si la consulta supera el tiempo límite.
+            QueryCancelledError: Si la consulta se cancela.
+        """
+        task = self._polars_executor.submit(
+            self._polars.execute_sql, tables, query_string, self._file_sources
+        )
+        polars_query = _PolarsQuery()
+        query_id = self._track_query(polars_query, tag)
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            while not task.done():
+                if polars_query.interrupted.is_set():
+                    print("QueryEngine: Consulta de Polars cancelada; sigue en segundo plano.")
+                    raise QueryCancelledError(
+                        "La consulta fue cancelada. Polars no puede interrumpirla: "
+                        "sigue ejecutándose en segundo plano y su resultado se descartará."
+                    )
+                remaining = deadline - time.monotonic() if deadline is not None else 0.1
+                if remaining <= 0:
+                    print(f"QueryEngine Error: La consulta de Polars superó el tiempo límite de {timeout} s.")
+                    raise TimeoutError(
+                        f"La consulta superó el tiempo límite de {timeout} s. Polars no puede "
+                        "interrumpirla: sigue ejecutándose en segundo plano y su resultado se descartará."
+                    )
+                wait([task], timeout=min(remaining, 0.1))
+            return task.result()
+        finally:
+            self._untrack_query(query_id)
+
+    def _run_tracked(self, cursor, action, timeout: Optional[float] = None, tag=None):
+        """
+        Ejecuta ``action(cursor)`` registrando el cursor como consulta en curso,
+        de forma que pueda cancelarse o interrumpirse al superar ``timeout``.
+        Si la acción falla, el cursor se cierra antes de propagar el error.
+
+        Raises:
+            TimeoutError: Si la consulta supera el tiempo límite.
+            QueryCancelledError: Si la consulta se cancela con ``cancel_running_queries``.
+            duckdb.Error: Si hay un error en la ejecución de la consulta SQL.
+        """
+        query_id = self._track_query(cursor, tag)
+        timer = None
+        if timeout:
+            timer = threading.Timer(
+                timeout, self._interrupt_query, args=(query_id, "timeout")
+            )
+            timer.daemon = True
+            timer.start()
+        try:
+            return action(cursor)
+        except Exception as e:
+            cursor.close()
+            with self._lock:
+                reason = self._running_queries.get(query_id, [None, None])[1]
+            # Al leer lotes Arrow, la interrupción llega como error de PyArrow
+            if reason is None and not isinstance(e, duckdb.InterruptException):
+                if isinstance(e, duckdb.Error):
+                    print(f"QueryEngine Error: Error al ejecutar la consulta SQL: {e}")
+                else:
+                    print(f"QueryEngine Error: Error inesperado en el motor de consultas: {e}")
+                raise
+            if reason == "timeout":
+                print(f"QueryEngine Error: La consulta superó el tiempo límite de {timeout} s.")
+                raise TimeoutError(
+                    f"La consulta superó el tiempo límite de {timeout} s."
+                ) from None
+            print("QueryEngine: Consulta cancelada por el usuario.")
+            raise QueryCancelledError("La consulta fue cancelada.") from None
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._untrack_query(query_id)
+
+    def profile_query(
+        self,
+        df: pd.DataFrame,
+        query_string: str,
+        timeout: Optional[float] = None,
+        tables=None,
+        tag=None,
+    ) -> dict:
+        """
+        Ejecuta la consulta con EXPLAIN ANALYZE y retorna el perfil de DuckDB.
+
+        Es una ejecución aparte: la consulta se ejecuta completa otra vez, pero
+        sus filas no se transfieren a Python. Para perfilar la ejecución que ve
+        el usuario, abra el cursor con ``profile=True`` y use ``get_query_profile``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame sobre el cual ejecutar la consulta.
+            query_string (str): La cadena de consulta SQL.
+            timeout (float, optional): Segundos máximos de ejecución.
+            tables (dict, optional): Tablas adicionales (nombre -> DataFrame).
+            tag (optional): Etiqueta para cancelar la consulta con ``cancel_running_queries``.
+
+        Returns:
+            dict: Diccionario con ``query``, ``total_time`` (s, tiempo de reloj),
+                  ``operator_time`` (s, suma de operadores), ``rows_returned`` y
+                  ``plan``: árbol de operadores donde cada nodo tiene ``name``,
+                  ``timing`` (s), ``rows``, ``result_bytes``, ``extra_info`` y
+                  ``children``.
+        Raises:
+            ValueError: Si el DataFrame de entrada es None o está vacío.
+            TimeoutError: Si la consulta supera el tiempo límite.
+            QueryCancelledError: Si la consulta se cancela.
+            duckdb.Error: Si hay un error en la ejecución de la consulta SQL.
+        """
+        cursor = self._prepare_cursor(df, tables)
+        query = query_string.strip().rstrip(";")
+
+        def explain_analyze(connection):
+            connection.execute("PRAGMA enable_profiling='json'")
+            start_time = time.perf_counter()
+            rows = connection.execute(f"EXPLAIN ANALYZE {query}").fetchall()
+            total_time = time.perf_counter() - start_time
+            connection.close()
+            return rows, total_time
+
+        rows, total_time = self._run_tracked(cursor, explain_analyze, timeout, tag)
+        profile = self._build_profile(query_string, json.loads(rows[0][1]), total_time)
+        print(
+            f"QueryEngine: Perfil de la consulta generado en {total_time:.3f} s."
+        )
+        return profile
+
+    def get_query_profile(self, query_cursor: QueryCursor) -> Optional[dict]:
+        """
+        Retorna el perfil de la ejecución de un cursor abierto con ``profile=True``.
+
+        DuckDB escribe el perfil cuando la consulta termina, es decir, al leer
+        la última página del resultado; hasta entonces retorna None. El tiempo
+        total incluye el tiempo que el resultado estuvo abierto entre páginas.
+
+        Returns:
+            dict: Como ``profile_query``, o None si el perfil aún no está disponible.
+        """
+        path = query_cursor.profile_path
+        if not path or query_cursor.total_rows is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as profile_file:
+                raw_profile = json.load(profile_file)
+        except (OSError, ValueError) as e:
+            print(f"QueryEngine Error: No se pudo leer el perfil de la consulta: {e}")
+            return None
+        return self._build_profile(
+            query_cursor.query_string, raw_profile, float(raw_profile.get("latency") or 0.0)
+        )
+
+    def _build_profile(self, query_string: str, raw_profile: dict, total_time: float) -> dict:
+        """Convierte el perfil JSON de DuckDB en el diccionario de ``profile_query``."""
+        # La raíz del perfil es la propia consulta (o el EXPLAIN ANALYZE); el plan real es su hijo
+        root = raw_profile
+        while root.get("children") and self._operator_name(root) in ("", "EXPLAIN_ANALYZE"):
+            root = root["children"][0]
+        plan = self._normalize_profile_node(root)
+        return {
+            "query": query_string,
+            "total_time": total_time,
+            "operator_time": self._sum_operator_time(plan),
+            "rows_returned": plan["rows"],
+            "plan": plan,
+        }
+
+    @staticmethod
+    def _operator_name(node: dict) -> str:
+        """Nombre del operador, compatible con las distintas versiones de DuckDB."""
+        return (node.get("operator_name") or node.get("name") or "").strip()
+
+    def _normalize_profile_node(self, node: dict) -> dict:
+        """Convierte un nodo del perfil JSON de DuckDB a un formato estable."""
+        extra_info = node.get("extra_info") or {}
+        if isinstance(extra_info, str):
+            extra_info = {"info": extra_info} if extra_info.strip() else {}
+        return {
+            "name": self._operator_name(node) or node.get("operator_type", ""),
+            "timing": float(node.get("operator_timing", node.get("timing", 0.0)) or 0.0),
+            "rows": int(node.get("operator_cardinality", node.get("cardinality", 0)) or 0),
+            "result_bytes": int(node.get("result_set_size", 0) or 0),
+            "extra_info": extra_info,
+            "children": [
+                self._normalize_profile_node(child)
+                for child in node.get("children", [])
+            ],
+        }
+
+    def _sum_operator_time(self, node: dict) -> float:
+        """Suma el tiempo de un operador y el de todos sus descendientes."""
+        return node["timing"] + sum(
+            self._sum_operator_time(child) for child in node["children"]
+        )
+
+    def list_materialized_tables(self) -> list[str]:
+        """
+        Retorna los nombres de las tablas materializadas en la base de datos.
+        En modo ':memory:' desaparecen al cerrar la aplicación; con un archivo
+        se conservan entre sesiones.
+        """
+        cursor = self._get_connection().cursor()
+        try:
+            rows = cursor.execute(
+                "SELECT table_name FROM duckdb_tables() "
+                "WHERE NOT temporary AND schema_name = 'main' ORDER BY table_name"
+            ).fetchall()
+            return [row[0] for row in rows]
+        finally:
+            cursor.close()
+
+    def materialize_query(
+        self,
+        df: Optional[pd.DataFrame],
+        query_string: str,
+        table_name: str,
+        tables=None,
+        timeout: Optional[float] = None,
+        tag=None,
+    ) -> int:
+        """
+        Guarda el resultado de una consulta como tabla (CREATE OR REPLACE TABLE AS).
+
+        La tabla queda disponible para las siguientes consultas sin volver a
+        cargar los archivos de origen.
+
+        Args:
+            df (pd.DataFrame, optional): El DataFrame registrado como 'my_table'.
+            query_string (str): La consulta cuyo resultado se materializa.
+            table_name (str): Nombre de la tabla (letras, números y '_').
+            tables (dict, optional): Tablas adicionales (nombre -> DataFrame).
+            timeout (float, optional): Segundos máximos de ejecución.
+            tag (optional): Etiqueta para cancelar la consulta con ``cancel_running_queries``.
+
+        Returns:
+            int: Número de filas de la tabla materializada.
+        Raises:
+            ValueError: Si el nombre de la tabla no es válido.
+            TimeoutError: Si la consulta supera el tiempo límite.
+            QueryCancelledError: Si la consulta se cancela.
+            duckdb.Error: Si hay un error en la ejecución de la consulta SQL.
+        """
+        self._validate_table_name(table_name)
+        cursor = self._prepare_cursor(df, tables)
+        query = query_string.strip().rstrip(";")
+
+        def create_table(connection):
+            connection.execute(f'CREATE OR REPLACE TABLE main."{table_name}" AS {query}')
+            row_count = connection.execute(
+                f'SELECT COUNT(*) FROM main."{table_name}"'
+            ).fetchone()[0]
+            connection.close()
+            return row_count
+
+        row_count = self._run_tracked(cursor, create_table, timeout, tag)
+        self._invalidate_results()
+        print(
+            f"QueryEngine: Tabla '{table_name}' materializada con {row_count} filas."
+        )
+        return row_count
+
+    def drop_materialized_table(self, table_name: str):
+        """Elimina una tabla materializada, si existe."""
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute(f'DROP TABLE IF EXISTS main."{table_name}"')
+            self._invalidate_results()
+            print(f"QueryEngine: Tabla materializada '{table_name}' eliminada.")
+        finally:
+            cursor.close()
+
+    def create_aggregate_view(
+        self,
+        name: str,
+        df: pd.DataFrame,
+        keys: list,
+        aggregations: list,
+        version: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Define una vista agregada materializada (sum, count, min, max, mean por
+        clave) sobre el DataFrame activo. La vista se consulta por SQL con su
+        nombre y se mantiene al día con ``handle_dataset_change``.
+
+        Args:
+            name (str): Nombre de la vista (letras, números y '_').
+            df (pd.DataFrame): El DataFrame activo.
+            keys (list): Columnas de agrupación.
+            aggregations (list): Pares (función, columna).
+            version (int, optional): Versión de los datos de ``df``.
+
+        Returns:
+            pd.DataFrame: El resultado de la vista.
+        Raises:
+            ValueError: Si el nombre, las claves o las agregaciones no son válidos.
+        """
+        self._validate_table_name(name)
+        if df is None or df.empty:
+            raise ValueError(
+                "QueryEngine Error: No hay un DataFrame cargado o está vacío para agregar."
+            )
+        view = AggregateView(name, keys, aggregations)
+        missing = [
+            column for column in view.keys + view.get_value_columns() if column not in df.columns
+        ]
+        if missing:
+            raise ValueError(
+                f"QueryEngine Error: Columnas no encontradas: {', '.join(missing)}."
+            )
+        view.refresh(df, version)
+        if view.error:
+            raise ValueError(f"QueryEngine Error: No se pudo crear la vista '{name}': {view.error}")
+        with self._lock:
+            self._aggregate_views[name] = view
+        self._invalidate_results()
+        print(
+            f"QueryEngine: Vista agregada '{name}' creada con {len(view.get_result())} grupos."
+        )
+        return view.get_result()
+
+    def get_aggregate_view(self, name: str) -> Optional[pd.DataFrame]:
+        """Retorna el resultado de una vista agregada, o None si no existe."""
+        with self._lock:
+            view = self._aggregate_views.get(name)
+        return view.get_result() if view is not None else None
+
+    def list_aggregate_views(self) -> list[dict]:
+        """
+        Retorna la descripción de las vistas agregadas: ``name``, ``keys``,
+        ``aggregations``, ``groups``, ``version``, ``last_refresh`` y ``error``.
+        """
+        with self._lock:
+            views = list(self._aggregate_views.values())
+        return [
+            {
+                "name": view.name,
+                "keys": view.keys,
+                "aggregations": view.aggregations,
+                "groups": len(view.get_result()),
+                "version": view.version,
+                "last_refresh": dict(view.last_refresh),
+                "error": view.error,
+            }
+            for view in views
+        ]
+
+    def drop_aggregate_view(self, name: str):
+        """Elimina una vista agregada, si existe."""
+        with self._lock:
+            removed = self._aggregate_views.pop(name, None)
+        if removed is not None:
+            self._invalidate_results()
+            print(f"QueryEngine: Vista agregada '{name}' eliminada.")
+
+    def handle_dataset_change(self, change: dict):
+        """
+        Actualiza las vistas agregadas tras un cambio del DataFrame activo.
+        Se registra con ``AppState.add_change_listener``.
+
+        Si solo se eliminaron o añadieron filas o cambiaron algunas columnas,
+        cada vista se actualiza de forma incremental; si los datos se
+        reemplazaron, se recalcula. Los resultados guardados para reutilizar
+        se descartan.
+        """
+        self._invalidate_results()
+        with self._lock:
+            views = list(self._aggregate_views.values())
+        df = change.get("dataframe")
+        version = change.get("version")
+        for view in views:
+            if df is None:
+                view.error = "No hay un DataFrame activo."
+            elif change.get("kind") != "updated":
+                view.refresh(df, version)
+            else:
+                if change.get("removed_rows") is not None:
+                    view.apply_removed_rows(df, change["removed_rows"], version)
+                if change.get("added_rows") is not None:
+                    view.apply_added_rows(df, change["added_rows"], version)
+                if change.get("changed_columns"):
+                    view.apply_changed_columns(df, change["changed_columns"], version)
+            if view.error:
+                print(
+                    f"QueryEngine Error: La vista agregada '{view.name}' quedó desactualizada: "
+                    f"{view.error}"
+                )
+            else:
+                print(
+                    f"QueryEngine: Vista agregada '{view.name}' actualizada "
+                    f"({view.last_refresh['mode']}, {view.last_refresh['seconds'] * 1000:.1f} ms)."
+                )
@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+# El archivo del historial se compacta cuando acumula este múltiplo de
+# ``max_entries`` en líneas (entradas podadas o actualizadas)
+COMPACT_RATIO = 2
+
+
+class QueryHistory:
+    """
+    Clase encargada de registrar el historial de consultas SQL con sus
+    estadísticas de ejecución (tiempo, filas, bytes materializados y
+    aciertos de caché), y de señalar las consultas lentas.
+
+    El historial se guarda en un archivo JSON Lines si se indica
+    ``history_path``: cada consulta y cada actualización añaden una línea, y el
+    archivo solo se reescribe al compactarlo. Las consultas lentas se añaden
+    además a un registro aparte, también en JSON Lines.
+    """
+
+    def __init__(
+        self,
+        history_path: Optional[str] = None,
+        slow_query_threshold: float = 2.0,
+        max_entries: int = 500,
+    ):
+        """
+        Args:
+            history_path (str, optional): Archivo JSON Lines donde persistir el historial.
+                                          Si es None, el historial solo vive en memoria.
+            slow_query_threshold (float): Segundos a partir de los cuales una
+                                          consulta se considera lenta.
+            max_entries (int): Número máximo de entradas conservadas.
+        """
+        self.history_path = history_path
+        self.slow_log_path = (
+            os.path.splitext(history_path)[0] + "_slow.jsonl" if history_path else None
+        )
+        self.slow_query_threshold = slow_query_threshold
+        self.max_entries = max_entries
+        self._entries: list[dict] = []
+        self._next_id = 1
+        # Líneas escritas en el archivo del historial desde la última compactación
+        self._file_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """
+        Carga el historial persistido, si existe. Acepta también el formato
+        anterior (un array JSON), que se convierte a JSON Lines.
+        """
+        if not self.history_path or not os.path.exists(self.history_path):
+            return
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as history_file:
+                content = history_file.read()
+            legacy = content.lstrip().startswith("[")
+            if legacy:
+                records = json.loads(content)
+            else:
+                records = []
+                for line in content.splitlines():
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Línea incompleta (p. ej. si la aplicación terminó al escribirla)
+                        continue
+            # Las actualizaciones repiten la entrada completa: prevalece la última
+            entries = {record["id"]: record for record in records}
+            self._entries = list(entries.values())[-self.max_entries:]
+            self._next_id = max(entries, default=0) + 1
+            self._file_lines = len(records)
+            print(f"QueryHistory: {len(self._entries)} consultas cargadas desde {self.history_path}")
+        except Exception as e:
+            self._entries = []
+            print(f"QueryHistory Error: No se pudo leer el historial: {e}")
+            return
+        # Se reescribe también si la última línea quedó incompleta, para que la
+        # siguiente entrada no se añada a continuación de ella
+        truncated = not content.endswith("\n") and bool(content)
+        if legacy or truncated or self._file_lines >= COMPACT_RATIO * self.max_entries:
+            self._compact()
+
+    def _append(self, entry: dict):
+        """Añade la entrada al archivo del historial (se llama con el lock adquirido)."""
+        if not self.history_path:
+            return
+        try:
+            history_dir = os.path.dirname(os.path.abspath(self.history_path))
+            os.makedirs(history_dir, exist_ok=True)
+            with open(self.history_path, "a", encoding="utf-8") as history_file:
+                history_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file_lines += 1
+        except Exception as e:
+            print(f"QueryHistory Error: No se pudo guardar el historial: {e}")
+            return
+        if self._file_lines >= COMPACT_RATIO * self.max_entries:
+            self._compact()
+
+    def _compact(self):
+        """
+        Reescribe el archivo del historial con las entradas actuales, sin las
+        podadas ni las versiones anteriores (se llama con el lock adquirido).
+        """
+        if not self.history_path:
+            return
+        temporary_path = self.history_path + ".tmp"
+        try:
+            history_dir = os.path.dirname(os.path.abspath(self.history_path))
+            os.makedirs(history_dir, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as history_file:
+                for entry in self._entries:
+                    history_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(temporary_path, self.history_path)
+            self._file_lines = len(self._entries)
+        except Exception as e:
+            print(f"QueryHistory Error: No se pudo compactar el historial: {e}")
+
+    def _log_slow_query(self, entry: dict):
+        """Añade una consulta lenta al registro de consultas lentas."""
+        print(
+            f"QueryHistory: Consulta lenta ({entry['wall_time']:.2f} s): {entry['query'][:120]}"
+        )
+        if not self.slow_log_path:
+            return
+        try:
+            with open(self.slow_log_path, "a", encoding="utf-8") as slow_log:
+                slow_log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"QueryHistory Error: No se pudo escribir el registro de consultas lentas: {e}")
+
+    def record(
+        self,
+        query: str,
+        wall_time: float,
+        rows_returned: Optional[int] = None,
+        bytes_materialized: int = 0,
+        cache_hits: int = 0,
+        dataset_version: Optional[int] = None,
+        status: str = "ok",
+    ) -> dict:
+        """
+        Registra una consulta ejecutada.
+
+        Args:
+            query (str): Texto SQL de la consulta.
+            wall_time (float): Tiempo de reloj en segundos.
+            rows_returned (int, optional): Filas del resultado (None si se desconoce).
+            bytes_materialized (int): Bytes traídos a memoria desde DuckDB.
+            cache_hits (int): 1 si se reutilizó el resultado de una ejecución
+                              anterior en lugar de ejecutar la consulta.
+            dataset_version (int, optional): Versión de los datos consultados.
+            status (str): 'ok', 'error', 'timeout' o 'cancelled'.
+
+        Returns:
+            dict: La entrada registrada (puede actualizarse con ``update_entry``).
+        """
+        with self._lock:
+            entry = {
+                "id": self._next_id,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "query": query.strip(),
+                "dataset_version": dataset_version,
+                "wall_time": round(wall_time, 6),
+                "rows_returned": rows_returned,
+                "bytes_materialized": int(bytes_materialized),
+                "cache_hits": int(cache_hits),
+                "status": status,
+                "slow": wall_time >= self.slow_query_threshold,
+            }
+            self._next_id += 1
+            self._entries.append(entry)
+            del self._entries[: -self.max_entries]
+            self._append(entry)
+            if entry["slow"]:
+                self._log_slow_query(entry)
+        return entry
+
+    def update_entry(self, entry: dict, **fields):
+        """
+        Actualiza una entrada ya registrada, p. ej. con las filas y los bytes
+        acumulados mientras se pagina el resultado.
+        """
+        with self._lock:
+            entry.update(fields)
+            # Una entrada ya podada no vuelve al archivo
+            if self._entries and entry["id"] >= self._entries[0]["id"]:
+                self._append(entry)
+
+    def get_entries(self, limit: Optional[int] = None, slow_only: bool = False) -> list[dict]:
+        """
+        Retorna las entradas del historial, de la más reciente a la más antigua.
+
+        Args:
+            limit (int, optional): Número máximo de entradas a retornar.
+            slow_only (bool): Si es True, solo retorna las consultas lentas.
+        """
+        with self._lock:
+            entries = [
+                entry for entry in reversed(self._entries)
+                if not slow_only or entry["slow"]
+            ]
+        return entries[:limit] if limit else entries
+
+    def get_slow_queries(self, limit: Optional[int] = None) -> list[dict]:
+        """Retorna las consultas que superaron el umbral de lentitud."""
+        return self.get_entries(limit=limit, slow_only=True)
+
+    def get_query_statistics(self) -> list[dict]:
+        """
+        Agrupa el historial por texto SQL (normalizado) para detectar las
+        consultas recurrentes que merece la pena precalcular.
+
+        Returns:
+            list[dict]: Por consulta: ``query``, ``executions``, ``total_time``,
+                        ``mean_time``, ``max_time``, ``slow_executions`` y
+                        ``cache_hits`` (ejecuciones que reutilizaron un resultado),
+                        ordenado por tiempo total descendente.
+        """
+        statistics: dict[str, dict] = {}
+        with self._lock:
+            for entry in self._entries:
+                key = " ".join(entry["query"].lower().split())
+                stats = statistics.setdefault(
+                    key,
+                    {
+                        "query": entry["query"],
+                        "executions": 0,
+                        "total_time": 0.0,
+                        "max_time": 0.0,
+                        "slow_executions": 0,
+                        "cache_hits": 0,
+                    },
+                )
+                stats["executions"] += 1
+                stats["total_time"] += entry["wall_time"]
+                stats["max_time"] = max(stats["max_time"], entry["wall_time"])
+                stats["slow_executions"] += int(entry["slow"])
+                # Las entradas antiguas contaban páginas releídas: cuenta como mucho 1
+                stats["cache_hits"] += int(entry.get("cache_hits", 0) > 0)
+
+        for stats in statistics.values():
+            stats["mean_time"] = stats["total_time"] / stats["executions"]
+        return sorted(statistics.values(), key=lambda s: s["total_time"], reverse=True)
+
+    def clear(self):
+        """Elimina todas las entradas del historial."""
+        with self._lock:
+            self._entries.clear()
+            self._compact()
@@ -0,0 +1,159 @@
+import copy
+import functools
+import threading
+import weakref
+import pandas as pd
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResultCache:
+    """
+    Caché LRU acotada de resultados calculados sobre DataFrames.
+
+    La clave combina la identidad del DataFrame (``id`` más una referencia
+    débil que descarta identificadores reutilizados), la versión de los datos,
+    el nombre del cálculo y sus argumentos. Cuando cambia la versión, las
+    entradas anteriores dejan de coincidir y se eliminan con ``invalidate``.
+
+    Los resultados se comparten entre llamadas: como mucho se retorna una
+    copia superficial (ver ``_share``), cuyo coste no depende del tamaño de
+    los datos. Quien necesite modificar un resultado en profundidad debe
+    copiarlo antes.
+    """
+
+    def __init__(self, max_entries: int = 64, version_provider=None, copy_results: bool = True):
+        """
+        Args:
+            max_entries (int): Número máximo de resultados guardados.
+            version_provider (callable, optional): Función sin argumentos que
+                retorna la versión actual de los datos (p. ej.
+                ``AppState.get_dataset_version``).
+            copy_results (bool): Retornar copias superficiales de los resultados
+                (ver ``_share``). Desactivarlo para resultados que nadie modifica
+                (p. ej. arrays de solo lectura).
+
+        Raises:
+            ValueError: Si ``max_entries`` no es positivo.
+        """
+        if max_entries <= 0:
+            raise ValueError("ResultCache Error: max_entries debe ser mayor que cero.")
+        self.max_entries = max_entries
+        self.version_provider = version_provider
+        self.copy_results = copy_results
+        self.hits = 0
+        self.misses = 0
+        # Clave -> (referencia débil al DataFrame, versión, resultado)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current_version(self) -> Optional[int]:
+        """Retorna la versión actual de los datos, o None si no hay proveedor."""
+        return self.version_provider() if self.version_provider is not None else None
+
+    @classmethod
+    def _freeze(cls, value):
+        """Convierte listas, tuplas y diccionarios en una forma hashable."""
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._freeze(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(sorted((key, cls._freeze(item)) for key, item in value.items()))
+        hash(value)  # TypeError si el argumento no es hashable
+        return value
+
+    @classmethod
+    def _share(cls, result):
+        """
+        Copia superficial de un resultado: un DataFrame o una Series nuevos
+        sobre los mismos datos, o el mismo diccionario, lista o tupla con los
+        mismos valores. Protege la estructura del resultado guardado (añadir
+        claves o columnas, renombrar...) sin copiar los datos.
+        """
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            return result.copy(deep=False)
+        if isinstance(result, (dict, list, set)):
+            return copy.copy(result)
+        if type(result) is tuple:
+            return tuple(cls._share(item) for item in result)
+        # Índices, escalares y cadenas son inmutables
+        return result
+
+    def get_or_compute(self, df: pd.DataFrame, name: str, args: tuple, kwargs: dict, compute):
+        """
+        Retorna el resultado guardado para ``df`` y los argumentos, o lo calcula
+        con ``compute()`` y lo guarda. Por defecto se retorna una copia
+        superficial (ver ``_share``).
+
+        Args:
+            df (pd.DataFrame): El DataFrame sobre el que se calcula.
+            name (str): Nombre del cálculo.
+            args (tuple): Argumentos posicionales del cálculo.
+            kwargs (dict): Argumentos con nombre del cálculo.
+            compute (callable): Función sin argumentos que calcula el resultado.
+        """
+        try:
+            arguments = (self._freeze(args), self._freeze(kwargs))
+        except TypeError:
+            # Argumentos no hashables: el resultado no se guarda
+            return compute()
+
+        version = self._current_version()
+        key = (id(df), version, name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is df:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._share(entry[2]) if self.copy_results else entry[2]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = (weakref.ref(df), version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._share(result) if self.copy_results else result
+
+    def invalidate(self):
+        """
+        Elimina las entradas de versiones anteriores y las de DataFrames que ya
+        no existen. Sin proveedor de versión, vacía la caché.
+        """
+        version = self._current_version()
+        with self._lock:
+            if self.version_provider is None:
+                self._entries.clear()
+                return
+            for key in [
+                key
+                for key, (reference, entry_version, _) in self._entries.items()
+                if entry_version != version or reference() is None
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def memoized(method):
+    """
+    Decorador para métodos cuyo primer argumento es un DataFrame: guarda el
+    resultado en la ``ResultCache`` del objeto (atributo ``_result_cache``).
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, df, *args, **kwargs):
+        cache = getattr(self, "_result_cache", None)
+        if cache is None or not isinstance(df, pd.DataFrame):
+            return method(self, df, *args, **kwargs)
+        return cache.get_or_compute(
+            df, method.__name__, args, kwargs, lambda: method(self, df, *args, **kwargs)
+        )
+
+    return wrapper
@@ -0,0 +1,203 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+# Si al restar filas la suma de cuadrados de desviaciones que queda es menor
+# que esta fracción de la anterior (p. ej. al eliminar valores atípicos), la
+# resta perdería precisión y la columna se recalcula
+M2_RECOMPUTE_RATIO = 1e-6
+
+
+class RunningStatistics:
+    """
+    Estadísticas por columna del DataFrame activo (conteo, nulos, media, suma
+    de cuadrados de las desviaciones a la media, mínimo y máximo), mantenidas
+    de forma incremental.
+
+    Cuando se eliminan filas, la media y la suma de cuadrados de desviaciones
+    (M2) de las filas que quedan se obtienen invirtiendo la fórmula de
+    combinación de Chan et al.; al trabajar con desviaciones a la media, la
+    varianza no pierde precisión con valores grandes (marcas de tiempo,
+    identificadores...). El mínimo o el máximo solo se recalculan en las
+    columnas donde una fila eliminada era el extremo. Si cambian columnas,
+    solo se recalculan esas columnas.
+    """
+
+    def __init__(self):
+        self.num_rows = 0
+        self.version: Optional[int] = None
+        self.last_refresh = {"mode": None, "seconds": 0.0}
+        # Columna -> acumuladores, en el orden de las columnas del DataFrame
+        self._columns: dict = {}
+
+    @staticmethod
+    def _is_numeric(series: pd.Series) -> bool:
+        """Numérica para las estadísticas (los booleanos no cuentan)."""
+        return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+    def _compute_column(self, series: pd.Series) -> dict:
+        """Calcula los acumuladores de una columna."""
+        nulls = int(series.isna().sum())
+        accumulators = {
+            "dtype": str(series.dtype),
+            "is_numeric": self._is_numeric(series),
+            "count": len(series) - nulls,
+            "nulls": nulls,
+        }
+        if accumulators["is_numeric"]:
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+            # Dos pasadas: la media y después las desviaciones a la media
+            mean = float(values.mean()) if len(values) else 0.0
+            accumulators["mean"] = mean
+            accumulators["m2"] = float(np.square(values - mean).sum())
+            accumulators["min"] = float(values.min()) if len(values) else None
+            accumulators["max"] = float(values.max()) if len(values) else None
+        return accumulators
+
+    def refresh(self, df: pd.DataFrame, version: Optional[int] = None):
+        """Recalcula las estadísticas de todas las columnas de ``df``."""
+        start_time = time.perf_counter()
+        self._columns = {column: self._compute_column(df[column]) for column in df.columns}
+        self.num_rows = len(df)
+        self.version = version
+        self.last_refresh = {"mode": "full", "seconds": time.perf_counter() - start_time}
+
+    def apply_removed_rows(
+        self,
+        df: pd.DataFrame,
+        removed_rows: pd.DataFrame,
+        version: Optional[int] = None,
+        changed_columns: Optional[list] = None,
+    ):
+        """
+        Actualiza las estadísticas tras eliminar ``removed_rows`` de ``df``.
+
+        Args:
+            df (pd.DataFrame): El DataFrame activo, ya sin las filas eliminadas.
+            removed_rows (pd.DataFrame): Las filas eliminadas.
+            version (int, optional): Versión de los datos tras el cambio.
+            changed_columns (list, optional): Columnas que además cambiaron; se
+                                              recalculan completas.
+        """
+        start_time = time.perf_counter()
+        changed = set(changed_columns or [])
+        unchanged = [column for column in df.columns if column not in changed]
+        if (
+            self.version is None
+            or self.num_rows - len(removed_rows) != len(df)
+            or any(column not in self._columns or column not in removed_rows for column in unchanged)
+        ):
+            # Las estadísticas no corresponden a los datos: se recalcula todo
+            self.refresh(df, version)
+            return
+
+        columns = {}
+        for column in df.columns:
+            if column in changed:
+                columns[column] = self._compute_column(df[column])
+                continue
+            accumulators = dict(self._columns[column])
+            delta = self._compute_column(removed_rows[column])
+            accumulators["count"] -= delta["count"]
+            accumulators["nulls"] -= delta["nulls"]
+            if accumulators["is_numeric"] and delta["count"]:
+                total_count = accumulators["count"] + delta["count"]
+                remaining = self._remove_moments(
+                    total_count, accumulators["mean"], accumulators["m2"],
+                    delta["count"], delta["mean"], delta["m2"],
+                )
+                if remaining is None:
+                    columns[column] = self._compute_column(df[column])
+                    continue
+                accumulators["mean"], accumulators["m2"] = remaining
+                # Solo se recalcula el extremo si una fila eliminada lo alcanzaba
+                if delta["min"] <= accumulators["min"] or delta["max"] >= accumulators["max"]:
+                    extremes = self._compute_column(df[column])
+                    accumulators["min"], accumulators["max"] = extremes["min"], extremes["max"]
+            columns[column] = accumulators
+
+        self._columns = columns
+        self.num_rows = len(df)
+        self.version = version
+        self.last_refresh = {"mode": "incremental", "seconds": time.perf_counter() - start_time}
+
+    @staticmethod
+    def _remove_moments(
+        count: int, mean: float, m2: float, removed_count: int, removed_mean: float, removed_m2: float
+    ) -> Optional[tuple]:
+        """
+        Media y M2 de las filas que quedan al quitar un grupo de filas, con la
+        fórmula de combinación de Chan et al. despejada para el grupo restante.
+
+        Returns:
+            tuple: (media, M2) de las filas restantes, o None si el resultado
+                   no sería preciso y conviene recalcular la columna.
+        """
+        remaining_count = count - removed_count
+        if remaining_count <= 0:
+            return 0.0, 0.0
+        remaining_mean = mean + removed_count * (mean - removed_mean) / remaining_count
+        delta = removed_mean - remaining_mean
+        remaining_m2 = m2 - removed_m2 - delta * delta * remaining_count * removed_count / count
+        if remaining_m2 <= m2 * M2_RECOMPUTE_RATIO:
+            return None
+        return remaining_mean, remaining_m2
+
+    def apply_changed_columns(
+        self, df: pd.DataFrame, changed_columns: list, version: Optional[int] = None
+    ):
+        """
+        Actualiza las estadísticas tras modificar ``changed_columns`` en ``df``.
+        Las columnas que ya no existen (p. ej. renombradas) se descartan.
+        """
+        if self.version is None or self.num_rows != len(df):
+            self.refresh(df, version)
+            return
+        start_time = time.perf_counter()
+        changed = set(changed_columns)
+        columns = {}
+        for column in df.columns:
+            if column in changed or column not in self._columns:
+                columns[column] = self._compute_column(df[column])
+            else:
+                columns[column] = self._columns[column]
+        self._columns = columns
+        self.version = version
+        self.last_refresh = {"mode": "incremental", "seconds": time.perf_counter() - start_time}
+
+    def get_summary(self) -> dict:
+        """
+        Retorna el resumen en el formato de ``DataAnalyzer.profile`` (sin
+        valores distintos ni cuartiles): ``num_rows``, ``num_cols`` y ``columns``
+        con ``dtype``, ``is_numeric``, ``non_null``, ``nulls``, ``null_percent``
+        y, si es numérica, ``sum``, ``mean``, ``std``, ``min`` y ``max``.
+        """
+        columns = {}
+        for column, accumulators in self._columns.items():
+            count = accumulators["count"]
+            column_summary = {
+                "dtype": accumulators["dtype"],
+                "is_numeric": accumulators["is_numeric"],
+                "non_null": count,
+                "nulls": accumulators["nulls"],
+                "null_percent": (
+                    round(accumulators["nulls"] / self.num_rows * 100, 2) if self.num_rows else 0.0
+                ),
+            }
+            if accumulators["is_numeric"]:
+                mean = accumulators["mean"] if count else None
+                variance = accumulators["m2"] / (count - 1) if count > 1 else None
+                column_summary.update(
+                    {
+                        "sum": mean * count if count else 0.0,
+                        "mean": mean,
+                        "std": float(np.sqrt(variance)) if variance is not None else None,
+                        "min": accumulators["min"] if count else None,
+                        "max": accumulators["max"] if count else None,
+                    }
+                )
+            columns[column] = column_summary
+        return {"num_rows": self.num_rows, "num_cols": len(columns), "columns": columns}
@@ -0,0 +1,237 @@
+"""
+Sketches (resúmenes probabilísticos) mergeables para estadísticas aproximadas.
+
+Cada sketch se actualiza por lotes (arrays de NumPy o Series de Pandas), de
+modo que un DataFrame enorme puede resumirse en una sola pasada por bloques, y
+dos sketches del mismo tipo pueden combinarse con ``merge``.
+
+Cotas de error documentadas:
+- HyperLogLog (distintos): error estándar relativo de 1.04 / sqrt(2^precision);
+  con precision=14 (16 KB de registros) es ~0.8%.
+- KLLSketch (cuantiles): error de rango normalizado de ~1.65% con k=200
+  (confianza del 99%, como en Apache DataSketches); el error disminuye ~1/k.
+- SpaceSaving (top-k): cada conteo sobrestima el real como máximo en N / capacity,
+  y todo valor con frecuencia mayor que N / capacity está en el resumen.
+"""
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+def hash_values(values) -> np.ndarray:
+    """Retorna un hash de 64 bits (uint64) por valor, estable entre lotes."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    Estimador HyperLogLog del número de valores distintos.
+    Usa 2^precision registros de un byte.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog Error: precision debe estar entre 4 y 18.")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Error estándar relativo teórico del estimador."""
+        return 1.04 / np.sqrt(self.num_registers)
+
+    def update(self, values):
+        """Añade un lote de valores (los nulos deben filtrarse antes)."""
+        if len(values) == 0:
+            return
+        hashes = hash_values(values)
+        remaining_bits = 64 - self.precision
+        register_index = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Posición del primer bit a 1 en los bits restantes; con precision >= 11
+        # el resto cabe en la mantisa de un float64 y frexp es exacto
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rank = (remaining_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, register_index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        """Combina otro sketch con la misma precisión."""
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog Error: No se pueden combinar precisiones distintas.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """Retorna el número estimado de valores distintos."""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw_estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw_estimate <= 2.5 * m and zeros:
+            # Rango pequeño: conteo lineal
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw_estimate))
+
+
+class KLLSketch:
+    """
+    Sketch KLL de cuantiles para valores numéricos.
+
+    Mantiene una jerarquía de compactadores: el nivel h guarda elementos con
+    peso 2^h y, cuando se llena, se ordena y promueve uno de cada dos
+    elementos (con desplazamiento aleatorio) al nivel siguiente.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("KLLSketch Error: k debe ser al menos 8.")
+        self.k = k
+        self.count = 0
+        self.min_value = np.inf
+        self.max_value = -np.inf
+        self._levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self) -> float:
+        """Error de rango normalizado aproximado (confianza del 99%)."""
+        return 0.0165 * 200 / self.k
+
+    def _capacity(self, level: int) -> int:
+        """Capacidad de un nivel: los niveles bajos decrecen geométricamente (c = 2/3)."""
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """Compacta los niveles que superan su capacidad."""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # Si el número es impar, el último elemento se queda en su nivel
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[: len(items) - len(keep)]
+                promoted = pairs[int(self._rng.integers(2)) :: 2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                # Añadir un nivel cambia las capacidades: se revisa desde el principio
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """Añade un lote de valores numéricos (los NaN se ignoran)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Combina otro sketch KLL."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self._compress()
+
+    def quantiles(self, fractions) -> list:
+        """
+        Retorna los cuantiles aproximados (None si el sketch está vacío).
+        El mínimo y el máximo (fracciones 0 y 1) son exactos.
+        """
+        if not self.count:
+            return [None for _ in fractions]
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min_value)
+            elif fraction >= 1:
+                results.append(self.max_value)
+            else:
+                position = np.searchsorted(cumulative, fraction * cumulative[-1], side="left")
+                results.append(float(items[min(position, len(items) - 1)]))
+        return results
+
+
+class SpaceSaving:
+    """
+    Resumen Space-Saving de los valores más frecuentes (top-k).
+
+    Conserva ``capacity`` contadores. Cada lote se cuenta de forma exacta y
+    se combina con el resumen; un valor ausente de un resumen lleno cuenta
+    como su contador mínimo, lo que mantiene la cota N / capacity al combinar.
+    """
+
+    def __init__(self, capacity: int = 100):
+        if capacity < 1:
+            raise ValueError("SpaceSaving Error: capacity debe ser mayor que cero.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts = pd.Series(dtype="int64")
+        self._errors = pd.Series(dtype="int64")
+
+    @property
+    def max_error(self) -> float:
+        """Sobrestimación máxima de cualquier conteo: N / capacity."""
+        return self.total / self.capacity
+
+    def _floor(self) -> int:
+        """Conteo asignado a un valor ausente: el mínimo si el resumen está lleno."""
+        return int(self._counts.min()) if len(self._counts) >= self.capacity else 0
+
+    def _combine(self, counts: pd.Series, errors: pd.Series, floor: int, total: int):
+        """Combina un resumen (conteos, errores y suelo) con el actual."""
+        own_floor = self._floor()
+        index = self._counts.index.union(counts.index)
+        combined = self._counts.reindex(index, fill_value=own_floor) + counts.reindex(
+            index, fill_value=floor
+        )
+        combined_errors = self._errors.reindex(index, fill_value=own_floor) + errors.reindex(
+            index, fill_value=floor
+        )
+        top = combined.nlargest(self.capacity, keep="first").index
+        self._counts = combined.loc[top]
+        self._errors = combined_errors.loc[top]
+        self.total += total
+
+    def update(self, values):
+        """Añade un lote de valores (los nulos se ignoran)."""
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        batch_counts = series.value_counts(dropna=True)
+        if batch_counts.empty:
+            return
+        total = int(batch_counts.sum())
+        kept = batch_counts.iloc[: self.capacity].astype("int64")
+        # Los valores descartados del lote tienen como mucho el conteo del último conservado
+        floor = int(kept.iloc[-1]) if len(batch_counts) > self.capacity else 0
+        self._combine(kept, pd.Series(0, index=kept.index, dtype="int64"), floor, total)
+
+    def merge(self, other: "SpaceSaving"):
+        """Combina otro resumen Space-Saving."""
+        self._combine(other._counts, other._errors, other._floor(), other.total)
+
+    def top(self, n: int = 10) -> pd.Series:
+        """Retorna los ``n`` valores más frecuentes con su conteo estimado."""
+        return self._counts.nlargest(n, keep="first")
+
+    def get_error(self, value) -> int:
+        """Retorna la cota de sobrestimación del conteo de un valor del resumen."""
+        return int(self._errors.get(value, self._floor()))
@@ -16,6 +16,7 @@ setup(
         "matplotlib>=3.8.4",
         "seaborn>=0.13.2",
         "duckdb>=0.10.0",
+        "pyarrow>=14.0.0",
         "black>=24.0.0",
         "flake8>=7.0.0",
         "isort>=5.13.0",
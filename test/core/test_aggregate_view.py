@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.query_engine import QueryEngine
+
+AGGREGATIONS = [
+    ("sum", "value"),
+    ("count", "value"),
+    ("min", "value"),
+    ("max", "value"),
+    ("mean", "amount"),
+]
+
+GROUP_BY_SQL = """
+    SELECT city, year, SUM(value) AS sum_value, COUNT(value) AS count_value,
+           MIN(value) AS min_value, MAX(value) AS max_value, AVG(amount) AS mean_amount
+    FROM my_table GROUP BY city, year
+"""
+
+
+def make_frame(rows: int = 2_000, seed: int = 0, null_keys: bool = True) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "city": pd.Series(rng.choice(["Lima", "Quito", "Bogotá"], rows), dtype=object),
+            "year": rng.integers(2020, 2023, rows).astype("float64"),
+            "value": rng.normal(50, 10, rows),
+            "amount": rng.integers(0, 100, rows),
+        }
+    )
+    df.loc[rng.random(rows) < 0.1, "value"] = np.nan
+    if null_keys:
+        df.loc[rng.random(rows) < 0.05, "city"] = None
+        df.loc[rng.random(rows) < 0.05, "year"] = np.nan
+    return df
+
+
+def full_group_by(engine: QueryEngine, df: pd.DataFrame) -> pd.DataFrame:
+    """Resultado de referencia: el GROUP BY completo con DuckDB."""
+    return engine.execute_query_on_dataframe(df, GROUP_BY_SQL)
+
+
+def assert_same_groups(result: pd.DataFrame, expected: pd.DataFrame):
+    keys = ["city", "year"]
+    normalize = lambda frame: (
+        frame.assign(city=frame["city"].fillna("<null>"), year=frame["year"].fillna(-1))
+        .sort_values(keys)
+        .reset_index(drop=True)[expected.columns]
+    )
+    pd.testing.assert_frame_equal(
+        normalize(result), normalize(expected), check_dtype=False, rtol=1e-9
+    )
+
+
+def make_engine(df: pd.DataFrame) -> QueryEngine:
+    engine = QueryEngine()
+    engine.create_aggregate_view("by_city", df, ["city", "year"], AGGREGATIONS, version=1)
+    return engine
+
+
+@pytest.mark.parametrize("null_keys", [False, True])
+def test_removed_rows_update_incrementally(null_keys):
+    df = make_frame(null_keys=null_keys)
+    engine = make_engine(df)
+    # Se eliminan las filas con los extremos de algunos grupos y un grupo entero
+    removed_index = df["value"].nlargest(20).index.union(df.sample(300, random_state=1).index)
+    removed_index = removed_index.union(df.index[(df["city"] == "Quito") & (df["year"] == 2021)])
+    removed, remaining = df.loc[removed_index], df.drop(removed_index)
+    engine.handle_dataset_change(
+        {"version": 2, "kind": "updated", "dataframe": remaining, "removed_rows": removed}
+    )
+
+    assert engine.list_aggregate_views()[0]["last_refresh"]["mode"] == "incremental"
+    assert_same_groups(engine.get_aggregate_view("by_city"), full_group_by(engine, remaining))
+
+
+@pytest.mark.parametrize("null_keys", [False, True])
+def test_added_rows_update_incrementally(null_keys):
+    df = make_frame(null_keys=null_keys)
+    engine = make_engine(df)
+    added = make_frame(500, seed=1, null_keys=null_keys)
+    added.loc[:9, "city"] = "Caracas"  # Grupos nuevos
+    combined = pd.concat([df, added], ignore_index=True)
+    engine.handle_dataset_change(
+        {"version": 2, "kind": "updated", "dataframe": combined, "added_rows": added}
+    )
+
+    assert engine.list_aggregate_views()[0]["last_refresh"]["mode"] == "incremental"
+    assert_same_groups(engine.get_aggregate_view("by_city"), full_group_by(engine, combined))
+
+
+def test_changed_value_column_and_replacement():
+    df = make_frame()
+    engine = make_engine(df)
+    changed = df.assign(value=df["value"] * 2)
+    engine.handle_dataset_change(
+        {"version": 2, "kind": "updated", "dataframe": changed, "changed_columns": ["value"]}
+    )
+    assert engine.list_aggregate_views()[0]["last_refresh"]["mode"] == "incremental"
+    assert_same_groups(engine.get_aggregate_view("by_city"), full_group_by(engine, changed))
+
+    replaced = make_frame(300, seed=3)
+    engine.handle_dataset_change({"version": 3, "kind": "replaced", "dataframe": replaced})
+    assert engine.list_aggregate_views()[0]["last_refresh"]["mode"] == "full"
+    assert_same_groups(engine.get_aggregate_view("by_city"), full_group_by(engine, replaced))
+
+
+def test_view_is_queryable_by_sql():
+    df = make_frame(null_keys=False)
+    engine = make_engine(df)
+    result = engine.execute_query_on_dataframe(df, "SELECT SUM(count_value) AS total FROM by_city")
+    assert result["total"].iloc[0] == df["value"].count()
+
+
+def test_single_null_key_group_updates_incrementally():
+    df = pd.DataFrame(
+        {
+            "city": pd.Series(["Lima", None, "Quito", np.nan, None, "Lima"], dtype=object),
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+    engine = QueryEngine()
+    engine.create_aggregate_view("by_city", df, ["city"], [("sum", "value"), ("max", "value")])
+    removed, remaining = df.iloc[[4]], df.drop(index=4)
+    engine.handle_dataset_change(
+        {"version": 2, "kind": "updated", "dataframe": remaining, "removed_rows": removed}
+    )
+
+    assert engine.list_aggregate_views()[0]["last_refresh"]["mode"] == "incremental"
+    result = engine.get_aggregate_view("by_city").set_index("city")
+    assert result.loc[np.nan, "sum_value"] == 6.0
+    assert result.loc[np.nan, "max_value"] == 4.0
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from core.app_state import AppState
+from core.query_engine import QueryEngine
+
+
+def make_frame(rows: int = 4, offset: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(rows), "value": [offset + i for i in range(rows)]})
+
+
+def test_loaded_files_can_be_joined_with_the_active_table():
+    app_state = AppState()
+    app_state.load_dataframe(pd.DataFrame({"id": [0, 1, 2], "name": ["a", "b", "c"]}), "names.csv")
+    app_state.load_dataframe(make_frame(), "sales.xlsx")
+
+    tables = app_state.get_query_tables()
+    assert set(tables) == {"names", "sales", "my_table", "active", "original"}
+
+    query_cursor = QueryEngine().open_query_cursor(
+        app_state.get_active_dataframe(),
+        "SELECT n.name, m.value FROM my_table m JOIN names n USING (id) ORDER BY m.id",
+        tables=tables,
+    )
+    try:
+        page = query_cursor.fetch_page(0)
+    finally:
+        query_cursor.close()
+    assert page["name"].tolist() == ["a", "b", "c"]
+    assert page["value"].tolist() == [0, 1, 2]
+
+
+def test_reloading_a_file_replaces_the_previous_version():
+    app_state = AppState()
+    app_state.load_dataframe(make_frame(), "sales.csv")
+    reloaded = make_frame(offset=10)
+    app_state.load_dataframe(reloaded, "sales.csv")
+
+    datasets = app_state.get_loaded_datasets()
+    assert list(datasets) == ["sales"]
+    assert datasets["sales"] is reloaded
+
+
+def test_oldest_datasets_are_evicted_beyond_the_limit():
+    app_state = AppState(max_loaded_datasets=2)
+    for name in ("a.csv", "b.csv", "c.csv"):
+        app_state.load_dataframe(make_frame(), name)
+    assert list(app_state.get_loaded_datasets()) == ["b", "c"]
+
+    # Recargar 'b' lo convierte en el más reciente, así que se descarta 'c'
+    app_state.load_dataframe(make_frame(), "b.csv")
+    app_state.load_dataframe(make_frame(), "d.csv")
+    assert list(app_state.get_loaded_datasets()) == ["b", "d"]
+
+
+def test_unload_dataset_keeps_the_active_dataframe():
+    app_state = AppState()
+    app_state.load_dataframe(make_frame(), "sales.csv")
+
+    assert app_state.unload_dataset("sales") is True
+    assert app_state.unload_dataset("sales") is False
+    assert "sales" not in app_state.get_query_tables()
+    assert app_state.get_active_dataframe() is not None
+
+
+def test_max_loaded_datasets_must_be_positive():
+    with pytest.raises(ValueError):
+        AppState(max_loaded_datasets=0)
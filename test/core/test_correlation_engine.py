@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.correlation_engine import CorrelationEngine
+
+
+def make_frame(rows: int = 5_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0, 1, rows)
+    df = pd.DataFrame(
+        {
+            "base": base,
+            "related": 2 * base + rng.normal(0, 0.5, rows),
+            "offset": 100 + base + rng.normal(0, 1, rows),
+            "integer": rng.integers(0, 100, rows),
+            "nullable": pd.array(rng.integers(0, 10, rows), dtype="Int64"),
+            "label": rng.choice(["a", "b"], rows),
+        }
+    )
+    df.loc[rng.random(rows) < 0.1, "related"] = np.nan
+    df.loc[rng.random(rows) < 0.2, "offset"] = np.nan
+    df.loc[rng.random(rows) < 0.05, "nullable"] = pd.NA
+    return df
+
+
+@pytest.mark.parametrize("chunk_size", [1_000_000, 777])
+def test_pearson_and_covariance_match_pandas_with_pairwise_nulls(chunk_size):
+    df = make_frame()
+    numeric = df.drop(columns="label").astype("float64")
+    engine = CorrelationEngine(chunk_size=chunk_size)
+    pd.testing.assert_frame_equal(engine.correlation(df), numeric.corr(), rtol=1e-9, atol=1e-12)
+    pd.testing.assert_frame_equal(engine.covariance(df), numeric.cov(), rtol=1e-9, atol=1e-12)
+
+
+def test_spearman_matches_pandas_without_nulls():
+    df = make_frame().dropna()
+    numeric = df.drop(columns="label").astype("float64")
+    result = CorrelationEngine().correlation(df, method="spearman")
+    pd.testing.assert_frame_equal(result, numeric.corr(method="spearman"), rtol=1e-9, atol=1e-12)
+
+
+def test_large_values_match_two_pass_reference():
+    # Pandas pierde precisión con valores grandes y poca varianza; la referencia
+    # es la fórmula de dos pasadas de NumPy sobre las filas completas
+    rng = np.random.default_rng(1)
+    base = rng.normal(0, 1, 5_000)
+    df = pd.DataFrame({"base": base, "offset": 1e9 + base * 1e-3 + rng.normal(0, 1e-3, 5_000)})
+    result = CorrelationEngine(chunk_size=999).correlation(df)
+    expected = np.corrcoef(df["base"], df["offset"])[0, 1]
+    assert result.loc["base", "offset"] == pytest.approx(expected, rel=1e-7)
+
+
+def test_min_periods_and_constant_columns_match_pandas():
+    df = pd.DataFrame(
+        {
+            "sparse": [1.0, np.nan, np.nan, 4.0, np.nan, 6.0],
+            "dense": [1.0, 2.0, 3.0, 5.0, 8.0, 13.0],
+            "constant": [7.0] * 6,
+        }
+    )
+    engine = CorrelationEngine()
+    for min_periods in (1, 3, 4):
+        pd.testing.assert_frame_equal(
+            engine.correlation(df, min_periods=min_periods), df.corr(min_periods=min_periods)
+        )
+        pd.testing.assert_frame_equal(
+            engine.covariance(df, min_periods=min_periods),
+            df.cov(min_periods=min_periods),
+            atol=1e-12,
+        )
+
+
+def test_rejects_non_numeric_columns():
+    with pytest.raises(ValueError):
+        CorrelationEngine().correlation(make_frame(10), columns=["base", "label"])
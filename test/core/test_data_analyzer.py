@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_analyzer import DataAnalyzer
+
+
+def make_large_values(rows: int = 100_000, seed: int = 0) -> pd.DataFrame:
+    """Columnas de gran magnitud y poca varianza (marcas de tiempo, identificadores)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "timestamp": 1.7e9 + rng.normal(0, 0.5, rows),
+            "identifier": 10**9 + rng.integers(0, 100, rows),
+        }
+    )
+
+
+def test_profile_approximate_moments_are_precise_across_chunks():
+    df = make_large_values()
+    chunks = (df.iloc[start : start + 7_000] for start in range(0, len(df), 7_000))
+    profile = DataAnalyzer(cache_size=0).profile_approximate(chunks)
+    for column in df.columns:
+        result = profile["columns"][column]
+        assert result["non_null"] == len(df)
+        assert result["mean"] == pytest.approx(df[column].mean(), rel=1e-12)
+        assert result["std"] == pytest.approx(df[column].std(), rel=1e-7)
+
+
+def test_profile_matches_pandas_describe():
+    rng = np.random.default_rng(1)
+    values = rng.normal(10, 3, 10_001)
+    values[::13] = np.nan
+    df = pd.DataFrame(
+        {
+            "real": values,
+            "integer": rng.integers(-50, 50, 10_001),
+            "nullable": pd.array(rng.integers(0, 20, 10_001), dtype="Int64"),
+        }
+    )
+    df.loc[::17, "nullable"] = pd.NA
+    profile = DataAnalyzer(cache_size=0).profile(df, approximate=False)
+    for column in df.columns:
+        expected = df[column].astype("float64").describe()
+        result = profile["columns"][column]
+        assert result["nulls"] == df[column].isna().sum()
+        assert result["distinct"] == df[column].nunique()
+        for name in ("mean", "std", "min", "25%", "50%", "75%", "max"):
+            assert result[name] == pytest.approx(expected[name], rel=1e-12)
+    # El perfil no reordena los datos del DataFrame
+    np.testing.assert_array_equal(df["real"].to_numpy(), values)
+
+
+def test_profile_counts_distinct_large_integers_exactly():
+    df = pd.DataFrame({"identifier": np.array([2**53, 2**53 + 1, 2**53 + 2], dtype="int64")})
+    profile = DataAnalyzer(cache_size=0).profile(df, approximate=False)
+    assert profile["columns"]["identifier"]["distinct"] == 3
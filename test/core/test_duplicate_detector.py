@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.duplicate_detector import DuplicateDetector
+
+
+# Pares de valores cuyo hash coincide sin que Pandas los considere iguales,
+# o que Pandas considera iguales con bits distintos
+VALUE_PAIRS = [
+    [1, "1"],
+    [None, np.nan],
+    [True, "True"],
+    [1, 1.0],
+    [True, 1],
+    [pd.NA, None],
+    ["None", None],
+    ["nan", np.nan],
+]
+
+
+def make_frame(values: list, dtype=None) -> pd.DataFrame:
+    """Repite los valores en distinto orden junto a una columna constante."""
+    column = pd.Series(values * 3 + values[::-1], dtype=dtype)
+    return pd.DataFrame({"value": column, "group": ["g"] * len(column)})
+
+
+@pytest.mark.parametrize("values", VALUE_PAIRS, ids=repr)
+@pytest.mark.parametrize("subset", [None, ["value"]])
+@pytest.mark.parametrize("keep", ["first", "last", False])
+def test_object_values_match_pandas(values, subset, keep):
+    df = make_frame(values, dtype=object)
+    detector = DuplicateDetector()
+    expected = df.duplicated(subset=subset, keep=keep).to_numpy()
+    np.testing.assert_array_equal(detector.duplicated(df, subset, keep), expected)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "Float64", "complex128"])
+def test_signed_zeros_and_nan_match_pandas(dtype):
+    values = [0.0, -0.0, np.nan, float("-nan"), 1.5]
+    df = make_frame(values, dtype=dtype)
+    detector = DuplicateDetector()
+    for keep in ("first", "last", False):
+        expected = df.duplicated(keep=keep).to_numpy()
+        np.testing.assert_array_equal(detector.duplicated(df, keep=keep), expected)
+    assert detector.count_duplicates(df) == int(df.duplicated().sum())
+
+
+def test_nan_payloads_are_duplicates():
+    payload_nan = np.frombuffer(np.uint64(0x7FF8000000000001).tobytes(), dtype="float64")[0]
+    df = pd.DataFrame({"value": [np.nan, payload_nan]})
+    assert DuplicateDetector().count_duplicates(df) == int(df.duplicated().sum()) == 1
+
+
+def test_count_and_groups_match_pandas_on_mixed_frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "number": rng.integers(0, 5, 2_000),
+            "text": rng.choice(["a", "b", "1"], 2_000).astype(object),
+            "mixed": pd.Series(rng.choice([1, 2], 2_000), dtype=object),
+        }
+    )
+    df.loc[::7, "mixed"] = "1"
+    detector = DuplicateDetector()
+
+    assert detector.count_duplicates(df) == int(df.duplicated().sum())
+
+    groups = detector.duplicate_groups(df)
+    expected = df.groupby(list(df.columns), sort=False).size()
+    expected = expected[expected > 1]
+    assert groups["count"].sum() == expected.sum()
+    assert sorted(groups["count"]) == sorted(expected)
+    for row in groups.itertuples(index=False):
+        first = df.loc[row.first_row]
+        assert (first["number"], first["text"], first["mixed"]) == (row.number, row.text, row.mixed)
+
+
+def test_duckdb_path_matches_pandas_and_skips_object_columns():
+    df = pd.DataFrame(
+        {"number": [0.0, -0.0, np.nan, np.nan, 1.0], "mixed": [1, "1", 1, "1", 2]}
+    ).astype({"mixed": object})
+    detector = DuplicateDetector(max_hash_rows=1)
+    assert detector.count_duplicates(df, ["number"]) == int(df.duplicated(["number"]).sum())
+    assert detector.count_duplicates(df) == int(df.duplicated().sum())
+    assert "first_row" in detector.duplicate_groups(df).columns
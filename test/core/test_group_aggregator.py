@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.group_aggregator import GroupAggregator
+
+AGGREGATIONS = [
+    ("count", "*"),
+    ("count", "value"),
+    ("sum", "value"),
+    ("mean", "value"),
+    ("min", "value"),
+    ("max", "amount"),
+    ("median", "value"),
+    ("std", "value"),
+    ("nunique", "amount"),
+]
+
+
+def make_frame(rows: int = 3_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "city": pd.Series(rng.choice(["Lima", "Quito", "Bogotá"], rows), dtype=object),
+            "year": rng.integers(2020, 2024, rows),
+            "value": rng.normal(50, 10, rows),
+            "amount": rng.integers(0, 30, rows),
+        }
+    )
+    df.loc[rng.random(rows) < 0.05, "city"] = None
+    df.loc[rng.random(rows) < 0.1, "value"] = np.nan
+    return df
+
+
+def pandas_reference(df: pd.DataFrame, keys: list) -> pd.DataFrame:
+    grouped = df.groupby(keys, dropna=False, sort=True)
+    return pd.DataFrame(
+        {
+            "rows": grouped.size(),
+            "count_value": grouped["value"].count(),
+            "sum_value": grouped["value"].sum(),
+            "mean_value": grouped["value"].mean(),
+            "min_value": grouped["value"].min(),
+            "max_amount": grouped["amount"].max(),
+            "median_value": grouped["value"].median(),
+            "std_value": grouped["value"].std(),
+            "nunique_amount": grouped["amount"].nunique(),
+        }
+    ).reset_index()
+
+
+def normalize_keys(frame: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """DuckDB retorna None en las claves nulas y Pandas NaN: se unifican en None."""
+    frame = frame.reset_index(drop=True)
+    frame[keys] = frame[keys].astype(object).where(frame[keys].notna(), None)
+    return frame
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "pandas"])
+@pytest.mark.parametrize("keys", [["city"], ["city", "year"]])
+def test_aggregate_matches_pandas_groupby(engine, keys):
+    df = make_frame()
+    result = GroupAggregator().aggregate(df, keys, AGGREGATIONS, engine=engine)
+    expected = pandas_reference(df, keys)
+    pd.testing.assert_frame_equal(
+        normalize_keys(result, keys), normalize_keys(expected, keys), check_dtype=False, rtol=1e-9
+    )
+
+
+def test_invalid_aggregations_raise():
+    aggregator = GroupAggregator()
+    df = make_frame(10)
+    with pytest.raises(ValueError):
+        aggregator.aggregate(df, ["city"], [("mode", "value")])
+    with pytest.raises(ValueError):
+        aggregator.aggregate(df, ["city"], [("sum", "*")])
+    with pytest.raises(ValueError):
+        aggregator.aggregate(df, ["missing"], [("count", "*")])
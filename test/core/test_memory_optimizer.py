@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.memory_optimizer import MemoryOptimizer
+from core.query_engine import QueryEngine
+
+
+def make_frame(rows: int = 2_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    mostly_null = np.full(rows, np.nan)
+    mostly_null[::20] = rng.normal(0, 1, len(mostly_null[::20]))
+    return pd.DataFrame(
+        {
+            "small": rng.integers(0, 100, rows),
+            "negative": rng.integers(-30_000, 30_000, rows),
+            "unsigned": rng.integers(0, 60_000, rows),
+            "large": rng.integers(0, 2**40, rows),
+            "halves": rng.integers(0, 1_000, rows) / 2,
+            "precise": rng.normal(0, 1, rows),
+            "mostly_null": mostly_null,
+            "city": pd.Series(rng.choice(["Lima", "Quito", None], rows), dtype=object),
+            "code": pd.Series([f"id-{number}" for number in rng.permutation(rows)], dtype=object),
+            "flag": rng.random(rows) < 0.5,
+        }
+    )
+
+
+def test_optimized_values_round_trip():
+    pytest.importorskip("pyarrow")
+    df = make_frame()
+    optimizer = MemoryOptimizer()
+    optimized, changed, bytes_before, bytes_after = optimizer.optimize(df)
+
+    assert optimized.dtypes["small"] == np.dtype("int8")
+    assert optimized.dtypes["negative"] == np.dtype("int16")
+    assert optimized.dtypes["unsigned"] == np.dtype("uint16")
+    assert optimized.dtypes["halves"] == np.dtype("float32")
+    assert isinstance(optimized.dtypes["mostly_null"], pd.SparseDtype)
+    assert isinstance(optimized.dtypes["city"], pd.CategoricalDtype)
+    assert isinstance(optimized.dtypes["code"], pd.StringDtype)
+    # Sin pérdida no hay reducción posible para estas columnas
+    assert {"large", "precise", "flag"}.isdisjoint(changed)
+    assert bytes_after < bytes_before
+
+    # Volver al tipo original reproduce exactamente los datos
+    restored = optimized.astype({column: df.dtypes[column] for column in changed})
+    for column in ("city", "code"):
+        restored[column] = restored[column].astype(object).where(restored[column].notna(), None)
+    pd.testing.assert_frame_equal(restored, df)
+    assert df.equals(make_frame())
+
+
+def test_report_bytes_match_pandas_memory_usage():
+    df = make_frame()
+    report = MemoryOptimizer().memory_report(df)
+    expected = df.memory_usage(deep=True, index=False)
+    for column, info in report["columns"].items():
+        assert info["bytes"] == expected[column]
+        if info["target_dtype"] is not None:
+            converted = df[column].astype(info["target_dtype"])
+            assert info["optimized_bytes"] == converted.memory_usage(deep=True, index=False)
+    assert report["total_bytes"] == df.memory_usage(deep=True, index=True).sum()
+
+
+def test_optimized_frame_can_be_queried_with_sparse_columns():
+    pytest.importorskip("pyarrow")
+    df = make_frame()
+    optimized = MemoryOptimizer().optimize(df)[0]
+    assert isinstance(optimized.dtypes["mostly_null"], pd.SparseDtype)
+
+    result = QueryEngine().execute_query_on_dataframe(
+        optimized,
+        "SELECT COUNT(mostly_null) AS filled, SUM(mostly_null) AS total, "
+        "COUNT(*) FILTER (WHERE city = 'Lima') AS lima FROM my_table",
+    )
+    assert result["filled"].iloc[0] == df["mostly_null"].count()
+    assert result["total"].iloc[0] == pytest.approx(df["mostly_null"].sum())
+    assert result["lima"].iloc[0] == (df["city"] == "Lima").sum()
+    # La consulta no modifica las columnas dispersas del DataFrame optimizado
+    assert isinstance(optimized.dtypes["mostly_null"], pd.SparseDtype)
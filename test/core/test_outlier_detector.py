@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.outlier_detector import MAD_SCALE, OutlierDetector
+
+
+def make_frame(rows: int = 4_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "normal": rng.normal(0, 1, rows),
+            "skewed": rng.exponential(2, rows),
+            "integer": rng.integers(0, 100, rows),
+            "nullable": pd.array(rng.integers(0, 50, rows), dtype="Int64"),
+            "label": rng.choice(["a", "b"], rows),
+        },
+        index=pd.RangeIndex(1_000, 1_000 + rows),
+    )
+    extreme = rng.random(rows) < 0.02
+    df.loc[extreme, "normal"] = rng.normal(0, 25, extreme.sum())
+    df.loc[df.index[rng.random(rows) < 0.1], "skewed"] = np.nan
+    df.loc[df.index[:5], "integer"] = [500, -400, 1_000, 300, -250]
+    df.loc[df.index[rng.random(rows) < 0.05], "nullable"] = pd.NA
+    df.loc[df.index[-3:], "nullable"] = 900
+    return df
+
+
+def pandas_bounds(series: pd.Series, method: str, factor: float) -> tuple:
+    """Umbrales de referencia calculados con Pandas."""
+    series = series.astype("float64")
+    if method == "iqr":
+        first, third = series.quantile([0.25, 0.75])
+        return first - factor * (third - first), third + factor * (third - first)
+    if method == "zscore":
+        mean, deviation = series.mean(), series.std()
+        return mean - factor * deviation, mean + factor * deviation
+    median = series.median()
+    deviation = (series - median).abs().median() / MAD_SCALE
+    return median - factor * deviation, median + factor * deviation
+
+
+@pytest.mark.parametrize("method,factor", [("iqr", 1.5), ("zscore", 3.0), ("mad", 3.5), ("iqr", 3.0)])
+@pytest.mark.parametrize("block_values", [8_000_000, 5_000])
+def test_masks_match_pandas(method, factor, block_values):
+    df = make_frame()
+    detector = OutlierDetector(block_values=block_values)
+    report = detector.detect(df, method=method, factor=factor)
+    assert set(report["columns"]) == {"normal", "skewed", "integer", "nullable"}
+
+    flagged = pd.Series(False, index=df.index)
+    for column, info in report["columns"].items():
+        lower, upper = pandas_bounds(df[column], method, factor)
+        assert info["lower"] == pytest.approx(lower, rel=1e-9)
+        assert info["upper"] == pytest.approx(upper, rel=1e-9)
+        values = df[column].astype("float64")
+        mask = ((values < lower) | (values > upper)).fillna(False)
+        pd.testing.assert_index_equal(info["rows"], df.index[mask.to_numpy()])
+        assert info["count"] == mask.sum()
+        flagged |= mask
+
+    assert report["flagged_rows"] == flagged.sum()
+    np.testing.assert_array_equal(detector.get_mask(df, report), flagged.to_numpy())
+    cleaned, _, removed = detector.clean(df, report, action="drop")
+    pd.testing.assert_frame_equal(cleaned, df[~flagged])
+    pd.testing.assert_frame_equal(removed, df[flagged])
+
+
+def test_cap_clips_to_bounds_and_keeps_dtypes():
+    df = make_frame()
+    detector = OutlierDetector()
+    report = detector.detect(df, method="iqr")
+    cleaned, changed, _ = detector.clean(df, report, action="cap")
+
+    pd.testing.assert_series_equal(cleaned.dtypes, df.dtypes)
+    assert set(changed) == {column for column, info in report["columns"].items() if info["count"]}
+    lower, upper = pandas_bounds(df["normal"], "iqr", 1.5)
+    pd.testing.assert_series_equal(cleaned["normal"], df["normal"].clip(lower, upper))
+    lower, upper = pandas_bounds(df["integer"], "iqr", 1.5)
+    pd.testing.assert_series_equal(
+        cleaned["integer"], df["integer"].clip(int(np.ceil(lower)), int(np.floor(upper)))
+    )
+    pd.testing.assert_frame_equal(cleaned[["label"]], df[["label"]])
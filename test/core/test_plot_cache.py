@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.plot_cache import PlotCache
+
+
+def make_frame(rows: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"x": np.arange(rows, dtype=float), "y": np.arange(rows) % 7})
+
+
+class Version:
+    """Proveedor de versión de los datos, como ``AppState.get_dataset_version``."""
+
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def test_get_counts_hits_and_misses():
+    cache = PlotCache(max_entries=2)
+    df = make_frame()
+    key = cache.make_key("histogram", df, ["x"], {"bins": 10})
+
+    assert cache.get(key) is None
+    cache.put(key, b"png-x")
+    assert cache.get(key) == b"png-x"
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Otros parámetros u otras columnas generan otra clave
+    assert cache.make_key("histogram", df, ["x"], {"bins": 20}) != key
+    assert cache.make_key("histogram", df, ["y"], {"bins": 10}) != key
+
+
+def test_least_recently_used_images_are_evicted():
+    cache = PlotCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, key.encode())
+    cache.get("a")
+    cache.put("c", b"c")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a" and len(cache) == 2
+
+
+def test_dataset_version_bump_invalidates_the_fingerprint():
+    version = Version()
+    cache = PlotCache(version_provider=version)
+    df = make_frame()
+    key = cache.make_key("scatter", df, ["x", "y"], {})
+    cache.put(key, b"png")
+
+    # Sin cambio de versión la huella guardada se reutiliza
+    df.loc[0, "x"] = -1.0
+    assert cache.make_key("scatter", df, ["x", "y"], {}) == key
+
+    version.value += 1
+    cache.handle_dataset_change({"version": version.value, "kind": "updated"})
+    new_key = cache.make_key("scatter", df, ["x", "y"], {})
+    assert new_key != key
+    assert cache.get(new_key) is None
+    assert len(cache._fingerprints) == 1
+
+    # La clave depende del contenido: los mismos datos recuperan la imagen
+    df.loc[0, "x"] = 0.0
+    version.value += 1
+    cache.handle_dataset_change({"version": version.value, "kind": "updated"})
+    assert cache.make_key("scatter", df, ["x", "y"], {}) == key
+    assert cache.get(key) == b"png"
+
+
+def test_disk_cache_survives_a_new_instance(tmp_path):
+    df = make_frame()
+    cache = PlotCache(cache_dir=str(tmp_path), max_disk_entries=2)
+    key = cache.make_key("boxplot", df, ["y"], {"theme": "dark"})
+    cache.put(key, b"png-y")
+
+    reopened = PlotCache(cache_dir=str(tmp_path))
+    assert reopened.get(reopened.make_key("boxplot", df, ["y"], {"theme": "dark"})) == b"png-y"
+    assert reopened.hits == 1
+
+    for name in ("a", "b", "c"):
+        cache.put(name, name.encode())
+    assert len(list(tmp_path.glob("*.png"))) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        PlotCache(max_entries=0)
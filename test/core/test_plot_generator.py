@@ -0,0 +1,125 @@
+import base64
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import plot_generator
+from core.plot_cache import PlotCache
+from core.plot_generator import (
+    HISTOGRAM_MAX_BINS,
+    KDE_GRID_POINTS,
+    SCATTER_SPARSE_CELL_POINTS,
+    PlotGenerator,
+)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def make_points(rows: int = 50_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 1, rows)
+    y = 2 * x + rng.normal(0, 0.5, rows)
+    x[:10] = np.nan
+    # Un punto aislado que la densidad no debe ocultar
+    x[-1], y[-1] = 12.0, -12.0
+    return pd.DataFrame({"x": x, "y": y})
+
+
+def test_scatter_density_counts_match_numpy_histogram2d():
+    df = make_points()
+    density = PlotGenerator._compute_scatter_density(df["x"], df["y"], bins=50)
+
+    valid = df.dropna()
+    expected, _, _ = np.histogram2d(
+        valid["x"], valid["y"], bins=[density["x_edges"], density["y_edges"]]
+    )
+    np.testing.assert_array_equal(density["counts"], expected)
+    assert density["num_points"] == len(valid) == density["counts"].sum()
+
+    # Los puntos dibujados uno a uno son exactamente los de celdas casi vacías
+    sparse_cells = expected[expected <= SCATTER_SPARSE_CELL_POINTS]
+    assert len(density["sparse_x"]) == sparse_cells.sum()
+    assert (12.0, -12.0) in set(zip(density["sparse_x"], density["sparse_y"]))
+
+
+def test_scatter_density_of_a_constant_column():
+    df = pd.DataFrame({"x": np.ones(100), "y": np.arange(100.0)})
+    density = PlotGenerator._compute_scatter_density(df["x"], df["y"], bins=10)
+    assert density["counts"].sum() == 100
+    assert density["x_edges"][0] < 1.0 < density["x_edges"][-1]
+
+
+def test_large_scatterplot_is_drawn_as_a_density_png():
+    generator = PlotGenerator(scatter_max_points=1_000)
+    image = generator.generate_scatterplot(make_points(5_000), "x", "y")
+    assert base64.b64decode(image).startswith(b"\x89PNG")
+
+
+def test_histogram_counts_match_numpy_histogram():
+    values = pd.Series(np.random.default_rng(1).gamma(2.0, 3.0, 2_000))
+    values[:50] = np.nan
+    histogram = PlotGenerator._compute_histogram(values)
+
+    expected_counts, expected_edges = np.histogram(values.dropna(), bins="auto")
+    assert len(expected_edges) <= HISTOGRAM_MAX_BINS + 1
+    np.testing.assert_array_equal(histogram["counts"], expected_counts)
+    np.testing.assert_allclose(histogram["edges"], expected_edges)
+    assert histogram["num_values"] == histogram["counts"].sum() == 1_950
+
+
+def test_histogram_bins_are_capped():
+    # Con valores muy concentrados y una cola larga, la regla 'auto' pediría miles de barras
+    values = pd.Series(np.concatenate([np.zeros(100_000), np.arange(1, 101) * 1_000.0]))
+    histogram = PlotGenerator._compute_histogram(values)
+    assert len(histogram["counts"]) == HISTOGRAM_MAX_BINS
+    assert histogram["counts"].sum() == len(values)
+
+
+def test_sampled_kde_follows_the_normal_density():
+    rows = 200_000
+    values = pd.Series(np.random.default_rng(2).normal(10, 2, rows))
+    histogram = PlotGenerator._compute_histogram(values)
+
+    kde_x, kde_y = histogram["kde_x"], histogram["kde_y"]
+    assert len(kde_x) == KDE_GRID_POINTS
+    width = histogram["edges"][1] - histogram["edges"][0]
+    # Curva escalada a frecuencia por barra, estimada sobre una muestra
+    expected = np.exp(-0.5 * ((kde_x - 10) / 2) ** 2) / (2 * np.sqrt(2 * np.pi)) * rows * width
+    assert np.max(np.abs(kde_y - expected)) <= 0.05 * expected.max()
+
+
+def test_constant_column_has_no_kde():
+    histogram = PlotGenerator._compute_histogram(pd.Series([3.0] * 10))
+    assert histogram["kde_x"] is None and histogram["kde_y"] is None
+    assert histogram["counts"].sum() == 10
+
+
+def test_import_does_not_load_the_plotting_libraries():
+    script = (
+        "import sys\n"
+        "import core.plot_generator\n"
+        "from core.plot_generator import PlotGenerator\n"
+        "PlotGenerator()\n"
+        "print('matplotlib' in sys.modules, 'seaborn' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip().splitlines()[-1] == "False False"
+
+
+def test_cached_plot_is_served_without_drawing(monkeypatch):
+    generator = PlotGenerator(cache=PlotCache())
+    df = make_points(500)
+    image = generator.generate_histogram(df, "y")
+
+    def fail():
+        raise AssertionError("No debe volver a dibujarse")
+
+    monkeypatch.setattr(plot_generator, "load_plotting_libraries", fail)
+    assert generator.generate_histogram(df, "y") == image
+    assert generator.cache.hits == 1
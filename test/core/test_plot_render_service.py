@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.plot_render_service import PlotRenderService, _load_data
+
+pytest.importorskip("pyarrow")
+
+
+def test_shared_data_round_trip_releases_the_block():
+    df = pd.DataFrame(
+        {
+            "integer": np.arange(5),
+            "real": [1.0, np.nan, 3.0, 4.0, 5.0],
+            "text": list("abcde"),
+            "label": pd.Categorical(list("xxyyz")),
+            "level": pd.Categorical([1.5, 2.5, 1.5, 3.0, 2.5], ordered=True),
+            "date": pd.date_range("2024-01-01", periods=5),
+            "nullable": pd.array([1, None, 3, 4, 5], dtype="Int64"),
+        }
+    )
+    payload, block = PlotRenderService._share_data(df)
+    assert payload[0] == "arrow"
+    try:
+        # ``_load_data`` cierra su vista del bloque: el DataFrame no depende de él
+        result = _load_data(payload)
+    finally:
+        block.close()
+        block.unlink()
+    pd.testing.assert_frame_equal(result, df)
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.query_engine import QueryCancelledError, QueryEngine
+from core.query_history import QueryHistory
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Producto cruzado que tarda varios segundos en Polars
+SLOW_QUERY = (
+    "SELECT COUNT(*) AS total FROM my_table AS a CROSS JOIN my_table AS b "
+    "WHERE a.value * b.value % 7 = 3"
+)
+
+
+def make_frame(rows: int = 20_000) -> pd.DataFrame:
+    return pd.DataFrame({"value": np.arange(rows)})
+
+
+def test_importing_engines_does_not_load_polars():
+    # En un proceso nuevo: en este, otras pruebas ya pueden haber importado Polars
+    script = (
+        "import sys\n"
+        "import core.query_engine, core.data_analyzer\n"
+        "from core.polars_backend import PolarsBackend\n"
+        "PolarsBackend.is_available()\n"
+        "print('polars' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip().splitlines()[-1] == "False"
+
+
+def test_polars_timeout_raises_without_waiting_for_the_query():
+    pytest.importorskip("polars")
+    engine = QueryEngine(backend="polars", history=QueryHistory())
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError, match="Polars no puede interrumpirla"):
+        engine.open_query_cursor(make_frame(), SLOW_QUERY, timeout=0.2)
+    assert time.perf_counter() - start < 2
+    assert engine.history.get_entries(limit=1)[0]["status"] == "timeout"
+
+
+def test_polars_cancel_raises_query_cancelled():
+    pytest.importorskip("polars")
+    engine = QueryEngine(backend="polars")
+    future = engine.submit_query(make_frame(), SLOW_QUERY, timeout=None, tag="view")
+    time.sleep(0.3)
+    assert engine.cancel_running_queries("view") == 1
+    with pytest.raises(QueryCancelledError):
+        future.result(timeout=2)
+
+
+def test_polars_reads_json_arrays_and_ndjson(tmp_path):
+    pytest.importorskip("polars")
+    (tmp_path / "array.json").write_text(json.dumps([{"a": 1}, {"a": 2}]))
+    (tmp_path / "lines.json").write_text('{"a": 3}\n{"a": 4}\n')
+    engine = QueryEngine(backend="polars")
+    engine.register_file_source("events", (tmp_path / "*.json").as_posix())
+    query_cursor = engine.open_query_cursor(None, "SELECT SUM(a) AS total FROM events")
+    try:
+        assert query_cursor.fetch_page(0)["total"].iloc[0] == 10
+    finally:
+        query_cursor.close()
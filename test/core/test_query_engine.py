@@ -0,0 +1,323 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.query_engine import QueryCancelledError, QueryEngine
+from core.query_history import QueryHistory
+
+# Consulta que DuckDB tardaría minutos en terminar (ningún md5 empieza por 'z')
+SLOW_QUERY = (
+    "SELECT COUNT(*) AS total FROM my_table, range(10000000000) AS t(i) "
+    "WHERE md5(CAST(i + my_table.id AS VARCHAR)) LIKE 'zz%'"
+)
+
+
+def make_frame(rows: int = 250) -> pd.DataFrame:
+    return pd.DataFrame({"id": np.arange(rows), "value": np.arange(rows) * 0.5})
+
+
+@pytest.fixture
+def engine():
+    return QueryEngine(page_size=100, history=QueryHistory())
+
+
+def test_cursor_pages_results_and_detects_the_end(engine):
+    df = make_frame()
+    query_cursor = engine.open_query_cursor(df, "SELECT * FROM my_table ORDER BY id")
+    try:
+        # Solo se leyó la primera página: el total aún no se conoce
+        assert query_cursor.total_rows is None
+        assert query_cursor.get_page_count() is None
+        pages = [query_cursor.fetch_page(number) for number in range(3)]
+        assert [len(page) for page in pages] == [100, 100, 50]
+        pd.testing.assert_frame_equal(pd.concat(pages), df)
+        assert query_cursor.total_rows == 250
+        assert query_cursor.get_page_count() == 3
+        assert not query_cursor.has_page(3)
+        assert list(query_cursor.fetch_page(3).columns) == ["id", "value"]
+        assert query_cursor.bytes_materialized > 0
+    finally:
+        query_cursor.close()
+
+
+def test_fetch_query_page_reports_the_next_page(engine):
+    query_cursor = engine.open_query_cursor(make_frame(), "SELECT * FROM my_table ORDER BY id")
+
+    async def read_pages():
+        return [await engine.fetch_query_page(query_cursor, number) for number in range(3)]
+
+    try:
+        results = asyncio.run(read_pages())
+        assert [has_next for _, has_next in results] == [True, True, False]
+        assert results[2][0]["id"].tolist() == list(range(200, 250))
+    finally:
+        query_cursor.close()
+    entry = engine.history.get_entries(limit=1)[0]
+    assert entry["rows_returned"] == 250 and entry["status"] == "ok"
+
+
+def test_empty_result(engine):
+    query_cursor = engine.open_query_cursor(make_frame(), "SELECT * FROM my_table WHERE id < 0")
+    try:
+        assert query_cursor.is_empty()
+        assert query_cursor.total_rows == 0
+        assert query_cursor.get_page_count() == 1
+    finally:
+        query_cursor.close()
+
+
+def test_timeout_interrupts_the_query(engine):
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        engine.open_query_cursor(make_frame(1), SLOW_QUERY, timeout=0.3)
+    assert time.perf_counter() - start < 5
+    assert engine.history.get_entries(limit=1)[0]["status"] == "timeout"
+    # El motor sigue disponible tras la interrupción
+    query_cursor = engine.open_query_cursor(make_frame(), "SELECT COUNT(*) AS n FROM my_table")
+    try:
+        assert query_cursor.fetch_page(0)["n"].iloc[0] == 250
+    finally:
+        query_cursor.close()
+
+
+def test_cancel_running_queries_by_tag(engine):
+    slow = engine.submit_query(make_frame(1), SLOW_QUERY, timeout=None, tag="view")
+    other = engine.submit_query(make_frame(1), SLOW_QUERY, timeout=None, tag="other")
+    deadline = time.monotonic() + 5
+    while len(engine._running_queries) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert engine.cancel_running_queries("view") == 1
+    with pytest.raises(QueryCancelledError):
+        slow.result(timeout=5)
+    assert not other.done()
+    assert engine.cancel_running_queries() == 1
+    with pytest.raises(QueryCancelledError):
+        other.result(timeout=5)
+    assert [entry["status"] for entry in engine.history.get_entries(limit=2)] == [
+        "cancelled",
+        "cancelled",
+    ]
+
+
+def find_operator(node: dict, name: str):
+    """Busca en el plan el primer operador cuyo nombre contiene ``name``."""
+    if name in node["name"]:
+        return node
+    for child in node["children"]:
+        found = find_operator(child, name)
+        if found is not None:
+            return found
+    return None
+
+
+def test_profile_query_returns_the_operator_tree(engine):
+    profile = engine.profile_query(
+        make_frame(), "SELECT id % 3 AS k, SUM(value) FROM my_table GROUP BY k"
+    )
+    assert profile["rows_returned"] == 3
+    assert profile["total_time"] >= 0 and profile["operator_time"] >= 0
+    assert find_operator(profile["plan"], "GROUP_BY") is not None
+
+
+def test_get_query_profile_of_the_executed_cursor(engine):
+    query_cursor = engine.open_query_cursor(
+        make_frame(), "SELECT * FROM my_table WHERE id % 2 = 0", profile=True
+    )
+    try:
+        # El perfil se escribe cuando termina la consulta
+        assert engine.get_query_profile(query_cursor) is None
+        page_number = 0
+        while query_cursor.has_page(page_number):
+            query_cursor.fetch_page(page_number)
+            page_number += 1
+        profile = engine.get_query_profile(query_cursor)
+        assert profile is not None
+        assert profile["query"] == query_cursor.query_string
+        assert find_operator(profile["plan"], "FILTER")["rows"] == 125
+    finally:
+        query_cursor.close()
+
+
+def test_materialize_query_persists_the_result_in_the_database_file(tmp_path):
+    database = str(tmp_path / "mugenc.duckdb")
+    engine = QueryEngine(database=database)
+
+    row_count = engine.materialize_query(
+        make_frame(), "SELECT id, value FROM my_table WHERE id < 10", "first_rows"
+    )
+    assert row_count == 10
+    assert engine.list_materialized_tables() == ["first_rows"]
+
+    # Otra instancia sobre el mismo archivo consulta la tabla sin DataFrame cargado
+    reopened = QueryEngine(database=database)
+    assert reopened.is_persistent()
+    result = reopened.execute_query_on_dataframe(None, "SELECT SUM(id) AS total FROM first_rows")
+    assert result["total"].iloc[0] == 45
+
+    reopened.drop_materialized_table("first_rows")
+    assert reopened.list_materialized_tables() == []
+    with pytest.raises(ValueError):
+        reopened.execute_query_on_dataframe(None, "SELECT 1")
+
+
+def test_materialize_query_replaces_the_table_and_validates_its_name(engine):
+    engine.materialize_query(make_frame(), "SELECT * FROM my_table", "snapshot")
+    assert engine.materialize_query(make_frame(5), "SELECT * FROM my_table", "snapshot") == 5
+
+    with pytest.raises(ValueError):
+        engine.materialize_query(make_frame(), "SELECT * FROM my_table", "1; DROP TABLE snapshot")
+    assert engine.list_materialized_tables() == ["snapshot"]
+
+
+def test_registered_file_sources_are_queried_as_temp_views(engine, tmp_path):
+    frame = make_frame(30)
+    frame.iloc[:15].to_parquet(tmp_path / "sales_1.parquet")
+    frame.iloc[15:].to_parquet(tmp_path / "sales_2.parquet")
+    frame.iloc[:3].assign(label=["a", "b", "c"]).to_csv(tmp_path / "labels.csv", index=False)
+
+    engine.register_file_source("sales", str(tmp_path / "sales_*.parquet"))
+    engine.register_file_source("labels", str(tmp_path / "labels.csv"))
+    assert set(engine.get_file_sources()) == {"sales", "labels"}
+
+    # El patrón glob se lee como una sola tabla y puede cruzarse con my_table
+    result = engine.execute_query_on_dataframe(
+        make_frame(3),
+        "SELECT l.label, COUNT(*) AS total FROM sales s "
+        "JOIN my_table m USING (id) JOIN labels l USING (id) GROUP BY l.label ORDER BY l.label",
+    )
+    assert result["label"].tolist() == ["a", "b", "c"]
+    assert result["total"].tolist() == [1, 1, 1]
+    assert engine.execute_query_on_dataframe(None, "SELECT COUNT(*) AS n FROM sales")["n"].iloc[0] == 30
+
+    engine.unregister_file_source("sales")
+    engine.unregister_file_source("labels")
+    with pytest.raises(ValueError):
+        engine.execute_query_on_dataframe(None, "SELECT COUNT(*) FROM sales")
+
+
+def test_register_file_source_rejects_invalid_sources(engine, tmp_path):
+    (tmp_path / "notes.xlsx").write_bytes(b"")
+    with pytest.raises(ValueError):
+        engine.register_file_source("notes", str(tmp_path / "notes.xlsx"))
+    with pytest.raises(ValueError):
+        engine.register_file_source("missing", str(tmp_path / "missing_*.parquet"))
+    with pytest.raises(ValueError):
+        engine.register_file_source("bad name", str(tmp_path / "notes.xlsx"))
+    assert engine.get_file_sources() == {}
+
+
+def test_concurrent_async_queries_run_in_the_thread_pool(engine):
+    async def run_queries():
+        cursors = await asyncio.gather(
+            *(
+                engine.query(make_frame(), f"SELECT * FROM my_table WHERE id % {step} = 0")
+                for step in (1, 2, 5)
+            )
+        )
+        row_count = await engine.run_async(
+            engine.materialize_query, make_frame(), "SELECT * FROM my_table", "async_copy"
+        )
+        return cursors, row_count
+
+    cursors, row_count = asyncio.run(run_queries())
+    try:
+        for query_cursor in cursors:
+            page_number = 0
+            while query_cursor.has_page(page_number):
+                query_cursor.fetch_page(page_number)
+                page_number += 1
+        assert [query_cursor.total_rows for query_cursor in cursors] == [250, 125, 50]
+    finally:
+        for query_cursor in cursors:
+            query_cursor.close()
+    assert row_count == 250
+
+
+def test_cancelling_the_awaiting_task_interrupts_the_query(engine):
+    async def cancel_slow_query():
+        task = asyncio.create_task(engine.query(make_frame(1), SLOW_QUERY, timeout=None))
+        deadline = time.monotonic() + 5
+        while not engine._running_queries and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.monotonic()
+    asyncio.run(cancel_slow_query())
+    deadline = time.monotonic() + 5
+    while engine._running_queries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not engine._running_queries
+    assert time.monotonic() - started < 10
+    assert engine.history.get_entries(limit=1)[0]["status"] == "cancelled"
+
+
+def read_all_pages(engine, query_cursor) -> pd.DataFrame:
+    pages, page_number, has_next = [], 0, True
+    while has_next:
+        page, has_next = engine.fetch_page(query_cursor, page_number)
+        pages.append(page)
+        page_number += 1
+    return pd.concat(pages)
+
+
+def test_identical_query_on_the_same_version_reuses_the_result(engine):
+    df = make_frame()
+    query = "SELECT id, value FROM my_table WHERE id % 3 = 0 ORDER BY id"
+    first = engine.open_query_cursor(df, query, dataset_version=1)
+    expected = read_all_pages(engine, first)
+    # Releer una página ya leída no es un acierto de caché
+    first.fetch_page(0)
+    assert first.cache_hits == 0
+    first.close()
+
+    reused = engine.open_query_cursor(df, query, dataset_version=1)
+    try:
+        assert reused.cache_hits == 1 and reused.total_rows == len(expected)
+        pd.testing.assert_frame_equal(read_all_pages(engine, reused), expected)
+    finally:
+        reused.close()
+
+    latest, previous = engine.history.get_entries(limit=2)
+    assert (latest["cache_hits"], latest["bytes_materialized"]) == (1, 0)
+    assert previous["cache_hits"] == 0 and previous["bytes_materialized"] > 0
+    assert engine.history.get_query_statistics()[0]["cache_hits"] == 1
+
+
+def test_results_are_not_reused_after_a_change(engine):
+    df = make_frame()
+    query = "SELECT COUNT(*) AS total FROM my_table"
+
+    def run(frame=df, version=1, sql=query):
+        query_cursor = engine.open_query_cursor(frame, sql, dataset_version=version)
+        read_all_pages(engine, query_cursor)
+        query_cursor.close()
+        return query_cursor.cache_hits
+
+    assert run() == 0
+    assert run() == 1
+    assert run(version=2) == 0
+    assert run(frame=make_frame(10)) == 0
+    assert run(sql="SELECT random() AS r FROM my_table") == 0
+    assert run(sql="SELECT random() AS r FROM my_table") == 0
+
+    engine.materialize_query(df, "SELECT * FROM my_table", "snapshot")
+    assert run() == 0
+    engine.handle_dataset_change({"version": 3, "kind": "replaced", "dataframe": df})
+    assert run() == 0
+    # Sin versión de los datos no se sabe si cambiaron
+    assert run(version=None) == 0 and run(version=None) == 0
+
+
+def test_partially_read_results_are_not_reused(engine):
+    df = make_frame()
+    query = "SELECT * FROM my_table"
+    engine.open_query_cursor(df, query, dataset_version=1).close()
+    query_cursor = engine.open_query_cursor(df, query, dataset_version=1)
+    query_cursor.close()
+    assert query_cursor.cache_hits == 0
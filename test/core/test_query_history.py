@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from core.query_history import COMPACT_RATIO, QueryHistory
+
+
+def read_lines(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_each_record_and_update_appends_one_line(tmp_path):
+    path = tmp_path / "history.jsonl"
+    history = QueryHistory(str(path))
+    first = history.record("SELECT 1", 0.1)
+    history.record("SELECT 2", 0.2)
+    history.update_entry(first, cache_hits=3)
+
+    lines = read_lines(path)
+    assert [line["id"] for line in lines] == [1, 2, 1]
+    assert lines[-1]["cache_hits"] == 3
+
+    reloaded = QueryHistory(str(path))
+    assert [entry["id"] for entry in reloaded.get_entries()] == [2, 1]
+    assert reloaded.get_entries()[1]["cache_hits"] == 3
+    assert reloaded.record("SELECT 3", 0.1)["id"] == 3
+
+
+def test_file_is_compacted_after_pruning(tmp_path):
+    path = tmp_path / "history.jsonl"
+    history = QueryHistory(str(path), max_entries=5)
+    for number in range(COMPACT_RATIO * 5 + 2):
+        history.record(f"SELECT {number}", 0.1)
+
+    lines = read_lines(path)
+    assert len(lines) < COMPACT_RATIO * 5
+    expected = [entry["id"] for entry in reversed(history.get_entries())]
+    assert [entry["id"] for entry in QueryHistory(str(path), max_entries=5).get_entries()][::-1] == expected
+    # Una entrada podada no vuelve al archivo al actualizarla
+    history.update_entry({"id": 1}, cache_hits=1)
+    assert 1 not in {line["id"] for line in read_lines(path)}
+
+
+def test_legacy_json_array_is_converted(tmp_path):
+    path = tmp_path / "history.json"
+    history = QueryHistory(str(tmp_path / "source.jsonl"))
+    entries = [history.record("SELECT 1", 0.1), history.record("SELECT 2", 3.0)]
+    path.write_text(json.dumps(entries, indent=1), encoding="utf-8")
+
+    reloaded = QueryHistory(str(path))
+    assert reloaded.get_entries() == entries[::-1]
+    assert [line["id"] for line in read_lines(path)] == [1, 2]
+
+
+def test_incomplete_last_line_is_ignored(tmp_path):
+    path = tmp_path / "history.jsonl"
+    QueryHistory(str(path)).record("SELECT 1", 0.1)
+    with open(path, "a", encoding="utf-8") as history_file:
+        history_file.write('{"id": 2, "que')
+    history = QueryHistory(str(path))
+    assert len(history.get_entries()) == 1
+    history.record("SELECT 2", 0.1)
+    assert len(QueryHistory(str(path)).get_entries()) == 2
+
+
+def test_statistics_group_recurring_queries():
+    history = QueryHistory(slow_query_threshold=1.0)
+    history.record("SELECT *  FROM my_table", 1.5)
+    history.record("select * from my_table", 0.1, cache_hits=1)
+    # Las entradas antiguas contaban páginas releídas
+    history.record("SELECT * FROM my_table", 0.4, cache_hits=4)
+    history.record("SELECT 1", 0.2)
+
+    recurring, single = history.get_query_statistics()
+    assert recurring["executions"] == 3
+    assert recurring["total_time"] == pytest.approx(2.0)
+    assert recurring["max_time"] == 1.5 and recurring["slow_executions"] == 1
+    assert recurring["cache_hits"] == 2
+    assert (single["query"], single["executions"], single["cache_hits"]) == ("SELECT 1", 1, 0)
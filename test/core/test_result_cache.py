@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from core.result_cache import ResultCache
+
+
+def test_hits_share_data_but_not_structure():
+    df = pd.DataFrame({"value": np.arange(10)})
+    result = pd.DataFrame({"total": np.arange(1_000)})
+    cache = ResultCache()
+
+    first = cache.get_or_compute(df, "total", (), {}, lambda: result)
+    first["extra"] = 1
+    second = cache.get_or_compute(df, "total", (), {}, lambda: None)
+
+    assert cache.hits == 1
+    assert list(second.columns) == ["total"]
+    # Sin copia profunda: los datos no se duplican en cada acierto
+    assert np.shares_memory(second["total"].to_numpy(), result["total"].to_numpy())
+
+
+def test_dict_and_tuple_results_are_copied_shallowly():
+    df = pd.DataFrame({"value": [1, 2]})
+    cache = ResultCache()
+    report = {"columns": {"value": {"count": 1}}}
+
+    first = cache.get_or_compute(df, "report", (), {}, lambda: (report, [1]))
+    first[0]["method"] = "iqr"
+    first[1].append(2)
+    second = cache.get_or_compute(df, "report", (), {}, lambda: None)
+
+    assert second == ({"columns": {"value": {"count": 1}}}, [1])
+    assert second[0]["columns"] is report["columns"]
+
+
+def test_version_change_misses():
+    version = [1]
+    df = pd.DataFrame({"value": [1, 2]})
+    cache = ResultCache(version_provider=lambda: version[0])
+    cache.get_or_compute(df, "sum", (), {}, lambda: 3)
+    version[0] = 2
+    assert cache.get_or_compute(df, "sum", (), {}, lambda: 4) == 4
+    cache.invalidate()
+    assert len(cache) == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.running_statistics import RunningStatistics
+
+
+def assert_matches_pandas(summary: dict, df: pd.DataFrame):
+    """Compara el resumen con las estadísticas de Pandas columna a columna."""
+    assert summary["num_rows"] == len(df)
+    for column in df.columns:
+        expected = df[column]
+        result = summary["columns"][column]
+        assert result["non_null"] == expected.count()
+        assert result["nulls"] == expected.isna().sum()
+        if not result["is_numeric"]:
+            continue
+        assert result["mean"] == pytest.approx(expected.mean(), rel=1e-12)
+        assert result["std"] == pytest.approx(expected.std(), rel=1e-7)
+        assert result["min"] == expected.min()
+        assert result["max"] == expected.max()
+
+
+def make_frame(rows: int = 20_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    timestamps = 1.7e9 + rng.normal(0, 0.5, rows)
+    identifiers = 10**9 + rng.integers(0, 100, rows)
+    with_nulls = rng.normal(5, 2, rows)
+    with_nulls[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "identifier": identifiers,
+            "with_nulls": with_nulls,
+            "label": rng.choice(["a", "b"], rows),
+        }
+    )
+
+
+def test_refresh_is_precise_for_large_low_variance_values():
+    df = make_frame()
+    statistics = RunningStatistics()
+    statistics.refresh(df, version=1)
+    assert_matches_pandas(statistics.get_summary(), df)
+
+
+def test_removed_rows_match_pandas():
+    df = make_frame()
+    statistics = RunningStatistics()
+    statistics.refresh(df, version=1)
+    removed = df.sample(frac=0.3, random_state=1)
+    remaining = df.drop(removed.index)
+    statistics.apply_removed_rows(remaining, removed, version=2)
+    assert statistics.last_refresh["mode"] == "incremental"
+    assert_matches_pandas(statistics.get_summary(), remaining)
+
+
+def test_removing_outliers_keeps_precision():
+    rng = np.random.default_rng(2)
+    values = 1e9 + rng.normal(0, 1e-3, 10_000)
+    values[:5] = [1e15, -1e15, 1e14, 3e15, -2e14]
+    df = pd.DataFrame({"value": values})
+    statistics = RunningStatistics()
+    statistics.refresh(df, version=1)
+    removed, remaining = df.iloc[:5], df.iloc[5:]
+    statistics.apply_removed_rows(remaining, removed, version=2)
+    summary = statistics.get_summary()
+    assert summary["columns"]["value"]["std"] > 0
+    assert_matches_pandas(summary, remaining)
+
+
+def test_removing_every_row():
+    df = make_frame(100)
+    statistics = RunningStatistics()
+    statistics.refresh(df, version=1)
+    statistics.apply_removed_rows(df.iloc[:0], df, version=2)
+    column = statistics.get_summary()["columns"]["timestamp"]
+    assert column["non_null"] == 0
+    assert column["mean"] is None and column["std"] is None
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.sketches import HyperLogLog, KLLSketch, SpaceSaving
+
+
+def split(values: np.ndarray, parts: int = 4) -> list:
+    return np.array_split(values, parts)
+
+
+def test_merged_hyperloglog_matches_the_exact_distinct_count():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 150_000, 400_000)
+    merged = HyperLogLog(14)
+    single = HyperLogLog(14)
+    single.update(values)
+    for chunk in split(values):
+        partial = HyperLogLog(14)
+        partial.update(chunk)
+        merged.merge(partial)
+
+    # Combinar registros equivale a haber visto todos los valores en un sketch
+    np.testing.assert_array_equal(merged.registers, single.registers)
+    exact = pd.Series(values).nunique()
+    assert abs(merged.estimate() - exact) / exact <= 4 * merged.relative_error
+
+
+def test_hyperloglog_small_range_and_precision_mismatch():
+    sketch = HyperLogLog(14)
+    sketch.update(pd.Series(["a", "b", "c", "a"]))
+    assert sketch.estimate() == 3
+    with pytest.raises(ValueError):
+        sketch.merge(HyperLogLog(12))
+
+
+def test_merged_kll_quantiles_stay_within_the_rank_error():
+    rng = np.random.default_rng(1)
+    # Cada bloque sigue una distribución distinta para que la combinación importe
+    chunks = [rng.normal(loc, scale, 50_000) for loc, scale in ((0, 1), (5, 2), (-3, 0.5), (10, 4))]
+    merged = KLLSketch(200, seed=0)
+    for chunk in chunks:
+        partial = KLLSketch(200, seed=0)
+        partial.update(chunk)
+        merged.merge(partial)
+
+    values = np.sort(np.concatenate(chunks))
+    fractions = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    estimates = merged.quantiles(fractions)
+    for fraction, estimate in zip(fractions, estimates):
+        rank = np.searchsorted(values, estimate, side="right") / len(values)
+        assert abs(rank - fraction) <= merged.rank_error
+    assert merged.count == len(values)
+    assert merged.quantiles([0, 1]) == [values[0], values[-1]]
+    assert KLLSketch().quantiles([0.5]) == [None]
+
+
+def test_merged_space_saving_counts_stay_within_the_error_bound():
+    rng = np.random.default_rng(2)
+    values = rng.zipf(1.3, 200_000).astype("int64")
+    merged = SpaceSaving(capacity=100)
+    for chunk in split(values):
+        partial = SpaceSaving(capacity=100)
+        partial.update(pd.Series(chunk))
+        merged.merge(partial)
+
+    exact = pd.Series(values).value_counts()
+    assert merged.total == len(values)
+    summary = merged.top(merged.capacity)
+    for value, estimate in summary.items():
+        true_count = exact.get(value, 0)
+        # Space-Saving solo sobrestima, y como mucho en N / capacity
+        assert true_count <= estimate <= true_count + merged.max_error
+        assert estimate - true_count <= merged.get_error(value)
+    # Todo valor con frecuencia mayor que N / capacity está en el resumen
+    frequent = exact[exact > merged.max_error].index
+    assert set(frequent) <= set(summary.index)
+    assert merged.top(5).index.tolist() == exact.index[:5].tolist()